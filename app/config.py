@@ -5,10 +5,44 @@ class Settings(BaseSettings):
     app_name: str = "Team Sheet Studio API"
     # Default to SQLite for local development; override via .env for PostgreSQL
     database_url: str = "sqlite:///./team_sheet.db"
+    # Optional read replica for list/report endpoints; unset means reads go to database_url
+    read_database_url: str | None = None
+    read_replica_retry_seconds: int = 30
+    # Apply pending migrations at startup instead of refusing to start; meant for single-process local runs.
+    # Multi-worker deployments should run `alembic upgrade head` once before starting the workers.
+    migrate_on_startup: bool = False
+    # SQL statements a request may run before it is reported as a likely N+1 (strict: fail instead of warn)
+    query_budget: int = 25
+    query_budget_strict: bool = False
+    # Statements at or above this duration count towards db_slow_queries_total on /metrics
+    slow_query_ms: int = 200
+    # Threads applying background CSV imports (POST /imports/jobs/...)
+    import_workers: int = 2
+    # An import job whose process has not checked in for this long is failed by the next worker to start
+    import_job_lease_seconds: int = 600
+    # Connection pool; ignored for in-memory SQLite, which uses a single shared connection
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # SQLite connection pragmas, applied on every new connection
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 64 * 1024
+    sqlite_mmap_size: int = 256 * 1024 * 1024
     secret_key: str = "change-me"
     access_token_expire_minutes: int = 60
     refresh_token_expire_minutes: int = 60 * 24 * 7
     algorithm: str = "HS256"
+    # pbkdf2_sha256 rounds for new hashes; stored hashes with other rounds are rehashed on the next login
+    password_hash_rounds: int = 29000
+    # Processes dedicated to password hashing; 0 hashes on the default thread executor instead
+    password_hash_workers: int = 2
+    # Decoded tokens and authenticated users are cached for this long; set AUTH_CACHE_URL (redis://...) to share
+    # the user cache between workers so invalidations reach all of them
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_entries: int = 4096
+    auth_cache_url: str | None = None
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
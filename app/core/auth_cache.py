@@ -0,0 +1,173 @@
+"""Caches for the authentication hot path: decoded access tokens and the user rows they resolve to.
+
+Every authenticated request used to decode the JWT and load the user. Decoded tokens are cached per process
+(a token's claims never change). User principals go through a pluggable backend: the default is a
+per-process LRU, and setting AUTH_CACHE_URL=redis://... shares one cache across workers so an invalidation
+reaches all of them. Cached users are invalidated after any commit that updates or deletes a User row.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.config import settings
+from app.models import User, UserRole
+
+# Columns kept in the cache; the password hash never leaves the database.
+USER_FIELDS = ("id", "email", "full_name", "role", "employee_id", "created_at", "updated_at")
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """The authenticated user as request handlers see it: a read-only copy of USER_FIELDS.
+
+    Deliberately not an ORM instance. One bound to the request's AsyncSession would lazy-load any column or
+    relationship not copied here, and a sync handler doing that gets MissingGreenlet instead of a value.
+    Load the User row explicitly when a handler needs more than these fields.
+    """
+
+    id: int
+    email: str
+    full_name: str | None
+    role: UserRole
+    employee_id: int | None
+    created_at: datetime | None
+    updated_at: datetime | None
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(**{name: getattr(user, name) for name in USER_FIELDS})
+
+
+class MemoryBackend:
+    """Bounded LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key: str) -> str | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self.lock:
+            self.entries[key] = (self.clock() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+
+class RedisBackend:
+    """Shared backend so every worker sees the same entries and invalidations. Needs the `redis` package."""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("AUTH_CACHE_URL is set but the redis package is not installed") from exc
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> str | None:
+        value = self.client.get(key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.client.set(key, value, ex=max(1, int(ttl)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+
+def build_backend():
+    if settings.auth_cache_url:
+        return RedisBackend(settings.auth_cache_url)
+    return MemoryBackend(settings.auth_cache_max_entries)
+
+
+class TokenCache:
+    """Access token -> user id, valid until the earlier of the token's exp and the cache TTL."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, token: str) -> int | None:
+        value = self.backend.get(f"token:{token}")
+        return int(value) if value is not None else None
+
+    def put(self, token: str, user_id: int, expires_at: float) -> None:
+        ttl = min(expires_at - time.time(), settings.auth_cache_ttl_seconds)
+        if ttl > 0:
+            self.backend.set(f"token:{token}", str(user_id), ttl)
+
+
+class UserCache:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, user_id: int) -> CurrentUser | None:
+        value = self.backend.get(f"user:{user_id}")
+        if value is None:
+            return None
+        fields = json.loads(value)
+        fields["role"] = UserRole(fields["role"])
+        for name in ("created_at", "updated_at"):
+            if fields[name] is not None:
+                fields[name] = datetime.fromisoformat(fields[name])
+        return CurrentUser(**fields)
+
+    def put(self, user: CurrentUser) -> None:
+        fields = {name: getattr(user, name) for name in USER_FIELDS}
+        fields["role"] = fields["role"].value
+        for name in ("created_at", "updated_at"):
+            if fields[name] is not None:
+                fields[name] = fields[name].isoformat()
+        self.backend.set(f"user:{user.id}", json.dumps(fields), settings.auth_cache_ttl_seconds)
+
+    def invalidate(self, user_id: int) -> None:
+        self.backend.delete(f"user:{user_id}")
+
+
+token_cache = TokenCache(MemoryBackend(settings.auth_cache_max_entries))
+user_cache = UserCache(build_backend())
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(inspect(target).identity[0])
+
+
+# Invalidate only once the change is committed: dropping the entry at flush time would let a concurrent
+# request re-cache the old row before the commit lands.
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
@@ -0,0 +1,169 @@
+"""In-process request/DB metrics rendered in the Prometheus text format at GET /metrics.
+
+Counters live in this process only (each uvicorn worker is its own scrape target) and a scrape just formats
+what is already aggregated, so it stays cheap at a 5s interval. Routes are labelled by their template
+(`/team-sheets/{team_sheet_id}`), never the raw path, to keep the series count bounded.
+"""
+
+import time
+from collections import defaultdict
+from threading import Lock
+
+from app import database
+from app.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests: dict[tuple[str, str, int], int] = defaultdict(int)
+            self.errors: dict[tuple[str, str], int] = defaultdict(int)
+            self.latency_buckets: dict[tuple[str, str], list[int]] = {}
+            self.latency_sum: dict[tuple[str, str], float] = defaultdict(float)
+            self.latency_count: dict[tuple[str, str], int] = defaultdict(int)
+            self.queries = 0
+            self.query_seconds = 0.0
+            self.slow_queries = 0
+
+    def observe_request(self, method: str, route: str, status_code: int, seconds: float):
+        key = (method, route)
+        with self.lock:
+            self.requests[(method, route, status_code)] += 1
+            if status_code >= 500:
+                self.errors[key] += 1
+            buckets = self.latency_buckets.setdefault(key, [0] * len(LATENCY_BUCKETS))
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    buckets[index] += 1
+                    break
+            self.latency_sum[key] += seconds
+            self.latency_count[key] += 1
+
+    def observe_query(self, seconds: float):
+        with self.lock:
+            self.queries += 1
+            self.query_seconds += seconds
+            if seconds * 1000 >= settings.slow_query_ms:
+                self.slow_queries += 1
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self.lock:
+            lines += [
+                "# HELP http_requests_total Requests served, by route template and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status_code), value in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{labels(method=method, route=route, status=status_code)} {value}")
+
+            lines += [
+                "# HELP http_request_errors_total Requests that failed with a 5xx or an unhandled exception.",
+                "# TYPE http_request_errors_total counter",
+            ]
+            for (method, route), value in sorted(self.errors.items()):
+                lines.append(f"http_request_errors_total{labels(method=method, route=route)} {value}")
+
+            lines += [
+                "# HELP http_request_duration_seconds Request latency, by route template.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), buckets in sorted(self.latency_buckets.items()):
+                name = "http_request_duration_seconds"
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, buckets):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{labels(method=method, route=route, le=bound)} {cumulative}")
+                count = self.latency_count[(method, route)]
+                lines.append(f"{name}_bucket{labels(method=method, route=route, le='+Inf')} {count}")
+                lines.append(f"{name}_sum{labels(method=method, route=route)} {self.latency_sum[(method, route)]:.6f}")
+                lines.append(f"{name}_count{labels(method=method, route=route)} {count}")
+
+            lines += [
+                "# HELP db_queries_total SQL statements executed.",
+                "# TYPE db_queries_total counter",
+                f"db_queries_total {self.queries}",
+                "# HELP db_query_duration_seconds_total Time spent executing SQL statements.",
+                "# TYPE db_query_duration_seconds_total counter",
+                f"db_query_duration_seconds_total {self.query_seconds:.6f}",
+                f"# HELP db_slow_queries_total SQL statements slower than {settings.slow_query_ms}ms.",
+                "# TYPE db_slow_queries_total counter",
+                f"db_slow_queries_total {self.slow_queries}",
+            ]
+
+        lines += render_pool_gauges()
+        return "\n".join(lines) + "\n"
+
+
+def labels(**values) -> str:
+    rendered = ",".join(f'{name}="{escape(str(value))}"' for name, value in values.items())
+    return "{" + rendered + "}"
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def pools() -> list[tuple[str, object]]:
+    sources = [("primary", database.engine.pool), ("primary_async", database.async_engine.pool)]
+    if database.ReadSessionLocal is not None:
+        sources.append(("replica", database.ReadSessionLocal.kw["bind"].pool))
+    if database.AsyncReadSessionLocal is not None:
+        sources.append(("replica_async", database.AsyncReadSessionLocal.kw["bind"].pool))
+    return sources
+
+
+POOL_GAUGES = (
+    ("db_pool_size", "size", "Configured pool size."),
+    ("db_pool_checked_out", "checkedout", "Connections currently checked out of the pool."),
+    ("db_pool_overflow", "overflow", "Connections open beyond pool_size (negative: unused pool slots)."),
+)
+
+
+def render_pool_gauges() -> list[str]:
+    lines = []
+    sources = pools()
+    for name, method, description in POOL_GAUGES:
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} gauge"]
+        for pool_name, pool in sources:
+            # Only queue pools track these; single-connection SQLite pools have nothing to report.
+            if hasattr(pool, method):
+                lines.append(f"{name}{labels(pool=pool_name)} {getattr(pool, method)()}")
+    return lines
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            metrics.observe_request(scope["method"], path, status_code, time.perf_counter() - started)
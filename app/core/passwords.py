@@ -0,0 +1,65 @@
+"""Password hashing off the event loop.
+
+pbkdf2 is deliberately CPU-bound. Login and register hand it to a small dedicated process pool so a burst of
+logins at shift start cannot starve request handling of CPU or the GIL. The pool is sized by
+PASSWORD_HASH_WORKERS; 0 falls back to the default thread executor. Hashes whose scheme or rounds no longer
+match the configuration are reported by verify_and_update so login can store a fresh one.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.config import settings
+
+# Render is currently deploying on Python 3.13 where bcrypt wheels can be flaky.
+# Use pbkdf2_sha256 for new hashes (no external bcrypt backend required), while
+# still accepting existing bcrypt/bcrypt_sha256 hashes created previously.
+# Pinning min and max rounds to the configured value flags any hash made with other rounds for rehashing.
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256", "bcrypt_sha256", "bcrypt"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=settings.password_hash_rounds,
+    pbkdf2_sha256__min_rounds=settings.password_hash_rounds,
+    pbkdf2_sha256__max_rounds=settings.password_hash_rounds,
+)
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_and_update(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Return whether the password matches and, if the stored hash is outdated, a replacement hash."""
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+def get_pool() -> Executor | None:
+    global _pool
+    if settings.password_hash_workers <= 0:
+        return None
+    if _pool is None:
+        # spawn, not fork: the server process has live threads and an event loop that must not be copied.
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.password_hash_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(get_pool(), hash_password, password)
+
+
+async def verify_and_update_async(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await asyncio.get_running_loop().run_in_executor(get_pool(), verify_and_update, password, hashed_password)
@@ -0,0 +1,96 @@
+"""Per-request SQL statement counting.
+
+Every engine reports into the QueryStats of the request being served. The totals go out as a Server-Timing
+header, and a request that runs more statements than its budget is logged, or fails when
+settings.query_budget_strict is on (the test suite turns it on so N+1 regressions fail loudly).
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+@dataclass
+class QueryStats:
+    budget: int
+    count: int = 0
+    duration: float = 0.0
+
+
+current_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    metrics.observe_query(elapsed)
+    stats = current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+
+
+def query_budget(limit: int):
+    """Route dependency for endpoints that legitimately need more statements than the default budget."""
+
+    async def set_budget():
+        stats = current_stats.get()
+        if stats is not None:
+            stats.budget = limit
+
+    return set_budget
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(budget=settings.query_budget)
+        token = current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                check_budget(scope, stats)
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_stats.reset(token)
+
+
+def check_budget(scope, stats: QueryStats) -> None:
+    if stats.count <= stats.budget:
+        return
+    route = scope.get("route")
+    path = route.path if route is not None else scope["path"]
+    message = f"{scope['method']} {path} ran {stats.count} queries (budget {stats.budget})"
+    if settings.query_budget_strict:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
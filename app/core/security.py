@@ -1,55 +1,57 @@
 from datetime import datetime, timedelta
 from typing import Annotated
+from uuid import uuid4
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import schemas
 from app.config import settings
-from app.database import get_db
+from app.core.auth_cache import CurrentUser, token_cache, user_cache
+from app.core.passwords import hash_password
+from app.database import get_async_db
 from app.models import User, UserRole
 
-# Render is currently deploying on Python 3.13 where bcrypt wheels can be flaky.
-# Use pbkdf2_sha256 for new hashes (no external bcrypt backend required), while
-# still accepting existing bcrypt/bcrypt_sha256 hashes created previously.
-pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt_sha256", "bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token", auto_error=False)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hash_password(password)
 
 
-def create_token(subject: str, expires_delta: timedelta) -> str:
+def create_token(subject: str, expires_delta: timedelta, token_type: str) -> str:
     expire = datetime.utcnow() + expires_delta
-    to_encode = {"sub": subject, "exp": expire}
+    # jti identifies a refresh token in the revocation index; it also keeps tokens issued in the same second distinct.
+    to_encode = {"sub": subject, "exp": expire, "type": token_type, "jti": uuid4().hex}
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
 def create_access_token(user_id: int) -> str:
-    return create_token(str(user_id), timedelta(minutes=settings.access_token_expire_minutes))
+    return create_token(str(user_id), timedelta(minutes=settings.access_token_expire_minutes), "access")
 
 
 def create_refresh_token(user_id: int) -> str:
-    return create_token(str(user_id), timedelta(minutes=settings.refresh_token_expire_minutes))
+    return create_token(str(user_id), timedelta(minutes=settings.refresh_token_expire_minutes), "refresh")
 
 
-def get_user_by_id(db: Session, user_id: int) -> User | None:
-    return db.query(User).filter(User.id == user_id).first()
+def decode_refresh_token(token: str) -> dict | None:
+    """Claims of a valid refresh token, or None. Tokens issued before rotation existed carry no jti and are refused."""
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        return None
+    if payload.get("type") != "refresh" or not payload.get("jti") or payload.get("sub") is None:
+        return None
+    return payload
 
 
 async def get_current_user(
     token: Annotated[str | None, Depends(oauth2_scheme)],
     request: Request,
-    db: Annotated[Session, Depends(get_db)],
-) -> User:
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -61,27 +63,44 @@ async def get_current_user(
             token = cookie_token
     if not token:
         raise credentials_exception
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        user_id: str | None = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError as exc:
-        raise credentials_exception from exc
-
-    user = get_user_by_id(db, int(user_id))
+    user_id = token_cache.get(token)
+    if user_id is None:
+        try:
+            payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+            subject: str | None = payload.get("sub")
+            # Refresh tokens are only good for POST /auth/refresh.
+            if subject is None or payload.get("type") == "refresh":
+                raise credentials_exception
+        except JWTError as exc:
+            raise credentials_exception from exc
+        user_id = int(subject)
+        token_cache.put(token, user_id, payload.get("exp", 0))
+
+    user = await load_user(db, user_id)
     if user is None:
         raise credentials_exception
     return user
 
 
-def require_manager_or_admin(user: User):
+async def load_user(db: AsyncSession, user_id: int) -> CurrentUser | None:
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    user = await db.get(User, user_id)
+    if user is None:
+        return None
+    current = CurrentUser.from_user(user)
+    user_cache.put(current)
+    return current
+
+
+def require_manager_or_admin(user: CurrentUser):
     if user.role not in {UserRole.ADMIN, UserRole.MANAGER}:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
 
 
 async def get_current_manager_or_admin(
-    current_user: Annotated[User, Depends(get_current_user)],
-) -> User:
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+) -> CurrentUser:
     require_manager_or_admin(current_user)
     return current_user
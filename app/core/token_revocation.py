@@ -0,0 +1,68 @@
+"""Revocation index for refresh tokens, keyed by jti.
+
+A refresh token is revoked when it is rotated by POST /auth/refresh or when its session logs out. The
+revoked_tokens table is the source of truth shared by every worker: revoking is a single INSERT on the jti
+primary key, so it doubles as the "already used?" lookup and two concurrent refreshes with the same token
+cannot both succeed. Each process also remembers the jtis it has seen revoked, to reject replays without a
+round trip. Rows and entries are only needed until the token would have expired anyway, so both are pruned.
+"""
+
+import time
+from datetime import datetime, timezone
+from threading import Lock
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import RevokedToken
+
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+def naive_utc(timestamp: float) -> datetime:
+    """A Unix timestamp as the naive UTC datetime the revoked_tokens columns store."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+class RevocationStore:
+    def __init__(self):
+        self.revoked: dict[str, float] = {}
+        self.lock = Lock()
+        self.last_pruned = time.time()
+
+    def is_known_revoked(self, jti: str) -> bool:
+        with self.lock:
+            return jti in self.revoked
+
+    def remember(self, jti: str, expires_at: float) -> None:
+        with self.lock:
+            self.revoked[jti] = expires_at
+
+    async def revoke(self, db: AsyncSession, jti: str, user_id: int, expires_at: float) -> bool:
+        """Revoke a token; False means it was already revoked, i.e. the token is being replayed."""
+        if self.is_known_revoked(jti):
+            return False
+        db.add(RevokedToken(jti=jti, user_id=user_id, expires_at=naive_utc(expires_at)))
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            self.remember(jti, expires_at)
+            return False
+        self.remember(jti, expires_at)
+        await self.prune_if_due(db)
+        return True
+
+    async def prune_if_due(self, db: AsyncSession) -> None:
+        now = time.time()
+        if now - self.last_pruned < PRUNE_INTERVAL_SECONDS:
+            return
+        self.last_pruned = now
+        with self.lock:
+            self.revoked = {jti: expires_at for jti, expires_at in self.revoked.items() if expires_at > now}
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at < naive_utc(now)))
+        await db.commit()
+
+
+revocation_store = RevocationStore()
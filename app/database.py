@@ -1,55 +1,154 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import logging
+import time
+from pathlib import Path
+
+from fastapi import Depends
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its asyncio counterpart."""
+    scheme, separator, rest = url.partition("://")
+    driver = ASYNC_DRIVERS.get(scheme.split("+", 1)[0])
+    return f"{driver}{separator}{rest}" if driver else url
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def pool_options(url: str) -> dict:
+    options = {"pool_pre_ping": settings.db_pool_pre_ping, "pool_recycle": settings.db_pool_recycle}
+    # In-memory SQLite is pinned to one connection per thread/process; sizing it is meaningless.
+    if not (is_sqlite(url) and (url.endswith("://") or ":memory:" in url)):
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    return options
+
+
+def configure_sqlite_connection(dbapi_connection, connection_record):
+    """Apply per-connection SQLite pragmas.
+
+    WAL lets readers proceed while a writer holds the database, and busy_timeout makes a second
+    writer wait for the lock instead of failing immediately with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.close()
+
+
+def build_engine(url: str):
+    connect_args = {"check_same_thread": False} if is_sqlite(url) else {}
+    db_engine = create_engine(url, future=True, connect_args=connect_args, **pool_options(url))
+    if is_sqlite(url):
+        event.listen(db_engine, "connect", configure_sqlite_connection)
+    return db_engine
+
 
-connect_args = {}
-if settings.database_url.startswith("sqlite"):
-    connect_args["check_same_thread"] = False
+def build_async_engine(url: str):
+    url = async_database_url(url)
+    db_engine = create_async_engine(url, **pool_options(url))
+    if is_sqlite(url):
+        event.listen(db_engine.sync_engine, "connect", configure_sqlite_connection)
+    return db_engine
 
-engine = create_engine(settings.database_url, future=True, connect_args=connect_args)
+
+engine = build_engine(settings.database_url)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+async_engine = build_async_engine(settings.database_url)
+# expire_on_commit=False: async handlers return ORM objects after commit, and response serialization
+# runs outside the session's greenlet where an expired attribute cannot lazy-load.
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+ReadSessionLocal = None
+AsyncReadSessionLocal = None
+if settings.read_database_url:
+    ReadSessionLocal = sessionmaker(
+        bind=build_engine(settings.read_database_url), autoflush=False, autocommit=False, future=True
+    )
+    AsyncReadSessionLocal = async_sessionmaker(
+        bind=build_async_engine(settings.read_database_url), autoflush=False, expire_on_commit=False
+    )
+
+
+class ReplicaHealth:
+    """After a failed replica connect, send reads to the primary for a cooldown instead of retrying per request."""
+
+    def __init__(self, retry_seconds: int):
+        self.retry_seconds = retry_seconds
+        self.down_until = 0.0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self, exc: Exception):
+        logger.warning("Read replica unavailable, using primary for %ss: %s", self.retry_seconds, exc)
+        self.down_until = time.monotonic() + self.retry_seconds
+
+    def reset(self):
+        self.down_until = 0.0
+
+
+replica_health = ReplicaHealth(settings.read_replica_retry_seconds)
+
 
 class Base(DeclarativeBase):
     pass
 
 
-def ensure_sqlite_sections_columns():
-    if not settings.database_url.startswith("sqlite"):
+# Head of migrations/versions. Bump it with every new revision; tests/test_migrations.py checks the two agree.
+SCHEMA_REVISION = "0005"
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def schema_revision(db_engine) -> str | None:
+    """Return the database's migration revision in one query, or None if it was never migrated."""
+    with db_engine.connect() as conn:
+        try:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except DBAPIError:
+            return None
+
+
+def upgrade_schema(url: str | None = None) -> None:
+    """Run `alembic upgrade head` in-process against url (default: the configured database)."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("sqlalchemy.url", (url or settings.database_url).replace("%", "%%"))
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+
+def check_schema_version(db_engine) -> None:
+    """Startup guard: one SELECT when the schema is current, instead of DDL/introspection on every boot."""
+    current = schema_revision(db_engine)
+    if current == SCHEMA_REVISION:
         return
-    from sqlalchemy import text
-
-    with engine.connect() as conn:
-        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(sections)"))]
-        if "tables" not in columns:
-            conn.execute(text("ALTER TABLE sections ADD COLUMN tables TEXT"))
-        if "tags" not in columns:
-            conn.execute(text("ALTER TABLE sections ADD COLUMN tags TEXT"))
-        if "cut_order" not in columns:
-            conn.execute(text("ALTER TABLE sections ADD COLUMN cut_order INTEGER"))
-        if "sidework" not in columns:
-            conn.execute(text("ALTER TABLE sections ADD COLUMN sidework TEXT"))
-        if "outwork" not in columns:
-            conn.execute(text("ALTER TABLE sections ADD COLUMN outwork TEXT"))
-        if "max_capacity" not in columns:
-            conn.execute(text("ALTER TABLE sections ADD COLUMN max_capacity INTEGER"))
-        if "expected_out_time" not in columns:
-            conn.execute(text("ALTER TABLE sections ADD COLUMN expected_out_time VARCHAR(50)"))
-        conn.commit()
-
-
-def ensure_sqlite_user_columns():
-    if not settings.database_url.startswith("sqlite"):
+    if settings.migrate_on_startup:
+        upgrade_schema(db_engine.url.render_as_string(hide_password=False))
         return
-    from sqlalchemy import text
-
-    with engine.connect() as conn:
-        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(users)"))]
-        if "employee_id" not in columns:
-            conn.execute(text("ALTER TABLE users ADD COLUMN employee_id INTEGER"))
-        conn.commit()
+    raise RuntimeError(
+        f"Database schema is at revision {current or 'none'}, expected {SCHEMA_REVISION}; run `alembic upgrade head`"
+    )
 
 
 def get_db():
@@ -58,3 +157,49 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Read-only handlers depend on these instead of get_db/get_async_db. Replica data can lag the primary, so
+# only list/report endpoints use them; anything that reads its own writes stays on the primary. The primary
+# session is a dependency so the fallback shares the request's session (and any test override of get_db).
+
+
+def get_read_db(primary: Session = Depends(get_db)):
+    if ReadSessionLocal is None or not replica_health.available():
+        yield primary
+        return
+    db = ReadSessionLocal()
+    try:
+        db.connection()
+    except (DBAPIError, OSError) as exc:
+        db.close()
+        replica_health.mark_down(exc)
+        yield primary
+        return
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(primary: AsyncSession = Depends(get_async_db)):
+    if AsyncReadSessionLocal is None or not replica_health.available():
+        yield primary
+        return
+    db = AsyncReadSessionLocal()
+    try:
+        await db.connection()
+    except (DBAPIError, OSError) as exc:
+        await db.close()
+        replica_health.mark_down(exc)
+        yield primary
+        return
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,18 +1,34 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
-from app.database import Base, engine, ensure_sqlite_sections_columns, ensure_sqlite_user_columns
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.passwords import shutdown_pool
+from app.core.query_stats import QueryStatsMiddleware
+from app.database import check_schema_version, engine
+from app.services.import_jobs import runner as import_job_runner
 from app.routers import auth, employees, imports, sections, shifts, team_sheets, cobrands, gift_tracker, payouts, seasons, store_preferences, pos, inventory, daily_rosters, teamsheet_presets, pyos
 
 PUBLIC_DIR = Path(__file__).resolve().parent.parent / "public"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema changes ship as alembic migrations; startup only confirms the database is at the expected revision.
+    check_schema_version(engine)
+    import_job_runner.fail_abandoned(engine)
+    yield
+    shutdown_pool()
+    import_job_runner.shutdown()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -21,6 +37,8 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(MetricsMiddleware)
 
     if PUBLIC_DIR.exists():
         app.mount("/static", StaticFiles(directory=PUBLIC_DIR), name="static")
@@ -50,10 +68,11 @@ def create_app() -> FastAPI:
     def health():
         return {"status": "ok", "app": settings.app_name}
 
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
     return app
 
 
-Base.metadata.create_all(bind=engine)
-ensure_sqlite_sections_columns()
-ensure_sqlite_user_columns()
 app = create_app()
@@ -3,6 +3,8 @@ from .models import (
     Employee,
     EmployeeRole,
     GiftTrackerEntry,
+    ImportJob,
+    ImportJobStatus,
     OutworkAssignment,
     OutworkTask,
     POSOrder,
@@ -18,6 +20,8 @@ from .models import (
     RecipeItem,
     PayoutAdjustment,
     PayoutRule,
+    PayoutSummaryEntry,
+    PayoutSummarySeason,
     PayoutTier,
     PayoutType,
     Prize,
@@ -27,6 +31,7 @@ from .models import (
     PyosRequest,
     PyosShift,
     PyosStatus,
+    RevokedToken,
     Season,
     StorePreference,
     Section,
@@ -45,8 +50,12 @@ from .models import (
 __all__ = [
     "CobrandDeal",
     "GiftTrackerEntry",
+    "ImportJob",
+    "ImportJobStatus",
     "PayoutTier",
     "PayoutRule",
+    "PayoutSummaryEntry",
+    "PayoutSummarySeason",
     "PayoutType",
     "Prize",
     "PrizeAssignment",
@@ -55,6 +64,7 @@ __all__ = [
     "PyosRequest",
     "PyosShift",
     "PyosStatus",
+    "RevokedToken",
     "PayoutAdjustment",
     "Season",
     "StorePreference",
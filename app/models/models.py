@@ -9,6 +9,7 @@ from sqlalchemy import (
     Enum,
     ForeignKey,
     Float,
+    Index,
     Integer,
     JSON,
     String,
@@ -67,6 +68,13 @@ class PyosStatus(str, enum.Enum):
     REVOKED = "REVOKED"
 
 
+class ImportJobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
 class TimestampMixin:
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow
@@ -91,6 +99,16 @@ class User(Base, TimestampMixin):
     employee = relationship("Employee")
 
 
+class RevokedToken(Base):
+    """Refresh tokens that were rotated or logged out, by jti. Rows past expires_at are pruned."""
+
+    __tablename__ = "revoked_tokens"
+
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
 class Employee(Base, TimestampMixin):
     __tablename__ = "employees"
 
@@ -142,12 +160,14 @@ class Shift(Base, TimestampMixin):
     creator = relationship("User", back_populates="shifts")
     team_sheets = relationship("TeamSheet", back_populates="shift")
 
+    __table_args__ = (Index("ix_shifts_date_time_period", "date", "time_period"),)
+
 
 class TeamSheet(Base, TimestampMixin):
     __tablename__ = "team_sheets"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    shift_id: Mapped[int] = mapped_column(ForeignKey("shifts.id"))
+    shift_id: Mapped[int] = mapped_column(ForeignKey("shifts.id"), index=True)
     title: Mapped[str] = mapped_column(String(255))
     status: Mapped[TeamSheetStatus] = mapped_column(Enum(TeamSheetStatus), default=TeamSheetStatus.DRAFT)
     notes: Mapped[str | None] = mapped_column(Text)
@@ -164,7 +184,7 @@ class TeamSheetAssignment(Base):
     __tablename__ = "team_sheet_assignments"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    team_sheet_id: Mapped[int] = mapped_column(ForeignKey("team_sheets.id"))
+    team_sheet_id: Mapped[int] = mapped_column(ForeignKey("team_sheets.id"), index=True)
     employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"))
     section_id: Mapped[int] = mapped_column(ForeignKey("sections.id"))
     role_label: Mapped[str | None] = mapped_column(String(100))
@@ -179,7 +199,7 @@ class SideworkTask(Base):
     __tablename__ = "sidework_tasks"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    team_sheet_id: Mapped[int] = mapped_column(ForeignKey("team_sheets.id"))
+    team_sheet_id: Mapped[int] = mapped_column(ForeignKey("team_sheets.id"), index=True)
     label: Mapped[str] = mapped_column(String(255))
     description: Mapped[str | None] = mapped_column(Text)
 
@@ -191,7 +211,7 @@ class SideworkAssignment(Base):
     __tablename__ = "sidework_assignments"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    task_id: Mapped[int] = mapped_column(ForeignKey("sidework_tasks.id"))
+    task_id: Mapped[int] = mapped_column(ForeignKey("sidework_tasks.id"), index=True)
     employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"))
 
     task = relationship("SideworkTask", back_populates="assignments")
@@ -201,7 +221,7 @@ class OutworkTask(Base):
     __tablename__ = "outwork_tasks"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    team_sheet_id: Mapped[int] = mapped_column(ForeignKey("team_sheets.id"))
+    team_sheet_id: Mapped[int] = mapped_column(ForeignKey("team_sheets.id"), index=True)
     label: Mapped[str] = mapped_column(String(255))
     description: Mapped[str | None] = mapped_column(Text)
 
@@ -213,7 +233,7 @@ class OutworkAssignment(Base):
     __tablename__ = "outwork_assignments"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    task_id: Mapped[int] = mapped_column(ForeignKey("outwork_tasks.id"))
+    task_id: Mapped[int] = mapped_column(ForeignKey("outwork_tasks.id"), index=True)
     employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"))
 
     task = relationship("OutworkTask", back_populates="assignments")
@@ -305,6 +325,8 @@ class PyosRequest(Base, TimestampMixin):
 
     __table_args__ = (
         UniqueConstraint("section_id", "date", "shift", name="uq_pyos_section_date_shift"),
+        # Occupied-section lookups filter by day and shift across all sections.
+        Index("ix_pyos_requests_date_shift_status", "date", "shift", "status"),
     )
 
 
@@ -321,6 +343,8 @@ class PyosAudit(Base, TimestampMixin):
     actor = relationship("User")
     employee = relationship("Employee")
 
+    __table_args__ = (Index("ix_pyos_audit_employee_id_created_at", "employee_id", "created_at"),)
+
 
 class PayoutType(str, enum.Enum):
     FIXED = "FIXED"
@@ -385,6 +409,32 @@ class PayoutAdjustment(Base, TimestampMixin):
     amount_cents: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
 
+class PayoutSummaryEntry(Base, TimestampMixin):
+    __tablename__ = "payout_summary_entries"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    season_year: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    employee_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    sales_sources: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # gift rows + cobrand deals
+    sales_total_cents: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tier_payout_cents: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rule_payout_cents: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    misc_cents: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    prize_value_cents: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_payout_cents: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("season_year", "employee_name", name="uq_payout_summary_season_employee"),
+    )
+
+
+class PayoutSummarySeason(Base, TimestampMixin):
+    __tablename__ = "payout_summary_seasons"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    season_year: Mapped[int] = mapped_column(Integer, nullable=False, unique=True, index=True)
+
+
 class Season(Base, TimestampMixin):
     __tablename__ = "seasons"
 
@@ -497,7 +547,7 @@ class StockMovement(Base, TimestampMixin):
     __tablename__ = "stock_movements"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    ingredient_id: Mapped[int] = mapped_column(ForeignKey("ingredients.id"))
+    ingredient_id: Mapped[int] = mapped_column(ForeignKey("ingredients.id"), index=True)
     quantity_change: Mapped[float] = mapped_column(Float, default=0)
     reason: Mapped[str] = mapped_column(String(100))
     order_item_id: Mapped[int | None] = mapped_column(ForeignKey("pos_order_items.id"))
@@ -522,3 +572,22 @@ class TeamSheetPreset(Base, TimestampMixin):
     name: Mapped[str] = mapped_column(String(150), nullable=False)
     store_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
     data_json: Mapped[list[dict] | None] = mapped_column(JSON, nullable=True)
+
+
+class ImportJob(Base, TimestampMixin):
+    __tablename__ = "import_jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50))
+    status: Mapped[ImportJobStatus] = mapped_column(
+        Enum(ImportJobStatus), default=ImportJobStatus.QUEUED, index=True
+    )
+    params_json: Mapped[dict | None] = mapped_column(JSON)
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0)
+    result_json: Mapped[dict | None] = mapped_column(JSON)
+    error: Mapped[str | None] = mapped_column(Text)
+    created_by_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # "host:pid" of the process whose queue holds the job, and when that process last vouched for it.
+    owner: Mapped[str | None] = mapped_column(String(100))
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -1,17 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import schemas
 from app.config import settings
 from app.core.security import (
+    CurrentUser,
     create_access_token,
     create_refresh_token,
+    decode_refresh_token,
+    get_current_manager_or_admin,
     get_current_user,
-    get_password_hash,
-    verify_password,
+    load_user,
 )
-from app.database import get_db
+from app.core.passwords import hash_password_async, verify_and_update_async
+from app.core.token_revocation import revocation_store
+from app.database import get_async_db, get_db
 from app.models import User
 
 
@@ -40,25 +46,39 @@ def set_auth_cookies(response: Response, access_token: str, refresh_token: str,
     )
 
 
+async def authenticate(db: AsyncSession, email: str, password: str) -> User:
+    user = await db.scalar(select(User).filter(User.email == email).limit(1))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
+    verified, new_hash = await verify_and_update_async(password, user.password_hash)
+    if not verified:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
+    if new_hash:
+        # The stored hash predates the current scheme or rounds; replace it while we have the plain password.
+        user.password_hash = new_hash
+        await db.commit()
+    return user
+
+
 @router.post("/register", response_model=schemas.UserRead, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_in: schemas.UserCreate,
     response: Response,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    existing = db.query(User).filter(User.email == user_in.email).first()
+    existing = await db.scalar(select(User.id).filter(User.email == user_in.email).limit(1))
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     user = User(
         email=user_in.email,
-        password_hash=get_password_hash(user_in.password),
+        password_hash=await hash_password_async(user_in.password),
         full_name=user_in.full_name,
         role=user_in.role,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     access_token = create_access_token(user.id)
     refresh_token = create_refresh_token(user.id)
     set_auth_cookies(response, access_token, refresh_token, request)
@@ -66,10 +86,10 @@ def register(
 
 
 @router.post("/login", response_model=schemas.TokenResponse)
-def login(form_data: schemas.LoginRequest, response: Response, request: Request, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.email).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
+async def login(
+    form_data: schemas.LoginRequest, response: Response, request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    user = await authenticate(db, form_data.email, form_data.password)
     access_token = create_access_token(user.id)
     refresh_token = create_refresh_token(user.id)
     set_auth_cookies(response, access_token, refresh_token, request)
@@ -77,16 +97,14 @@ def login(form_data: schemas.LoginRequest, response: Response, request: Request,
 
 
 @router.post("/token", response_model=schemas.TokenResponse)
-def login_token(
+async def login_token(
     response: Response,
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """OAuth2 password flow support for the Swagger Authorize modal."""
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
+    user = await authenticate(db, form_data.username, form_data.password)
     access_token = create_access_token(user.id)
     refresh_token = create_refresh_token(user.id)
     set_auth_cookies(response, access_token, refresh_token, request)
@@ -94,7 +112,7 @@ def login_token(
 
 
 @router.get("/me", response_model=schemas.UserRead)
-def me(current_user: User = Depends(get_current_user)):
+def me(current_user: CurrentUser = Depends(get_current_user)):
     return current_user
 
 
@@ -103,7 +121,7 @@ def link_employee(
     user_id: int,
     payload: schemas.UserEmployeeLink,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -119,8 +137,35 @@ def link_employee(
     return user
 
 
+@router.post("/refresh", response_model=schemas.TokenResponse)
+async def refresh(
+    response: Response,
+    request: Request,
+    payload: schemas.RefreshRequest | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Exchange a refresh token for a new access/refresh pair; the presented refresh token is revoked."""
+    token = (payload.refresh_token if payload else None) or request.cookies.get("tss_refresh_token")
+    claims = decode_refresh_token(token) if token else None
+    if claims is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    user_id = int(claims["sub"])
+    if not await revocation_store.revoke(db, claims["jti"], user_id, claims["exp"]):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token has already been used")
+    user = await load_user(db, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    access_token = create_access_token(user.id)
+    refresh_token = create_refresh_token(user.id)
+    set_auth_cookies(response, access_token, refresh_token, request)
+    return schemas.TokenResponse(access_token=access_token, refresh_token=refresh_token)
+
+
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-def logout(response: Response, request: Request):
+async def logout(response: Response, request: Request, db: AsyncSession = Depends(get_async_db)):
+    claims = decode_refresh_token(request.cookies.get("tss_refresh_token") or "")
+    if claims is not None:
+        await revocation_store.revoke(db, claims["jti"], int(claims["sub"]), claims["exp"])
     secure_cookie = request.url.scheme == "https"
     response = Response(status_code=status.HTTP_204_NO_CONTENT)
     response.delete_cookie("tss_access_token", path="/", samesite="lax", secure=secure_cookie)
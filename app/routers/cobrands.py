@@ -2,12 +2,13 @@ from decimal import Decimal, ROUND_HALF_UP
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import asc, desc
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app import schemas
-from app.core.security import get_current_user
+from app.core.security import CurrentUser, get_current_user
 from app.database import get_db
-from app.models import CobrandDeal, Employee, EmployeeRole, User
+from app.models import CobrandDeal, Employee, EmployeeRole
+from app.services import payouts as payout_service
 
 router = APIRouter(prefix="/cobrands", tags=["cobrands"])
 
@@ -23,7 +24,7 @@ def list_cobrand_deals(
     sort_dir: str = Query(default="desc"),
     season_year: int | None = Query(default=None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     sort_map = {
         "company_name": CobrandDeal.company_name,
@@ -35,7 +36,7 @@ def list_cobrand_deals(
     }
     sort_col = sort_map.get(sort_by, CobrandDeal.created_at)
     direction = desc if sort_dir.lower() == "desc" else asc
-    query = db.query(CobrandDeal)
+    query = db.query(CobrandDeal).options(selectinload(CobrandDeal.seller))
     if season_year is not None:
         query = query.filter(CobrandDeal.season_year == season_year)
     return query.order_by(direction(sort_col)).all()
@@ -45,7 +46,7 @@ def list_cobrand_deals(
 def create_cobrand_deal(
     payload: schemas.CobrandDealCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     if payload.amount_usd <= 0:
         raise HTTPException(status_code=400, detail="Amount must be greater than zero")
@@ -81,6 +82,12 @@ def create_cobrand_deal(
     )
 
     db.add(deal)
+    if deal.seller_id:
+        db.flush()
+        seller_name = deal.seller_name
+        payout_service.apply_changes(
+            db, deal.season_year, sales={seller_name: deal.amount_cents}, sources={seller_name: 1}
+        )
     db.commit()
     db.refresh(deal)
     return deal
@@ -90,7 +97,7 @@ def create_cobrand_deal(
 def list_cobrand_sellers(
     search: str | None = Query(default=None, min_length=1),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(Employee).filter(Employee.active.is_(True))
 
@@ -4,9 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
 from app.database import get_db
-from app.models import DailyRoster, User
+from app.models import DailyRoster
 
 router = APIRouter(prefix="/daily-rosters", tags=["daily-rosters"])
 
@@ -16,7 +16,7 @@ def list_daily_rosters(
     roster_date: date | None = Query(default=None, alias="date"),
     store_id: int | None = Query(default=None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(DailyRoster)
     if roster_date:
@@ -30,7 +30,7 @@ def list_daily_rosters(
 def upsert_daily_roster(
     payload: schemas.DailyRosterCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     roster = (
         db.query(DailyRoster)
@@ -2,9 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
 from app.database import get_db
-from app.models import Employee, EmployeeRole, User
+from app.models import Employee, EmployeeRole
+from app.services import payouts as payout_service
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 
@@ -16,7 +17,7 @@ def list_employees(
     search: str | None = Query(default=None),
     sort_by: str | None = Query(default=None, description="upsell_score or employment_days"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(Employee)
     if role:
@@ -43,7 +44,7 @@ def list_employees(
 def create_employee(
     payload: schemas.EmployeeCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     employee = Employee(**payload.dict())
     db.add(employee)
@@ -53,7 +54,7 @@ def create_employee(
 
 
 @router.get("/{employee_id}", response_model=schemas.EmployeeRead)
-def get_employee(employee_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_employee(employee_id: int, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     employee = db.query(Employee).filter(Employee.id == employee_id).first()
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
@@ -65,13 +66,17 @@ def update_employee(
     employee_id: int,
     payload: schemas.EmployeeUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     employee = db.query(Employee).filter(Employee.id == employee_id).first()
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
+    previous_name = (employee.first_name, employee.last_name, employee.nickname)
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(employee, field, value)
+    if (employee.first_name, employee.last_name, employee.nickname) != previous_name:
+        # Payout summaries hold cobrand sales under the seller's name.
+        payout_service.rebuild_seller_seasons(db, employee.id)
     db.commit()
     db.refresh(employee)
     return employee
@@ -81,7 +86,7 @@ def update_employee(
 def deactivate_employee(
     employee_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     employee = db.query(Employee).filter(Employee.id == employee_id).first()
     if not employee:
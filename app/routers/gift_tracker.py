@@ -1,53 +1,61 @@
+from collections import defaultdict
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
-from app.database import get_db
-from app.models import GiftTrackerEntry, User
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
+from app.database import get_async_db, get_async_read_db
+from app.models import GiftTrackerEntry
+from app.services import payouts as payout_service
 
 router = APIRouter(prefix="/gift-tracker", tags=["gift-tracker"])
 
 
 @router.get("", response_model=list[schemas.GiftTrackerEntryRead])
-def list_gift_tracker_entries(
+async def list_gift_tracker_entries(
     week_number: int | None = Query(default=None, ge=1),
     season_year: int | None = Query(default=None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    query = db.query(GiftTrackerEntry)
+    query = select(GiftTrackerEntry)
     if week_number is not None:
         query = query.filter(GiftTrackerEntry.week_number == week_number)
     if season_year is not None:
         query = query.filter(GiftTrackerEntry.season_year == season_year)
-    return query.order_by(GiftTrackerEntry.week_number.asc(), GiftTrackerEntry.employee_name.asc()).all()
+    query = query.order_by(GiftTrackerEntry.week_number.asc(), GiftTrackerEntry.employee_name.asc())
+    return (await db.scalars(query)).all()
 
 
 @router.post("", response_model=list[schemas.GiftTrackerEntryRead], status_code=status.HTTP_201_CREATED)
-def upsert_gift_tracker_entries(
+async def upsert_gift_tracker_entries(
     payload: schemas.GiftTrackerUpsertRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     week = payload.week_number
     if week < 1:
         raise HTTPException(status_code=400, detail="Week number must be at least 1")
 
-    existing = {
-        (entry.employee_name.lower(), entry.week_number): entry
-        for entry in db.query(GiftTrackerEntry)
-        .filter(GiftTrackerEntry.week_number == week, GiftTrackerEntry.season_year == payload.season_year)
-        .all()
-    }
+    current = await db.scalars(
+        select(GiftTrackerEntry).filter(
+            GiftTrackerEntry.week_number == week, GiftTrackerEntry.season_year == payload.season_year
+        )
+    )
+    existing = {(entry.employee_name.lower(), entry.week_number): entry for entry in current}
 
     seen_keys: set[tuple[str, int]] = set()
     results: list[GiftTrackerEntry] = []
+    sales_delta: dict[str, int] = defaultdict(int)
+    source_delta: dict[str, int] = defaultdict(int)
     for item in payload.entries:
         key = (item.employee_name.lower(), week)
         seen_keys.add(key)
         record = existing.get(key)
         if record:
+            sales_delta[record.employee_name] -= payout_service.gift_entry_cents(record)
             record.tuesday = item.tuesday
             record.wednesday = item.wednesday
             record.thursday = item.thursday
@@ -69,14 +77,19 @@ def upsert_gift_tracker_entries(
                 monday=item.monday,
             )
             db.add(record)
+            source_delta[record.employee_name] += 1
+        sales_delta[record.employee_name] += payout_service.gift_entry_cents(record)
         results.append(record)
 
     # Remove entries for this week that were not included in the payload
     to_delete = [entry for key, entry in existing.items() if key not in seen_keys]
     for entry in to_delete:
-        db.delete(entry)
+        await db.delete(entry)
+        sales_delta[entry.employee_name] -= payout_service.gift_entry_cents(entry)
+        source_delta[entry.employee_name] -= 1
 
-    db.commit()
-    for record in results:
-        db.refresh(record)
+    await db.run_sync(
+        payout_service.apply_changes, payload.season_year, sales=sales_delta, sources=source_delta
+    )
+    await db.commit()
     return results
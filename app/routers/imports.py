@@ -1,143 +1,84 @@
-import csv
-import io
-from datetime import date, timedelta
+from datetime import date
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 from sqlalchemy.orm import Session
 
+from app import schemas
+from app.core.query_stats import query_budget
 from app.core.security import get_current_manager_or_admin
 from app.database import get_db
-from app.models import DailyRoster, Employee, EmployeeRole
+from app.models import ImportJob
+from app.services import daily_roster_import, import_jobs, server_import
 
 router = APIRouter(prefix="/imports", tags=["imports"])
 
 
-def _parse_int(value: str | None) -> int | None:
-    if value is None:
-        return None
-    value = value.strip()
-    if not value:
-        return None
-    try:
-        return int(float(value))
-    except ValueError:
-        return None
-
-
-@router.post("/servers", status_code=status.HTTP_201_CREATED)
-async def import_servers(
+@router.post("/servers", status_code=status.HTTP_201_CREATED, dependencies=[Depends(query_budget(100))])
+def import_servers(
     file: UploadFile = File(..., description="CSV with columns: name, upsell_score, pitty, employment_days, max_guests"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_manager_or_admin),
 ):
-    raw = await file.read()
+    """Upsert servers by name. Invalid rows are skipped and listed in `errors` with their CSV line number."""
+    # A sync handler: parsing and the bulk writes run on the threadpool, reading the spooled upload directly.
     try:
-        text = raw.decode("utf-8-sig")
-    except UnicodeDecodeError:
-        text = raw.decode("latin-1")
+        result = server_import.import_servers(db, file.file)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    db.commit()
+    return result
 
-    reader = csv.DictReader(io.StringIO(text))
-    if not reader.fieldnames or "name" not in {h.lower() for h in reader.fieldnames}:
-        raise HTTPException(status_code=400, detail="CSV must include a 'name' column.")
 
-    created = 0
-    updated = 0
-    for row in reader:
-        name = row.get("name") or row.get("Name")
-        if not name:
-            continue
-        parts = name.strip().split()
-        first_name = parts[0]
-        last_name = parts[1] if len(parts) > 1 else ""
+@router.post("/daily-roster", status_code=status.HTTP_201_CREATED)
+def import_daily_roster(
+    roster_date: date = Query(..., alias="date"),
+    store_id: int | None = Query(default=None),
+    file: UploadFile = File(..., description="CSV with column: name"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_manager_or_admin),
+):
+    try:
+        roster = daily_roster_import.import_daily_roster(db, file.file, roster_date, store_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    db.commit()
+    db.refresh(roster)
+    return {"date": roster.date.isoformat(), "store_id": roster.store_id, "count": len(roster.entries)}
 
-        upsell_score = _parse_int(row.get("upsell_score") or row.get("Upsell"))
-        pitty = _parse_int(row.get("pitty") or row.get("Pitty"))
-        employment_days = _parse_int(row.get("employment_days") or row.get("employment"))
-        max_guests = _parse_int(row.get("max_guests") or row.get("capacity") or row.get("max_section_load"))
-        nickname = row.get("nickname")
 
-        employee = (
-            db.query(Employee)
-            .filter(Employee.first_name == first_name, Employee.last_name == last_name)
-            .first()
-        )
-        if not employee:
-            employee = Employee(
-                first_name=first_name,
-                last_name=last_name,
-                nickname=nickname,
-                role=EmployeeRole.SERVER,
-                employment_start_date=date.today(),
-                active=True,
-            )
-            db.add(employee)
-            created += 1
-        else:
-            updated += 1
+# Background variants of the imports above for large files: they return a queued job straight away.
 
-        if nickname:
-            employee.nickname = nickname
-        if upsell_score is not None:
-            employee.upsell_score = upsell_score
-        if pitty is not None:
-            employee.pitty_score = pitty
-        if employment_days is not None:
-            employee.employment_days = employment_days
-            employee.employment_start_date = date.today() - timedelta(days=employment_days)
-        if max_guests is not None:
-            employee.max_section_load = max_guests
 
-    db.commit()
-    return {"created": created, "updated": updated}
+@router.post("/jobs/servers", response_model=schemas.ImportJobRead, status_code=status.HTTP_202_ACCEPTED)
+def queue_server_import(
+    file: UploadFile = File(..., description="CSV with columns: name, upsell_score, pitty, employment_days, max_guests"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_manager_or_admin),
+):
+    return import_jobs.runner.submit(db, "servers", file.file, {}, current_user.id)
 
 
-@router.post("/daily-roster", status_code=status.HTTP_201_CREATED)
-async def import_daily_roster(
+@router.post("/jobs/daily-roster", response_model=schemas.ImportJobRead, status_code=status.HTTP_202_ACCEPTED)
+def queue_daily_roster_import(
     roster_date: date = Query(..., alias="date"),
     store_id: int | None = Query(default=None),
     file: UploadFile = File(..., description="CSV with column: name"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_manager_or_admin),
 ):
-    raw = await file.read()
-    try:
-        text = raw.decode("utf-8-sig")
-    except UnicodeDecodeError:
-        text = raw.decode("latin-1")
-
-    reader = csv.DictReader(io.StringIO(text))
-    if not reader.fieldnames:
-        raise HTTPException(status_code=400, detail="CSV must include a header row.")
+    params = {"date": roster_date.isoformat(), "store_id": store_id}
+    return import_jobs.runner.submit(db, "daily_roster", file.file, params, current_user.id)
 
-    headers = {h.lower() for h in reader.fieldnames}
-    name_key = "name" if "name" in headers else None
-    has_in_time = "in_time" in headers
-    if not name_key:
-        raise HTTPException(status_code=400, detail="CSV must include a 'name' column.")
 
-    entries = []
-    for row in reader:
-        name = row.get("name") or row.get("Name")
-        if not name:
-            continue
-        entry = {"name": name.strip()}
-        if has_in_time:
-            in_time = row.get("in_time") or row.get("In_time") or row.get("In Time")
-            if in_time:
-                entry["in_time"] = str(in_time).strip()
-        entries.append(entry)
-
-    roster = (
-        db.query(DailyRoster)
-        .filter(DailyRoster.date == roster_date, DailyRoster.store_id == store_id)
-        .first()
+@router.get("/jobs/{job_id}", response_model=schemas.ImportJobRead)
+def get_import_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_manager_or_admin),
+):
+    job = db.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return schemas.ImportJobRead.model_validate(job).model_copy(
+        update={"rows_processed": import_jobs.runner.rows_processed(job)}
     )
-    if roster:
-        roster.entries = entries
-    else:
-        roster = DailyRoster(date=roster_date, store_id=store_id, entries=entries)
-        db.add(roster)
-
-    db.commit()
-    db.refresh(roster)
-    return {"date": roster.date.isoformat(), "store_id": roster.store_id, "count": len(entries)}
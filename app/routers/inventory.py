@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
 from app.database import get_db
-from app.models import Ingredient, RecipeItem, StockMovement, User
+from app.models import Ingredient, RecipeItem, StockMovement
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
@@ -13,7 +14,7 @@ router = APIRouter(prefix="/inventory", tags=["inventory"])
 def list_ingredients(
     active: bool | None = Query(default=None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(Ingredient)
     if active is not None:
@@ -25,7 +26,7 @@ def list_ingredients(
 def create_ingredient(
     payload: schemas.IngredientCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     ingredient = Ingredient(**payload.dict())
     db.add(ingredient)
@@ -38,7 +39,7 @@ def create_ingredient(
 def create_recipe_item(
     payload: schemas.RecipeItemCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     recipe = RecipeItem(**payload.dict())
     db.add(recipe)
@@ -51,7 +52,7 @@ def create_recipe_item(
 def receive_stock(
     payload: schemas.StockMovementCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     ingredient = db.query(Ingredient).filter(Ingredient.id == payload.ingredient_id).first()
     if not ingredient:
@@ -72,7 +73,7 @@ def receive_stock(
 def adjust_stock(
     payload: schemas.StockMovementCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     ingredient = db.query(Ingredient).filter(Ingredient.id == payload.ingredient_id).first()
     if not ingredient:
@@ -90,11 +91,15 @@ def adjust_stock(
 
 
 @router.get("/stock-levels", response_model=list[schemas.StockLevelRead])
-def stock_levels(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    ingredients = db.query(Ingredient).all()
+def stock_levels(db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
+    totals = (
+        db.query(Ingredient, func.coalesce(func.sum(StockMovement.quantity_change), 0))
+        .outerjoin(StockMovement, StockMovement.ingredient_id == Ingredient.id)
+        .group_by(Ingredient.id)
+        .all()
+    )
     results = []
-    for ingredient in ingredients:
-        total = sum(m.quantity_change for m in ingredient.stock_movements)
+    for ingredient, total in totals:
         results.append(
             schemas.StockLevelRead(
                 ingredient_id=ingredient.id,
@@ -1,37 +1,40 @@
 import json
-from collections import defaultdict
-from decimal import Decimal, ROUND_HALF_UP
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
-from app.database import get_db
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
+from app.database import get_db, get_read_db
 from app.models import (
-    CobrandDeal,
-    GiftTrackerEntry,
     PayoutAdjustment,
     PayoutRule,
     PayoutTier,
-    PayoutType,
     Prize,
     PrizeAssignment,
-    User,
 )
+from app.services import payouts as payout_service
 
 router = APIRouter(prefix="/payouts", tags=["payouts"])
 
 
-def _to_cents(amount: Decimal) -> int:
-    return int((amount * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+def rebuild_prize_seasons(db: Session, prize_id: int):
+    seasons = (
+        db.query(PrizeAssignment.season_year)
+        .filter(PrizeAssignment.prize_id == prize_id, PrizeAssignment.season_year.is_not(None))
+        .distinct()
+        .all()
+    )
+    for (season_year,) in seasons:
+        if payout_service.is_materialized(db, season_year):
+            payout_service.rebuild_season(db, season_year)
 
 
 @router.get("/tiers", response_model=list[schemas.PayoutTierRead])
 def list_tiers(
     season_year: int | None = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(PayoutTier)
     if season_year is not None:
@@ -43,10 +46,11 @@ def list_tiers(
 def create_tier(
     payload: schemas.PayoutTierCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     tier = PayoutTier(**payload.dict())
     db.add(tier)
+    payout_service.reprice_season(db, tier.season_year)
     db.commit()
     db.refresh(tier)
     return tier
@@ -57,13 +61,17 @@ def update_tier(
     tier_id: int,
     payload: schemas.PayoutTierCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     tier = db.query(PayoutTier).filter(PayoutTier.id == tier_id).first()
     if not tier:
         raise HTTPException(status_code=404, detail="Tier not found")
+    previous_season = tier.season_year
     for field, value in payload.dict().items():
         setattr(tier, field, value)
+    payout_service.reprice_season(db, previous_season)
+    if tier.season_year != previous_season:
+        payout_service.reprice_season(db, tier.season_year)
     db.commit()
     db.refresh(tier)
     return tier
@@ -73,12 +81,13 @@ def update_tier(
 def delete_tier(
     tier_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     tier = db.query(PayoutTier).filter(PayoutTier.id == tier_id).first()
     if not tier:
         raise HTTPException(status_code=404, detail="Tier not found")
     db.delete(tier)
+    payout_service.reprice_season(db, tier.season_year)
     db.commit()
     return None
 
@@ -87,7 +96,7 @@ def delete_tier(
 def list_rules(
     season_year: int | None = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(PayoutRule)
     if season_year is not None:
@@ -106,7 +115,7 @@ def list_rules(
 def create_rule(
     payload: schemas.PayoutRuleCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     rule = PayoutRule(
         name=payload.name,
@@ -116,6 +125,7 @@ def create_rule(
         active=payload.active,
     )
     db.add(rule)
+    payout_service.reprice_season(db, rule.season_year)
     db.commit()
     db.refresh(rule)
     if isinstance(rule.config, str):
@@ -128,7 +138,7 @@ def update_rule(
     rule_id: int,
     payload: schemas.PayoutRuleCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     rule = db.query(PayoutRule).filter(PayoutRule.id == rule_id).first()
     if not rule:
@@ -137,6 +147,7 @@ def update_rule(
     rule.type = payload.type
     rule.config = json.dumps(payload.config) if payload.config else None
     rule.active = payload.active
+    payout_service.reprice_season(db, rule.season_year)
     db.commit()
     db.refresh(rule)
     if isinstance(rule.config, str):
@@ -148,12 +159,13 @@ def update_rule(
 def delete_rule(
     rule_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     rule = db.query(PayoutRule).filter(PayoutRule.id == rule_id).first()
     if not rule:
         raise HTTPException(status_code=404, detail="Rule not found")
     db.delete(rule)
+    payout_service.reprice_season(db, rule.season_year)
     db.commit()
     return None
 
@@ -162,7 +174,7 @@ def delete_rule(
 def list_prizes(
     season_year: int | None = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(Prize)
     if season_year is not None:
@@ -174,7 +186,7 @@ def list_prizes(
 def create_prize(
     payload: schemas.PrizeCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     prize = Prize(**payload.dict())
     db.add(prize)
@@ -188,13 +200,15 @@ def update_prize(
     prize_id: int,
     payload: schemas.PrizeCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     prize = db.query(Prize).filter(Prize.id == prize_id).first()
     if not prize:
         raise HTTPException(status_code=404, detail="Prize not found")
     for field, value in payload.dict().items():
         setattr(prize, field, value)
+    db.flush()
+    rebuild_prize_seasons(db, prize.id)
     db.commit()
     db.refresh(prize)
     return prize
@@ -204,12 +218,14 @@ def update_prize(
 def delete_prize(
     prize_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     prize = db.query(Prize).filter(Prize.id == prize_id).first()
     if not prize:
         raise HTTPException(status_code=404, detail="Prize not found")
     db.delete(prize)
+    db.flush()
+    rebuild_prize_seasons(db, prize.id)
     db.commit()
     return None
 
@@ -218,13 +234,16 @@ def delete_prize(
 def assign_prize(
     payload: schemas.PrizeAssignmentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     prize = db.query(Prize).filter(Prize.id == payload.prize_id).first()
     if not prize:
         raise HTTPException(status_code=404, detail="Prize not found")
     assignment = PrizeAssignment(**payload.dict())
     db.add(assignment)
+    payout_service.apply_changes(
+        db, assignment.season_year, prizes={assignment.employee_name: prize.cost_cents or 0}
+    )
     db.commit()
     db.refresh(assignment)
     return assignment
@@ -234,7 +253,7 @@ def assign_prize(
 def list_prize_assignments(
     season_year: int | None = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(PrizeAssignment)
     if season_year is not None:
@@ -246,10 +265,11 @@ def list_prize_assignments(
 def create_adjustment(
     payload: schemas.PayoutAdjustmentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     adj = PayoutAdjustment(**payload.dict())
     db.add(adj)
+    payout_service.apply_changes(db, adj.season_year, misc={adj.employee_name: adj.amount_cents})
     db.commit()
     db.refresh(adj)
     return adj
@@ -259,7 +279,7 @@ def create_adjustment(
 def list_adjustments(
     season_year: int | None = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(PayoutAdjustment)
     if season_year is not None:
@@ -270,114 +290,16 @@ def list_adjustments(
 @router.get("/summary", response_model=schemas.PayoutSummaryResponse)
 def payout_summary(
     season_year: int | None = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    # aggregate sales from gift tracker entries
-    sales_map: dict[str, int] = defaultdict(int)
-    gt_query = db.query(GiftTrackerEntry)
-    if season_year is not None:
-        gt_query = gt_query.filter(GiftTrackerEntry.season_year == season_year)
-    for row in gt_query.all():
-        total_dollars = (
-            row.tuesday
-            + row.wednesday
-            + row.thursday
-            + row.friday
-            + row.saturday
-            + row.sunday
-            + row.monday
-        )
-        sales_map[row.employee_name] += total_dollars * 100  # convert to cents
-
-    # add cobrand sales
-    cobrand_query = db.query(CobrandDeal)
-    if season_year is not None:
-        cobrand_query = cobrand_query.filter(CobrandDeal.season_year == season_year)
-    for deal in cobrand_query.all():
-        if not deal.seller_name:
-            continue
-        sales_map[deal.seller_name] += deal.amount_cents
-
-    # tiers
-    tiers_query = db.query(PayoutTier).filter(PayoutTier.active.is_(True))
-    if season_year is not None:
-        tiers_query = tiers_query.filter(PayoutTier.season_year == season_year)
-    tiers = tiers_query.order_by(PayoutTier.min_amount_cents.asc()).all()
+    return payout_service.payout_summary(db, season_year)
 
-    # rules
-    rules_query = db.query(PayoutRule).filter(PayoutRule.active.is_(True))
-    if season_year is not None:
-        rules_query = rules_query.filter(PayoutRule.season_year == season_year)
-    rules = rules_query.all()
 
-    # prize assignments
-    pa_query = db.query(PrizeAssignment)
-    if season_year is not None:
-        pa_query = pa_query.filter(PrizeAssignment.season_year == season_year)
-    prize_assignments = pa_query.all()
-    prize_map: dict[str, list[Prize]] = defaultdict(list)
-    for pa in prize_assignments:
-        if pa.prize:
-            prize_map[pa.employee_name].append(pa.prize)
-
-    # adjustments
-    adj_query = db.query(PayoutAdjustment)
-    if season_year is not None:
-        adj_query = adj_query.filter(PayoutAdjustment.season_year == season_year)
-    adjustments = adj_query.all()
-    adj_map: dict[str, int] = defaultdict(int)
-    for adj in adjustments:
-        adj_map[adj.employee_name] += adj.amount_cents
-
-    # rule payouts
-    rule_payouts: dict[str, int] = defaultdict(int)
-    # season_top_seller rule
-    for rule in rules:
-        if rule.type == "season_top_seller":
-            config = json.loads(rule.config) if rule.config else {}
-            first_pct = Decimal(str(config.get("first_pct", 10)))
-            second_pct = Decimal(str(config.get("second_pct", 5)))
-            sorted_sales = sorted(sales_map.items(), key=lambda x: x[1], reverse=True)
-            if sorted_sales:
-                first_name, first_total = sorted_sales[0]
-                rule_payouts[first_name] += int(
-                    (Decimal(first_total) * first_pct / Decimal(100)).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-                )
-            if len(sorted_sales) > 1:
-                second_name, second_total = sorted_sales[1]
-                rule_payouts[second_name] += int(
-                    (Decimal(second_total) * second_pct / Decimal(100)).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-                )
-
-    rows: list[schemas.PayoutSummaryRow] = []
-    for name, sales_cents in sales_map.items():
-        # tier payout
-        tier_payout = 0
-        for tier in tiers:
-            within_min = sales_cents >= tier.min_amount_cents
-            within_max = tier.max_amount_cents is None or sales_cents <= tier.max_amount_cents
-            if within_min and within_max:
-                if tier.payout_type == PayoutType.FIXED:
-                    tier_payout = tier.payout_value
-                else:
-                    tier_payout = _to_cents(Decimal(sales_cents) * Decimal(tier.payout_value) / Decimal(10000))
-                break
-        prize_value = sum([p.cost_cents or 0 for p in prize_map.get(name, [])])
-        misc = adj_map.get(name, 0)
-        rule_bonus = rule_payouts.get(name, 0)
-        total = tier_payout + rule_bonus + misc + prize_value
-        rows.append(
-          schemas.PayoutSummaryRow(
-              employee_name=name,
-              sales_total_cents=sales_cents,
-              tier_payout_cents=tier_payout,
-              rule_payout_cents=rule_bonus,
-              misc_cents=misc,
-              prize_value_cents=prize_value,
-              total_payout_cents=total,
-              prizes=[schemas.PrizeRead.model_validate(p) for p in prize_map.get(name, [])],
-          )
-        )
-
-    return schemas.PayoutSummaryResponse(rows=rows)
+@router.post("/simulate", response_model=schemas.PayoutSimulationResponse)
+def simulate_payouts(
+    payload: schemas.PayoutSimulationRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
+):
+    return payout_service.simulate(db, payload)
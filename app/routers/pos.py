@@ -1,96 +1,100 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
-from app.database import get_db
-from app.models import MenuCategory, MenuItem, POSOrder, POSOrderItem, POSOrderStatus, POSPayment, RecipeItem, StockMovement, User
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
+from app.database import get_async_db, get_async_read_db
+from app.models import MenuCategory, MenuItem, POSOrder, POSOrderItem, POSOrderStatus, POSPayment, RecipeItem, StockMovement
 
 router = APIRouter(prefix="/pos", tags=["pos"])
 
 
 @router.get("/menu-categories", response_model=list[schemas.MenuCategoryRead])
-def list_menu_categories(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return db.query(MenuCategory).order_by(MenuCategory.name).all()
+async def list_menu_categories(
+    db: AsyncSession = Depends(get_async_db), current_user: CurrentUser = Depends(get_current_user)
+):
+    return (await db.scalars(select(MenuCategory).order_by(MenuCategory.name))).all()
 
 
 @router.post("/menu-categories", response_model=schemas.MenuCategoryRead, status_code=status.HTTP_201_CREATED)
-def create_menu_category(
+async def create_menu_category(
     payload: schemas.MenuCategoryCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     category = MenuCategory(**payload.dict())
     db.add(category)
-    db.commit()
-    db.refresh(category)
+    await db.commit()
+    await db.refresh(category)
     return category
 
 
 @router.get("/menu-items", response_model=list[schemas.MenuItemRead])
-def list_menu_items(
+async def list_menu_items(
     active: bool | None = Query(default=None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    query = db.query(MenuItem)
+    query = select(MenuItem)
     if active is not None:
         query = query.filter(MenuItem.active == active)
-    return query.order_by(MenuItem.name).all()
+    return (await db.scalars(query.order_by(MenuItem.name))).all()
 
 
 @router.post("/menu-items", response_model=schemas.MenuItemRead, status_code=status.HTTP_201_CREATED)
-def create_menu_item(
+async def create_menu_item(
     payload: schemas.MenuItemCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     item = MenuItem(**payload.dict())
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    await db.commit()
+    await db.refresh(item)
     return item
 
 
 @router.get("/orders", response_model=list[schemas.POSOrderRead])
-def list_orders(
+async def list_orders(
     status_filter: POSOrderStatus | None = Query(default=None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    query = db.query(POSOrder).options(selectinload(POSOrder.items))
+    query = select(POSOrder).options(selectinload(POSOrder.items))
     if status_filter:
         query = query.filter(POSOrder.status == status_filter)
-    return query.order_by(POSOrder.created_at.desc()).all()
+    return (await db.scalars(query.order_by(POSOrder.created_at.desc()))).all()
 
 
 @router.post("/orders", response_model=schemas.POSOrderRead, status_code=status.HTTP_201_CREATED)
-def create_order(
+async def create_order(
     payload: schemas.POSOrderCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     order = POSOrder(**payload.dict())
     db.add(order)
-    db.commit()
-    db.refresh(order)
+    await db.commit()
+    await db.refresh(order, attribute_names=["items"])
     return order
 
 
 @router.post("/orders/{order_id}/items", response_model=schemas.POSOrderItemRead, status_code=status.HTTP_201_CREATED)
-def add_order_item(
+async def add_order_item(
     order_id: int,
     payload: schemas.POSOrderItemCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    order = db.query(POSOrder).filter(POSOrder.id == order_id).first()
+    order = await db.get(POSOrder, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     if order.status != POSOrderStatus.OPEN:
         raise HTTPException(status_code=400, detail="Order is not open")
 
-    menu_item = db.query(MenuItem).filter(MenuItem.id == payload.menu_item_id).first()
+    menu_item = await db.get(MenuItem, payload.menu_item_id)
     if not menu_item:
         raise HTTPException(status_code=404, detail="Menu item not found")
 
@@ -102,24 +106,19 @@ def add_order_item(
         price_cents=price_cents,
     )
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    await db.commit()
+    await db.refresh(item)
     return item
 
 
 @router.post("/orders/{order_id}/close", response_model=schemas.POSOrderRead)
-def close_order(
+async def close_order(
     order_id: int,
     payload: schemas.POSCloseRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
-    order = (
-        db.query(POSOrder)
-        .options(selectinload(POSOrder.items))
-        .filter(POSOrder.id == order_id)
-        .first()
-    )
+    order = await db.scalar(select(POSOrder).options(selectinload(POSOrder.items)).filter(POSOrder.id == order_id))
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     if order.status != POSOrderStatus.OPEN:
@@ -128,9 +127,12 @@ def close_order(
     payment = POSPayment(order_id=order.id, amount_cents=payload.payment.amount_cents, method=payload.payment.method)
     db.add(payment)
 
+    menu_item_ids = {item.menu_item_id for item in order.items}
+    recipes_by_item: dict[int, list[RecipeItem]] = {}
+    for recipe in await db.scalars(select(RecipeItem).filter(RecipeItem.menu_item_id.in_(menu_item_ids))):
+        recipes_by_item.setdefault(recipe.menu_item_id, []).append(recipe)
     for item in order.items:
-        recipes = db.query(RecipeItem).filter(RecipeItem.menu_item_id == item.menu_item_id).all()
-        for recipe in recipes:
+        for recipe in recipes_by_item.get(item.menu_item_id, []):
             movement = StockMovement(
                 ingredient_id=recipe.ingredient_id,
                 quantity_change=-recipe.quantity * item.quantity,
@@ -140,6 +142,6 @@ def close_order(
             db.add(movement)
 
     order.status = POSOrderStatus.CLOSED
-    db.commit()
-    db.refresh(order)
+    await db.commit()
+    await db.refresh(order, attribute_names=["status", "updated_at", "items"])
     return order
@@ -1,13 +1,14 @@
 from datetime import datetime, date
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
-from app.database import get_db
-from app.models import Employee, PyosCredit, PyosRequest, PyosAudit, PyosStatus, PyosShift, Section, User, UserRole
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
+from app.database import get_async_db
+from app.models import Employee, PyosCredit, PyosRequest, PyosAudit, PyosStatus, PyosShift, Section, UserRole
 
 router = APIRouter(prefix="/pyos", tags=["pyos"])
 
@@ -16,41 +17,41 @@ def normalize_name(value: str) -> str:
     return " ".join(value.strip().lower().split())
 
 
-def find_employee_for_user(db: Session, user: User) -> Employee | None:
+async def find_employee_for_user(db: AsyncSession, user: CurrentUser) -> Employee | None:
     if user.employee_id:
-        return db.query(Employee).filter(Employee.id == user.employee_id).first()
+        return await db.get(Employee, user.employee_id)
     full_name = normalize_name(user.full_name or "")
     if not full_name:
         return None
     parts = full_name.split(" ", 1)
-    query = db.query(Employee)
     if len(parts) == 2:
         first, last = parts
-        query = query.filter(
-            func.lower(Employee.first_name) == first,
-            func.lower(Employee.last_name) == last,
+        match = await db.scalar(
+            select(Employee)
+            .filter(
+                func.lower(Employee.first_name) == first,
+                func.lower(Employee.last_name) == last,
+            )
+            .limit(1)
         )
-        match = query.first()
         if match:
             return match
-    return (
-        db.query(Employee)
-        .filter(func.lower(Employee.nickname) == full_name)
-        .first()
-    )
+    return await db.scalar(select(Employee).filter(func.lower(Employee.nickname) == full_name).limit(1))
 
 
-def get_or_create_credit(db: Session, employee_id: int) -> PyosCredit:
-    credit = db.query(PyosCredit).filter(PyosCredit.employee_id == employee_id).first()
+async def get_or_create_credit(db: AsyncSession, employee_id: int) -> PyosCredit:
+    credit = await db.scalar(select(PyosCredit).filter(PyosCredit.employee_id == employee_id).limit(1))
     if not credit:
         credit = PyosCredit(employee_id=employee_id, balance=0)
         db.add(credit)
-        db.commit()
-        db.refresh(credit)
+        await db.commit()
+        await db.refresh(credit)
     return credit
 
 
-def log_audit(db: Session, actor_id: int, employee_id: int | None, action: str, delta: int | None, details: dict):
+async def log_audit(
+    db: AsyncSession, actor_id: int, employee_id: int | None, action: str, delta: int | None, details: dict
+):
     audit = PyosAudit(
         actor_user_id=actor_id,
         employee_id=employee_id,
@@ -59,7 +60,7 @@ def log_audit(db: Session, actor_id: int, employee_id: int | None, action: str,
         details_json=details or None,
     )
     db.add(audit)
-    db.commit()
+    await db.commit()
 
 
 def serialize_request(item: PyosRequest, employee_name: str | None, section_label: str | None) -> dict:
@@ -85,59 +86,59 @@ def serialize_request(item: PyosRequest, employee_name: str | None, section_labe
     }
 
 
-def assert_section_available(db: Session, section_id: int, roster_date: date, shift: PyosShift):
-    existing = (
-        db.query(PyosRequest)
+async def assert_section_available(db: AsyncSession, section_id: int, roster_date: date, shift: PyosShift):
+    existing = await db.scalar(
+        select(PyosRequest.id)
         .filter(
             PyosRequest.section_id == section_id,
             PyosRequest.date == roster_date,
             PyosRequest.shift == shift,
             PyosRequest.status.in_([PyosStatus.PENDING, PyosStatus.APPROVED]),
         )
-        .first()
+        .limit(1)
     )
     if existing:
         raise HTTPException(status_code=400, detail="Section already assigned for this shift.")
 
 
 @router.get("/credits/me", response_model=schemas.PyosCreditRead)
-def get_my_credit(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def get_my_credit(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    employee = find_employee_for_user(db, current_user)
+    employee = await find_employee_for_user(db, current_user)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee profile not found for this user.")
-    credit = get_or_create_credit(db, employee.id)
+    credit = await get_or_create_credit(db, employee.id)
     return credit
 
 
 @router.get("/credits", response_model=list[schemas.PyosCreditRead])
-def list_credits(
+async def list_credits(
     employee_id: int | None = Query(default=None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
-    query = db.query(PyosCredit)
+    query = select(PyosCredit)
     if employee_id:
         query = query.filter(PyosCredit.employee_id == employee_id)
-    return query.order_by(PyosCredit.employee_id.asc()).all()
+    return (await db.scalars(query.order_by(PyosCredit.employee_id.asc()))).all()
 
 
 @router.post("/credits/grant", response_model=schemas.PyosCreditRead)
-def grant_credit(
+async def grant_credit(
     payload: schemas.PyosCreditGrant,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
-    employee = db.query(Employee).filter(Employee.id == payload.employee_id).first()
+    employee = await db.get(Employee, payload.employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
-    credit = get_or_create_credit(db, employee.id)
+    credit = await get_or_create_credit(db, employee.id)
     credit.balance += payload.delta
-    db.commit()
-    db.refresh(credit)
-    log_audit(
+    await db.commit()
+    await db.refresh(credit)
+    await log_audit(
         db,
         current_user.id,
         employee.id,
@@ -149,16 +150,16 @@ def grant_credit(
 
 
 @router.get("/requests", response_model=list[schemas.PyosRequestRead])
-def list_requests(
+async def list_requests(
     roster_date: date | None = Query(default=None, alias="date"),
     shift: PyosShift | None = Query(default=None),
     status_filter: PyosStatus | None = Query(default=None, alias="status"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    query = db.query(PyosRequest)
+    query = select(PyosRequest).options(selectinload(PyosRequest.employee), selectinload(PyosRequest.section))
     if current_user.role == UserRole.SERVER:
-        employee = find_employee_for_user(db, current_user)
+        employee = await find_employee_for_user(db, current_user)
         if not employee:
             raise HTTPException(status_code=404, detail="Employee profile not found for this user.")
         query = query.filter(PyosRequest.employee_id == employee.id)
@@ -168,7 +169,7 @@ def list_requests(
         query = query.filter(PyosRequest.shift == shift)
     if status_filter:
         query = query.filter(PyosRequest.status == status_filter)
-    results = query.order_by(PyosRequest.date.desc(), PyosRequest.created_at.desc()).all()
+    results = (await db.scalars(query.order_by(PyosRequest.date.desc(), PyosRequest.created_at.desc()))).all()
     payloads = []
     for item in results:
         employee_name = None
@@ -179,41 +180,39 @@ def list_requests(
 
 
 @router.get("/occupied", response_model=list[int])
-def list_occupied_sections(
+async def list_occupied_sections(
     roster_date: date = Query(alias="date"),
     shift: PyosShift = Query(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    rows = (
-        db.query(PyosRequest.section_id)
-        .filter(
+    rows = await db.scalars(
+        select(PyosRequest.section_id).filter(
             PyosRequest.date == roster_date,
             PyosRequest.shift == shift,
             PyosRequest.status.in_([PyosStatus.PENDING, PyosStatus.APPROVED]),
         )
-        .all()
     )
-    return [row[0] for row in rows]
+    return rows.all()
 
 
 @router.post("/requests", response_model=schemas.PyosRequestRead, status_code=status.HTTP_201_CREATED)
-def create_request(
+async def create_request(
     payload: schemas.PyosRequestCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     if current_user.role != UserRole.SERVER:
         raise HTTPException(status_code=403, detail="Only servers can submit PYOS requests.")
-    employee = find_employee_for_user(db, current_user)
+    employee = await find_employee_for_user(db, current_user)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee profile not found for this user.")
     if payload.date < date.today():
         raise HTTPException(status_code=400, detail="Cannot request past dates.")
-    credit = get_or_create_credit(db, employee.id)
+    credit = await get_or_create_credit(db, employee.id)
     if credit.balance < 1:
         raise HTTPException(status_code=400, detail="No PYOS credits available.")
-    assert_section_available(db, payload.section_id, payload.date, payload.shift)
+    await assert_section_available(db, payload.section_id, payload.date, payload.shift)
     credit.balance -= 1
     request = PyosRequest(
         employee_id=employee.id,
@@ -225,9 +224,9 @@ def create_request(
         created_by_user_id=current_user.id,
     )
     db.add(request)
-    db.commit()
-    db.refresh(request)
-    log_audit(
+    await db.commit()
+    await db.refresh(request)
+    await log_audit(
         db,
         current_user.id,
         employee.id,
@@ -235,25 +234,24 @@ def create_request(
         -1,
         {"request_id": request.id, "date": str(payload.date), "shift": payload.shift.value},
     )
-    request.employee = employee
-    request.section = db.query(Section).filter(Section.id == payload.section_id).first()
+    section = await db.get(Section, payload.section_id)
     return serialize_request(
         request,
         f"{employee.first_name} {employee.last_name}".strip(),
-        request.section.label if request.section else None,
+        section.label if section else None,
     )
 
 
 @router.post("/requests/manual", response_model=schemas.PyosRequestRead, status_code=status.HTTP_201_CREATED)
-def create_manual_request(
+async def create_manual_request(
     payload: schemas.PyosRequestManualCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
-    employee = db.query(Employee).filter(Employee.id == payload.employee_id).first()
+    employee = await db.get(Employee, payload.employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
-    assert_section_available(db, payload.section_id, payload.date, payload.shift)
+    await assert_section_available(db, payload.section_id, payload.date, payload.shift)
     request = PyosRequest(
         employee_id=payload.employee_id,
         section_id=payload.section_id,
@@ -266,9 +264,9 @@ def create_manual_request(
         approved_at=datetime.utcnow(),
     )
     db.add(request)
-    db.commit()
-    db.refresh(request)
-    log_audit(
+    await db.commit()
+    await db.refresh(request)
+    await log_audit(
         db,
         current_user.id,
         employee.id,
@@ -276,23 +274,22 @@ def create_manual_request(
         None,
         {"request_id": request.id, "date": str(payload.date), "shift": payload.shift.value},
     )
-    request.employee = employee
-    request.section = db.query(Section).filter(Section.id == payload.section_id).first()
+    section = await db.get(Section, payload.section_id)
     return serialize_request(
         request,
         f"{employee.first_name} {employee.last_name}".strip(),
-        request.section.label if request.section else None,
+        section.label if section else None,
     )
 
 
 @router.post("/requests/{request_id}/approve", response_model=schemas.PyosRequestRead)
-def approve_request(
+async def approve_request(
     request_id: int,
     payload: schemas.PyosRequestAction,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
-    request = db.query(PyosRequest).filter(PyosRequest.id == request_id).first()
+    request = await db.get(PyosRequest, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     if request.status != PyosStatus.PENDING:
@@ -302,9 +299,9 @@ def approve_request(
     request.approved_at = datetime.utcnow()
     if payload.notes:
         request.notes = payload.notes
-    db.commit()
-    db.refresh(request)
-    log_audit(
+    await db.commit()
+    await db.refresh(request)
+    await log_audit(
         db,
         current_user.id,
         request.employee_id,
@@ -312,26 +309,26 @@ def approve_request(
         None,
         {"request_id": request.id},
     )
-    request.employee = db.query(Employee).filter(Employee.id == request.employee_id).first()
-    request.section = db.query(Section).filter(Section.id == request.section_id).first()
+    employee = await db.get(Employee, request.employee_id)
+    section = await db.get(Section, request.section_id)
     employee_name = None
-    if request.employee:
-        employee_name = f"{request.employee.first_name} {request.employee.last_name}".strip()
+    if employee:
+        employee_name = f"{employee.first_name} {employee.last_name}".strip()
     return serialize_request(
         request,
         employee_name,
-        request.section.label if request.section else None,
+        section.label if section else None,
     )
 
 
 @router.post("/requests/{request_id}/deny", response_model=schemas.PyosRequestRead)
-def deny_request(
+async def deny_request(
     request_id: int,
     payload: schemas.PyosRequestAction,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
-    request = db.query(PyosRequest).filter(PyosRequest.id == request_id).first()
+    request = await db.get(PyosRequest, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     if request.status != PyosStatus.PENDING:
@@ -341,11 +338,11 @@ def deny_request(
     request.denied_at = datetime.utcnow()
     if payload.notes:
         request.notes = payload.notes
-    credit = get_or_create_credit(db, request.employee_id)
+    credit = await get_or_create_credit(db, request.employee_id)
     credit.balance += 1
-    db.commit()
-    db.refresh(request)
-    log_audit(
+    await db.commit()
+    await db.refresh(request)
+    await log_audit(
         db,
         current_user.id,
         request.employee_id,
@@ -353,26 +350,26 @@ def deny_request(
         1,
         {"request_id": request.id, "reason": payload.notes or ""},
     )
-    request.employee = db.query(Employee).filter(Employee.id == request.employee_id).first()
-    request.section = db.query(Section).filter(Section.id == request.section_id).first()
+    employee = await db.get(Employee, request.employee_id)
+    section = await db.get(Section, request.section_id)
     employee_name = None
-    if request.employee:
-        employee_name = f"{request.employee.first_name} {request.employee.last_name}".strip()
+    if employee:
+        employee_name = f"{employee.first_name} {employee.last_name}".strip()
     return serialize_request(
         request,
         employee_name,
-        request.section.label if request.section else None,
+        section.label if section else None,
     )
 
 
 @router.post("/requests/{request_id}/revoke", response_model=schemas.PyosRequestRead)
-def revoke_request(
+async def revoke_request(
     request_id: int,
     payload: schemas.PyosRequestAction,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
-    request = db.query(PyosRequest).filter(PyosRequest.id == request_id).first()
+    request = await db.get(PyosRequest, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     if request.status != PyosStatus.APPROVED:
@@ -382,11 +379,11 @@ def revoke_request(
     request.revoked_at = datetime.utcnow()
     if payload.notes:
         request.notes = payload.notes
-    credit = get_or_create_credit(db, request.employee_id)
+    credit = await get_or_create_credit(db, request.employee_id)
     credit.balance += 1
-    db.commit()
-    db.refresh(request)
-    log_audit(
+    await db.commit()
+    await db.refresh(request)
+    await log_audit(
         db,
         current_user.id,
         request.employee_id,
@@ -394,25 +391,25 @@ def revoke_request(
         1,
         {"request_id": request.id, "reason": payload.notes or ""},
     )
-    request.employee = db.query(Employee).filter(Employee.id == request.employee_id).first()
-    request.section = db.query(Section).filter(Section.id == request.section_id).first()
+    employee = await db.get(Employee, request.employee_id)
+    section = await db.get(Section, request.section_id)
     employee_name = None
-    if request.employee:
-        employee_name = f"{request.employee.first_name} {request.employee.last_name}".strip()
+    if employee:
+        employee_name = f"{employee.first_name} {employee.last_name}".strip()
     return serialize_request(
         request,
         employee_name,
-        request.section.label if request.section else None,
+        section.label if section else None,
     )
 
 
 @router.get("/audit", response_model=list[schemas.PyosAuditRead])
-def list_audit(
+async def list_audit(
     employee_id: int | None = Query(default=None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
-    query = db.query(PyosAudit)
+    query = select(PyosAudit)
     if employee_id:
         query = query.filter(PyosAudit.employee_id == employee_id)
-    return query.order_by(PyosAudit.created_at.desc()).limit(200).all()
+    return (await db.scalars(query.order_by(PyosAudit.created_at.desc()).limit(200))).all()
@@ -2,15 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
 from app.database import get_db
-from app.models import Season, User
+from app.models import Season
 
 router = APIRouter(prefix="/seasons", tags=["seasons"])
 
 
 @router.get("", response_model=list[schemas.SeasonRead])
-def list_seasons(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_seasons(db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     return db.query(Season).order_by(Season.year.asc()).all()
 
 
@@ -18,7 +18,7 @@ def list_seasons(db: Session = Depends(get_db), current_user: User = Depends(get
 def create_season(
     payload: schemas.SeasonCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     existing = db.query(Season).filter(Season.year == payload.year).first()
     if existing:
@@ -37,7 +37,7 @@ def create_season(
 def delete_season(
     season_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     season = db.query(Season).filter(Season.id == season_id).first()
     if not season:
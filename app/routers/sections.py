@@ -2,15 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
 from app.database import get_db
-from app.models import Section, User
+from app.models import Section
 
 router = APIRouter(prefix="/sections", tags=["sections"])
 
 
 @router.get("", response_model=list[schemas.SectionRead])
-def list_sections(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_sections(db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     return db.query(Section).order_by(Section.name).all()
 
 
@@ -18,7 +18,7 @@ def list_sections(db: Session = Depends(get_db), current_user: User = Depends(ge
 def create_section(
     payload: schemas.SectionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     section = Section(**payload.dict())
     db.add(section)
@@ -32,7 +32,7 @@ def update_section(
     section_id: int,
     payload: schemas.SectionUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     section = db.query(Section).filter(Section.id == section_id).first()
     if not section:
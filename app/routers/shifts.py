@@ -4,9 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
 from app.database import get_db
-from app.models import Shift, ShiftPeriod, User
+from app.models import Shift, ShiftPeriod
 
 router = APIRouter(prefix="/shifts", tags=["shifts"])
 
@@ -17,7 +17,7 @@ def list_shifts(
     end_date: date | None = Query(default=None),
     time_period: ShiftPeriod | None = Query(default=None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(Shift)
     if start_date:
@@ -34,7 +34,7 @@ def list_shifts(
 def create_shift(
     payload: schemas.ShiftCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     shift = Shift(**payload.dict(), created_by_user_id=current_user.id)
     db.add(shift)
@@ -44,7 +44,7 @@ def create_shift(
 
 
 @router.get("/{shift_id}", response_model=schemas.ShiftRead)
-def get_shift(shift_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_shift(shift_id: int, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     shift = db.query(Shift).filter(Shift.id == shift_id).first()
     if not shift:
         raise HTTPException(status_code=404, detail="Shift not found")
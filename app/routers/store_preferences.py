@@ -2,9 +2,9 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
 from app.database import get_db
-from app.models import StorePreference, User
+from app.models import StorePreference
 
 router = APIRouter(prefix="/store-preferences", tags=["store-preferences"])
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/store-preferences", tags=["store-preferences"])
 def list_store_preferences(
     store_number: str | None = Query(default=None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(StorePreference)
     if store_number:
@@ -25,7 +25,7 @@ def list_store_preferences(
 def upsert_store_preferences(
     payload: schemas.StorePreferenceCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     existing = (
         db.query(StorePreference)
@@ -1,47 +1,64 @@
-import csv
-import io
+import itertools
 from datetime import date
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from fastapi.responses import HTMLResponse, StreamingResponse
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
-from app.database import get_db
-from app.models import (
-    Shift,
-    Section,
-    TeamSheet,
-    TeamSheetAssignment,
-    TeamSheetStatus,
-    User,
-    SideworkTask,
-    OutworkTask,
-    StorePreference,
-)
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
+from app.database import get_async_db, get_async_read_db, get_read_db
+from app.models import Shift, TeamSheet, TeamSheetStatus
+from app.services import team_sheet_print as print_service
 from app.services import team_sheets as team_sheet_service
 
 router = APIRouter(prefix="/team-sheets", tags=["team_sheets"])
 
 
-@router.get("", response_model=list[schemas.TeamSheetRead])
-def list_team_sheets(
+def _load_serialized(db: Session, team_sheet_id: int) -> schemas.TeamSheetRead | None:
+    team_sheet = team_sheet_service.fetch_team_sheet(db, team_sheet_id)
+    return team_sheet_service.serialize_team_sheet(team_sheet) if team_sheet else None
+
+
+@router.get("", response_model=list[schemas.TeamSheetSummaryRead] | list[schemas.TeamSheetRead])
+async def list_team_sheets(
+    response: Response,
     start_date: date | None = Query(default=None),
     end_date: date | None = Query(default=None),
     status: TeamSheetStatus | None = Query(default=None),
     time_period: str | None = Query(default=None),
     manager_id: int | None = Query(default=None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    fields: Literal["summary", "full"] = Query(default="full"),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None, description="Value of X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    query = db.query(TeamSheet).join(Shift)
-    query = query.options(
-        selectinload(TeamSheet.assignments).selectinload(TeamSheetAssignment.employee),
-        selectinload(TeamSheet.assignments).selectinload(TeamSheetAssignment.section),
-        selectinload(TeamSheet.sidework_tasks).selectinload(SideworkTask.assignments),
-        selectinload(TeamSheet.outwork_tasks).selectinload(OutworkTask.assignments),
+    return await db.run_sync(
+        _list_team_sheets, response, start_date, end_date, status, time_period, manager_id, fields, limit, cursor
     )
+
+
+def _list_team_sheets(
+    db: Session,
+    response: Response,
+    start_date: date | None,
+    end_date: date | None,
+    status: TeamSheetStatus | None,
+    time_period: str | None,
+    manager_id: int | None,
+    fields: str,
+    limit: int,
+    cursor: str | None,
+):
+    if fields == "summary":
+        query = team_sheet_service.summary_query(db).join(Shift, TeamSheet.shift_id == Shift.id)
+    else:
+        query = db.query(TeamSheet).join(Shift)
+        query = query.options(contains_eager(TeamSheet.shift), *team_sheet_service.sheet_graph_options())
     if start_date:
         query = query.filter(Shift.date >= start_date)
     if end_date:
@@ -52,18 +69,57 @@ def list_team_sheets(
         query = query.filter(TeamSheet.created_by_user_id == manager_id)
     if time_period:
         query = query.filter(Shift.time_period == time_period)
-    query = query.order_by(Shift.date.desc())
-    results = query.all()
+    if cursor:
+        try:
+            cursor_date, cursor_id = team_sheet_service.decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(
+            or_(
+                Shift.date < cursor_date,
+                and_(Shift.date == cursor_date, TeamSheet.id < cursor_id),
+            )
+        )
+    query = query.order_by(Shift.date.desc(), TeamSheet.id.desc())
+    # Fetch one extra row to know whether another page exists without a COUNT query.
+    results = query.limit(limit + 1).all()
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        last_date = last.shift_date if fields == "summary" else last.shift.date
+        response.headers["X-Next-Cursor"] = team_sheet_service.encode_cursor(last_date, last.id)
+    if fields == "summary":
+        return [team_sheet_service.serialize_team_sheet_summary(row) for row in results]
     return [team_sheet_service.serialize_team_sheet(item) for item in results]
 
 
+@router.get("/print", response_class=HTMLResponse)
+async def print_team_sheets_for_day(
+    shift_date: date = Query(..., alias="date"),
+    store_id: int | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    def render(session: Session) -> str | None:
+        team_sheets = team_sheet_service.fetch_team_sheets_for_day(session, shift_date, store_id)
+        if not team_sheets:
+            return None
+        title = f"Team Sheets {shift_date.isoformat()}" + (f" Store {store_id}" if store_id is not None else "")
+        return print_service.render_day(session, team_sheets, title)
+
+    html = await db.run_sync(render)
+    if html is None:
+        raise HTTPException(status_code=404, detail="No team sheets for that date")
+    return HTMLResponse(content=html)
+
+
 @router.post("", response_model=schemas.TeamSheetRead, status_code=status.HTTP_201_CREATED)
-def create_team_sheet(
+async def create_team_sheet(
     payload: schemas.TeamSheetCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
-    shift = db.query(Shift).filter(Shift.id == payload.shift_id).first()
+    shift = await db.get(Shift, payload.shift_id)
     if not shift:
         raise HTTPException(status_code=404, detail="Shift not found")
 
@@ -75,222 +131,202 @@ def create_team_sheet(
         created_by_user_id=current_user.id,
     )
 
-    if payload.source_team_sheet_id:
-        source = team_sheet_service.fetch_team_sheet(db, payload.source_team_sheet_id)
-        if not source:
-            raise HTTPException(status_code=404, detail="Source team sheet not found")
-        team_sheet_service.clone_team_sheet(source, team_sheet, db)
-    else:
-        team_sheet_service.apply_team_sheet_payload(team_sheet, payload)
-        db.add(team_sheet)
+    def write(session: Session) -> schemas.TeamSheetRead:
+        if payload.source_team_sheet_id:
+            source = team_sheet_service.fetch_team_sheet(session, payload.source_team_sheet_id)
+            if not source:
+                raise HTTPException(status_code=404, detail="Source team sheet not found")
+            team_sheet_service.clone_team_sheet(source, team_sheet, session)
+        else:
+            team_sheet_service.apply_team_sheet_payload(team_sheet, payload)
+            session.add(team_sheet)
+        return team_sheet_service.serialize_written_team_sheet(session, team_sheet)
+
+    result = await db.run_sync(write)
+    await db.commit()
+    return result
 
-    db.commit()
-    db.refresh(team_sheet)
-    loaded = team_sheet_service.fetch_team_sheet(db, team_sheet.id)
-    return team_sheet_service.serialize_team_sheet(loaded)
+
+@router.post("/clone-range", response_model=schemas.TeamSheetCloneRangeResult, status_code=status.HTTP_201_CREATED)
+async def clone_team_sheet_range(
+    payload: schemas.TeamSheetCloneRange,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
+):
+    if payload.source_end_date < payload.source_start_date:
+        raise HTTPException(status_code=400, detail="source_end_date must be on or after source_start_date")
+    span = payload.source_end_date - payload.source_start_date
+    if span.days > 31:
+        raise HTTPException(status_code=400, detail="Clone at most 31 days at a time")
+    target_end_date = payload.target_start_date + span
+    if payload.target_start_date <= payload.source_end_date and payload.source_start_date <= target_end_date:
+        raise HTTPException(status_code=400, detail="Source and target ranges must not overlap")
+    result = await db.run_sync(team_sheet_service.clone_range, payload, current_user.id)
+    await db.commit()
+    return result
 
 
 @router.get("/{team_sheet_id}", response_model=schemas.TeamSheetRead)
-def get_team_sheet(team_sheet_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    team_sheet = team_sheet_service.fetch_team_sheet(db, team_sheet_id)
-    if not team_sheet:
+async def get_team_sheet(
+    team_sheet_id: int, db: AsyncSession = Depends(get_async_db), current_user: CurrentUser = Depends(get_current_user)
+):
+    result = await db.run_sync(_load_serialized, team_sheet_id)
+    if not result:
         raise HTTPException(status_code=404, detail="Team sheet not found")
-    return team_sheet_service.serialize_team_sheet(team_sheet)
+    return result
 
 
 @router.put("/{team_sheet_id}", response_model=schemas.TeamSheetRead)
-def update_team_sheet(
+async def update_team_sheet(
     team_sheet_id: int,
     payload: schemas.TeamSheetUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
-    team_sheet = team_sheet_service.fetch_team_sheet(db, team_sheet_id)
-    if not team_sheet:
-        raise HTTPException(status_code=404, detail="Team sheet not found")
-    if payload.title is not None:
-        team_sheet.title = payload.title
-    if payload.status is not None:
-        team_sheet.status = payload.status
-    if payload.notes is not None:
-        team_sheet.notes = payload.notes
+    def write(session: Session) -> schemas.TeamSheetRead:
+        team_sheet = team_sheet_service.fetch_team_sheet(session, team_sheet_id)
+        if not team_sheet:
+            raise HTTPException(status_code=404, detail="Team sheet not found")
+        if payload.title is not None:
+            team_sheet.title = payload.title
+        if payload.status is not None:
+            team_sheet.status = payload.status
+        if payload.notes is not None:
+            team_sheet.notes = payload.notes
+
+        team_sheet_service.apply_team_sheet_payload(team_sheet, payload)
+        return team_sheet_service.serialize_written_team_sheet(session, team_sheet)
+
+    result = await db.run_sync(write)
+    await db.commit()
+    return result
+
+
+@router.patch("/{team_sheet_id}", response_model=schemas.TeamSheetRead)
+async def patch_team_sheet(
+    team_sheet_id: int,
+    payload: schemas.TeamSheetPatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
+):
+    if await db.run_sync(team_sheet_service.claim_revision, team_sheet_id, payload.updated_at) is None:
+        if await db.scalar(select(TeamSheet.id).filter(TeamSheet.id == team_sheet_id)) is None:
+            raise HTTPException(status_code=404, detail="Team sheet not found")
+        raise HTTPException(status_code=409, detail="Team sheet was modified by someone else; reload and retry")
+    try:
+        await db.run_sync(team_sheet_service.apply_patch_ops, team_sheet_id, payload.ops)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    result = await db.run_sync(_load_serialized, team_sheet_id)
+    await db.commit()
+    return result
 
-    team_sheet_service.apply_team_sheet_payload(team_sheet, payload)
-    db.commit()
-    db.refresh(team_sheet)
-    refreshed = team_sheet_service.fetch_team_sheet(db, team_sheet.id)
-    return team_sheet_service.serialize_team_sheet(refreshed)
+
+@router.post("/{team_sheet_id}/auto-assign", response_model=schemas.AutoAssignResult)
+async def auto_assign_team_sheet(
+    team_sheet_id: int,
+    payload: schemas.AutoAssignRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
+):
+    def assign(session: Session):
+        team_sheet = team_sheet_service.fetch_team_sheet(session, team_sheet_id)
+        if not team_sheet:
+            raise HTTPException(status_code=404, detail="Team sheet not found")
+        return team_sheet_service.auto_assign(session, team_sheet, payload)
+
+    seed, scores, unmatched_names = await db.run_sync(assign)
+    await db.commit()
+    db.expunge_all()
+    return schemas.AutoAssignResult(
+        seed=seed,
+        team_sheet=await db.run_sync(_load_serialized, team_sheet_id),
+        scores=scores,
+        unmatched_names=unmatched_names,
+    )
 
 
 @router.get("/{team_sheet_id}/export/json", response_model=schemas.TeamSheetRead)
-def export_team_sheet_json(
+async def export_team_sheet_json(
     team_sheet_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    team_sheet = team_sheet_service.fetch_team_sheet(db, team_sheet_id)
-    if not team_sheet:
+    result = await db.run_sync(_load_serialized, team_sheet_id)
+    if not result:
         raise HTTPException(status_code=404, detail="Team sheet not found")
-    return team_sheet_service.serialize_team_sheet(team_sheet)
+    return result
+
+
+@router.get("/export/csv")
+def export_team_sheets_range_csv(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+
+    # Stays on the sync session: the generator runs in the threadpool one batch at a time.
+    def generate():
+        try:
+            yield from team_sheet_service.iter_csv(team_sheet_service.iter_range_csv_rows(db, start_date, end_date))
+        finally:
+            db.close()
+
+    filename = f"team_sheets_{start_date.isoformat()}_{end_date.isoformat()}.csv"
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
 
 @router.get("/{team_sheet_id}/export/csv")
-def export_team_sheet_csv(
+async def export_team_sheet_csv(
     team_sheet_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    team_sheet = team_sheet_service.fetch_team_sheet(db, team_sheet_id)
+    # Everything csv_rows touches is eager-loaded, so the generator never needs the session.
+    team_sheet = await db.run_sync(team_sheet_service.fetch_team_sheet, team_sheet_id)
     if not team_sheet:
         raise HTTPException(status_code=404, detail="Team sheet not found")
 
-    csv_buffer = io.StringIO()
-    writer = csv.writer(csv_buffer)
-    writer.writerow(["Section", "Employee", "Role", "Sidework", "Outwork", "Notes"])
-    for assignment in team_sheet.assignments:
-        employee_name = (
-            f"{assignment.employee.first_name} {assignment.employee.last_name}" if assignment.employee else "Unassigned"
-        )
-        section_label = assignment.section.label if assignment.section else "Unassigned"
-        sidework_labels = [
-            task.label
-            for task in team_sheet.sidework_tasks
-            if any(a.employee_id == assignment.employee_id for a in task.assignments)
-        ]
-        outwork_labels = [
-            task.label
-            for task in team_sheet.outwork_tasks
-            if any(a.employee_id == assignment.employee_id for a in task.assignments)
-        ]
-        writer.writerow(
-            [
-                section_label,
-                employee_name,
-                assignment.role_label or "",
-                "; ".join(sidework_labels),
-                "; ".join(outwork_labels),
-                team_sheet.notes or "",
-            ]
-        )
-
-    csv_buffer.seek(0)
+    header = [["Section", "Employee", "Role", "Sidework", "Outwork", "Notes"]]
+    rows = itertools.chain(header, team_sheet_service.csv_rows(team_sheet))
     filename = f"team_sheet_{team_sheet_id}.csv"
     return StreamingResponse(
-        csv_buffer,
+        team_sheet_service.iter_csv(rows),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
 @router.get("/{team_sheet_id}/print", response_class=HTMLResponse)
-def print_team_sheet(
+async def print_team_sheet(
     team_sheet_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    team_sheet = team_sheet_service.fetch_team_sheet(db, team_sheet_id)
-    if not team_sheet:
+    state = (await db.execute(print_service.etag_query(team_sheet_id))).all()
+    if not state:
         raise HTTPException(status_code=404, detail="Team sheet not found")
-    data = team_sheet_service.serialize_team_sheet(team_sheet)
-    shift = db.query(Shift).filter(Shift.id == team_sheet.shift_id).first()
-    in_time = ""
-    if shift and shift.store_id:
-        store_pref = (
-            db.query(StorePreference)
-            .filter(StorePreference.store_number == str(shift.store_id))
-            .first()
-        )
-        if store_pref and store_pref.daily_schedule:
-            day_name = shift.date.strftime("%A")
-            entry = next(
-                (item for item in store_pref.daily_schedule if (item.get("day") or "").lower() == day_name.lower()),
-                None,
-            )
-            if entry:
-                if shift.time_period.value == "DINNER":
-                    in_time = entry.get("second_shift_in") or entry.get("open_time") or ""
-                else:
-                    in_time = entry.get("first_shift_in") or entry.get("open_time") or ""
-
-    def format_time(value: str) -> str:
-        if not value:
-            return ""
-        parts = value.split(":")
-        if len(parts) < 2:
-            return value
-        try:
-            hour = int(parts[0])
-            minute = int(parts[1])
-        except ValueError:
-            return value
-        suffix = "AM" if hour < 12 else "PM"
-        hour = hour % 12 or 12
-        return f"{hour}:{minute:02d} {suffix}"
-
-    def normalize_task_label(label: str) -> str:
-        if not label:
-            return ""
-        prefix = "] "
-        if label.startswith("[Section:") and prefix in label:
-            return label.split(prefix, 1)[1].strip()
-        return label.strip()
-
-    sidework_by_employee = {}
-    for task in team_sheet.sidework_tasks:
-        label = normalize_task_label(task.label or "")
-        for assignment in task.assignments:
-            sidework_by_employee.setdefault(assignment.employee_id, []).append(label)
-
-    outwork_by_employee = {}
-    for task in team_sheet.outwork_tasks:
-        label = normalize_task_label(task.label or "")
-        for assignment in task.assignments:
-            outwork_by_employee.setdefault(assignment.employee_id, []).append(label)
-
-    section_map = {
-        section.id: (section.label or section.name)
-        for section in db.query(Section).all()
-    }
-    rows = "".join(
-        "<tr>"
-        f"<td>{format_time(in_time)}</td>"
-        f"<td>{item.section_label or item.role_label or section_map.get(item.section_id, '')}</td>"
-        f"<td>{item.employee_name or ''}</td>"
-        f"<td>{'; '.join(sidework_by_employee.get(item.employee_id, []))}</td>"
-        f"<td>{'; '.join(outwork_by_employee.get(item.employee_id, []))}</td>"
-        "</tr>"
-        for item in data.assignments
-    )
-    shift_label = shift.time_period.value if shift else ""
-    shift_date = shift.date.strftime("%Y-%m-%d") if shift else ""
-    store_label = f"Store {shift.store_id}" if shift and shift.store_id else ""
-    html = f"""
-    <html>
-    <head>
-      <title>{data.title}</title>
-      <style>
-        body {{ font-family: "Segoe UI", Arial, sans-serif; margin: 24px; color: #111; }}
-        h1 {{ margin: 0 0 6px; }}
-        .meta {{ color: #444; margin-bottom: 16px; }}
-        table {{ width: 100%; border-collapse: collapse; font-size: 14px; }}
-        th, td {{ border: 1px solid #444; padding: 6px 8px; text-align: left; vertical-align: top; }}
-        th {{ background: #efefef; text-transform: uppercase; font-size: 12px; letter-spacing: .04em; }}
-      </style>
-    </head>
-    <body>
-      <h1>{data.title}</h1>
-      <div class="meta">Status: {data.status} {shift_date} {shift_label} {store_label}</div>
-      <div class="meta">Notes: {data.notes or ''}</div>
-      <table border="1" cellpadding="4" cellspacing="0">
-        <tr>
-          <th>In Time</th>
-          <th>Section</th>
-          <th>Employee</th>
-          <th>Sidework</th>
-          <th>Outwork</th>
-        </tr>
-        {rows}
-      </table>
-    </body></html>
-    """
-    return HTMLResponse(content=html)
+    etag = print_service.etag_for(team_sheet_id, state)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if print_service.etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    html = print_service.print_cache.get(team_sheet_id, etag)
+    if html is None:
+
+        def render(session: Session) -> str:
+            team_sheet = team_sheet_service.fetch_team_sheet(session, team_sheet_id)
+            store_pref = print_service.load_store_preference(session, team_sheet.shift)
+            return print_service.render_document(team_sheet.title, [print_service.render_sheet(team_sheet, store_pref)])
+
+        html = await db.run_sync(render)
+        print_service.print_cache.put(team_sheet_id, etag, html)
+    return HTMLResponse(content=html, headers=headers)
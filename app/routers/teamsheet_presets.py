@@ -2,9 +2,9 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.core.security import get_current_manager_or_admin, get_current_user
+from app.core.security import CurrentUser, get_current_manager_or_admin, get_current_user
 from app.database import get_db
-from app.models import TeamSheetPreset, User
+from app.models import TeamSheetPreset
 
 router = APIRouter(prefix="/teamsheet-presets", tags=["teamsheet-presets"])
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/teamsheet-presets", tags=["teamsheet-presets"])
 def list_presets(
     store_id: int | None = Query(default=None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     query = db.query(TeamSheetPreset)
     if store_id is not None:
@@ -25,7 +25,7 @@ def list_presets(
 def upsert_preset(
     payload: schemas.TeamSheetPresetCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_manager_or_admin),
+    current_user: CurrentUser = Depends(get_current_manager_or_admin),
 ):
     preset = (
         db.query(TeamSheetPreset)
@@ -1,4 +1,8 @@
 from .schemas import (
+    AutoAssignRequest,
+    AutoAssignResult,
+    AutoAssignScore,
+    AutoAssignWeights,
     CobrandDealCreate,
     CobrandDealRead,
     GiftTrackerEntryRead,
@@ -9,6 +13,10 @@ from .schemas import (
     PayoutRuleRead,
     PayoutTierCreate,
     PayoutTierRead,
+    PayoutScenario,
+    PayoutScenarioResult,
+    PayoutSimulationRequest,
+    PayoutSimulationResponse,
     PayoutSummaryRow,
     PayoutSummaryResponse,
     PrizeAssignmentCreate,
@@ -21,6 +29,7 @@ from .schemas import (
     EmployeeRead,
     EmployeeUpdate,
     LoginRequest,
+    RefreshRequest,
     SellerOption,
     StorePreferenceCreate,
     StorePreferenceRead,
@@ -44,6 +53,7 @@ from .schemas import (
     StockLevelRead,
     DailyRosterCreate,
     DailyRosterRead,
+    ImportJobRead,
     TeamSheetPresetCreate,
     TeamSheetPresetRead,
     PyosAuditRead,
@@ -62,9 +72,19 @@ from .schemas import (
     TeamSheetAssignmentRead,
     TeamSheetCreate,
     TeamSheetRead,
+    TeamSheetSummaryRead,
+    TeamSheetCloneRange,
+    ClonedTeamSheet,
+    TeamSheetCloneRangeResult,
     TeamSheetTaskPayload,
     TeamSheetTaskRead,
     TeamSheetUpdate,
+    TeamSheetPatch,
+    TeamSheetPatchOp,
+    MoveAssignmentOp,
+    UnassignOp,
+    TaskAssigneeOp,
+    ReorderOp,
     TokenResponse,
     UserCreate,
     UserRead,
@@ -72,6 +92,10 @@ from .schemas import (
 )
 
 __all__ = [
+    "AutoAssignRequest",
+    "AutoAssignResult",
+    "AutoAssignScore",
+    "AutoAssignWeights",
     "CobrandDealCreate",
     "CobrandDealRead",
     "GiftTrackerEntryRead",
@@ -86,6 +110,10 @@ __all__ = [
     "PrizeAssignmentRead",
     "PayoutAdjustmentCreate",
     "PayoutAdjustmentRead",
+    "PayoutScenario",
+    "PayoutScenarioResult",
+    "PayoutSimulationRequest",
+    "PayoutSimulationResponse",
     "PayoutSummaryRow",
     "PayoutSummaryResponse",
     "SeasonCreate",
@@ -95,6 +123,7 @@ __all__ = [
     "UserEmployeeLink",
     "TokenResponse",
     "LoginRequest",
+    "RefreshRequest",
     "EmployeeCreate",
     "EmployeeRead",
     "EmployeeUpdate",
@@ -105,11 +134,21 @@ __all__ = [
     "ShiftRead",
     "TeamSheetCreate",
     "TeamSheetRead",
+    "TeamSheetSummaryRead",
+    "TeamSheetCloneRange",
+    "ClonedTeamSheet",
+    "TeamSheetCloneRangeResult",
     "TeamSheetAssignmentPayload",
     "TeamSheetAssignmentRead",
     "TeamSheetTaskPayload",
     "TeamSheetTaskRead",
     "TeamSheetUpdate",
+    "TeamSheetPatch",
+    "TeamSheetPatchOp",
+    "MoveAssignmentOp",
+    "UnassignOp",
+    "TaskAssigneeOp",
+    "ReorderOp",
     "SellerOption",
     "StorePreferenceCreate",
     "StorePreferenceRead",
@@ -133,6 +172,7 @@ __all__ = [
     "StockLevelRead",
     "DailyRosterCreate",
     "DailyRosterRead",
+    "ImportJobRead",
     "TeamSheetPresetCreate",
     "TeamSheetPresetRead",
     "PyosAuditRead",
@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional, Union
 
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 
@@ -14,6 +14,7 @@ from app.models import (
     POSOrderStatus,
     PyosShift,
     PyosStatus,
+    ImportJobStatus,
 )
 
 
@@ -49,6 +50,11 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class RefreshRequest(BaseModel):
+    # Optional: browser clients send the tss_refresh_token cookie instead
+    refresh_token: str | None = None
+
+
 class UserEmployeeLink(BaseModel):
     employee_id: int
 
@@ -180,6 +186,42 @@ class TeamSheetUpdate(BaseModel):
     outwork: Optional[List[TeamSheetTaskPayload]] = None
 
 
+class MoveAssignmentOp(BaseModel):
+    op: Literal["move"]
+    employee_id: int
+    section_id: int
+    role_label: Optional[str] = None
+    # Required when the employee holds more than one assignment on the sheet.
+    assignment_id: Optional[int] = None
+
+
+class UnassignOp(BaseModel):
+    op: Literal["unassign"]
+    employee_id: int
+
+
+class TaskAssigneeOp(BaseModel):
+    op: Literal["add_task_assignee", "remove_task_assignee"]
+    task_type: Literal["sidework", "outwork"]
+    task_id: int
+    employee_id: int
+
+
+class ReorderOp(BaseModel):
+    op: Literal["reorder"]
+    assignment_ids: List[int] = Field(min_length=1)
+
+
+TeamSheetPatchOp = Annotated[
+    Union[MoveAssignmentOp, UnassignOp, TaskAssigneeOp, ReorderOp], Field(discriminator="op")
+]
+
+
+class TeamSheetPatch(BaseModel):
+    updated_at: datetime
+    ops: List[TeamSheetPatchOp] = Field(min_length=1, max_length=200)
+
+
 class TeamSheetAssignmentRead(TeamSheetAssignmentPayload):
     id: int
     employee_name: Optional[str] = None
@@ -201,6 +243,67 @@ class TeamSheetRead(TeamSheetBase, TimestampModel):
     outwork: List[TeamSheetTaskRead] = Field(default_factory=list)
 
 
+class TeamSheetSummaryRead(TeamSheetBase, TimestampModel):
+    id: int
+    created_by_user_id: int
+    shift_date: date
+    time_period: ShiftPeriod
+    store_id: Optional[int] = None
+    assignment_count: int = 0
+    sidework_count: int = 0
+    outwork_count: int = 0
+
+
+class TeamSheetCloneRange(BaseModel):
+    source_start_date: date
+    source_end_date: date
+    target_start_date: date
+    store_id: Optional[int] = None
+
+
+class ClonedTeamSheet(BaseModel):
+    source_team_sheet_id: int
+    team_sheet_id: int
+    shift_id: int
+    shift_date: date
+    time_period: ShiftPeriod
+
+
+class TeamSheetCloneRangeResult(BaseModel):
+    created: List[ClonedTeamSheet] = Field(default_factory=list)
+    skipped_source_ids: List[int] = Field(default_factory=list)
+
+
+class AutoAssignWeights(BaseModel):
+    employment: float = Field(default=1, gt=0)
+    blast: float = Field(default=1, ge=0)
+    pitty: float = Field(default=1, ge=0)
+    capacity: float = Field(default=1, ge=0)
+    random: float = Field(default=1, ge=0)
+
+
+class AutoAssignRequest(BaseModel):
+    seed: Optional[int] = None
+    weights: AutoAssignWeights = Field(default_factory=AutoAssignWeights)
+    # tag -> employee ids allowed to work sections carrying that tag (e.g. "bar", "checker")
+    tag_qualifications: dict[str, List[int]] = Field(default_factory=dict)
+
+
+class AutoAssignScore(BaseModel):
+    employee_id: int
+    employee_name: str
+    score: float
+    section_id: Optional[int] = None
+    pinned: bool = False
+
+
+class AutoAssignResult(BaseModel):
+    seed: int
+    team_sheet: TeamSheetRead
+    scores: List[AutoAssignScore] = Field(default_factory=list)
+    unmatched_names: List[str] = Field(default_factory=list)
+
+
 class CobrandDealBase(BaseModel):
     company_name: str = Field(min_length=1, max_length=255)
     amount_usd: Decimal = Field(gt=0)
@@ -331,6 +434,33 @@ class PayoutSummaryResponse(BaseModel):
     rows: List[PayoutSummaryRow]
 
 
+class PayoutScenario(BaseModel):
+    name: str
+    tiers: List[PayoutTierBase] = Field(default_factory=list)
+    rules: List[PayoutRuleBase] = Field(default_factory=list)
+
+
+class PayoutSimulationRequest(BaseModel):
+    season_year: Optional[int] = None
+    scenarios: List[PayoutScenario] = Field(min_length=1, max_length=50)
+
+
+class PayoutScenarioResult(BaseModel):
+    name: str
+    sales_total_cents: int
+    tier_payout_cents: int
+    rule_payout_cents: int
+    misc_cents: int
+    prize_value_cents: int
+    total_payout_cents: int
+    rows: List[PayoutSummaryRow] = Field(default_factory=list)
+
+
+class PayoutSimulationResponse(BaseModel):
+    season_year: Optional[int] = None
+    scenarios: List[PayoutScenarioResult]
+
+
 class SeasonCreate(BaseModel):
     year: int
     start_date: date
@@ -548,6 +678,18 @@ class DailyRosterRead(DailyRosterCreate, TimestampModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ImportJobRead(TimestampModel):
+    id: int
+    kind: str
+    status: ImportJobStatus
+    rows_processed: int
+    result: Optional[dict] = Field(default=None, validation_alias="result_json")
+    error: Optional[str] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class TeamSheetPresetBase(BaseModel):
     name: str
     store_id: Optional[int] = None
@@ -0,0 +1,57 @@
+import csv
+import io
+from datetime import date
+from typing import BinaryIO
+
+from sqlalchemy.orm import Session
+
+from app.models import DailyRoster
+
+
+def import_daily_roster(db: Session, stream: BinaryIO, roster_date: date, store_id: int | None) -> DailyRoster:
+    """Replace the roster for (roster_date, store_id) with the names in a CSV upload. The caller commits."""
+    try:
+        entries = _read_entries(stream, "utf-8-sig")
+    except UnicodeDecodeError:
+        stream.seek(0)
+        entries = _read_entries(stream, "latin-1")
+
+    roster = (
+        db.query(DailyRoster)
+        .filter(DailyRoster.date == roster_date, DailyRoster.store_id == store_id)
+        .first()
+    )
+    if roster:
+        roster.entries = entries
+    else:
+        roster = DailyRoster(date=roster_date, store_id=store_id, entries=entries)
+        db.add(roster)
+    return roster
+
+
+def _read_entries(stream: BinaryIO, encoding: str) -> list[dict]:
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    try:
+        reader = csv.DictReader(text)
+        if not reader.fieldnames:
+            raise ValueError("CSV must include a header row.")
+
+        headers = {h.lower() for h in reader.fieldnames}
+        has_in_time = "in_time" in headers
+        if "name" not in headers:
+            raise ValueError("CSV must include a 'name' column.")
+
+        entries = []
+        for row in reader:
+            name = row.get("name") or row.get("Name")
+            if not name:
+                continue
+            entry = {"name": name.strip()}
+            if has_in_time:
+                in_time = row.get("in_time") or row.get("In_time") or row.get("In Time")
+                if in_time:
+                    entry["in_time"] = str(in_time).strip()
+            entries.append(entry)
+        return entries
+    finally:
+        text.detach()
@@ -0,0 +1,239 @@
+"""Background CSV imports: the upload is spooled to disk, a job row is queued, and a worker thread applies it.
+
+Job state lives in the import_jobs table, so any worker process can answer GET /imports/jobs/{id}. An import
+runs in a single transaction (a half-applied roster is worse than none). On SQLite that transaction holds
+the write lock until the end, so rows_processed is kept in memory while the job runs and written to the
+table when it finishes; pollers served by the process running the job see live progress, others see the
+final counts. No broker is involved: the queue is the worker pool's own, so each job records the process
+that owns it ("host:pid") and a heartbeat, and a starting worker fails only jobs whose owner is gone.
+"""
+
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from threading import Lock
+from typing import BinaryIO, Callable
+
+from sqlalchemy import Engine, or_, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import ImportJob, ImportJobStatus
+from app.services.daily_roster_import import import_daily_roster
+from app.services.server_import import import_servers
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATUSES = (ImportJobStatus.QUEUED, ImportJobStatus.RUNNING)
+
+# An importer applies one spooled file and returns the job result; it may report rows processed so far.
+Importer = Callable[[Session, BinaryIO, dict, Callable[[int], None]], dict]
+
+
+def run_server_import(db: Session, stream: BinaryIO, params: dict, on_progress: Callable[[int], None]) -> dict:
+    return import_servers(db, stream, on_progress)
+
+
+def run_daily_roster_import(db: Session, stream: BinaryIO, params: dict, on_progress: Callable[[int], None]) -> dict:
+    roster = import_daily_roster(db, stream, date.fromisoformat(params["date"]), params.get("store_id"))
+    on_progress(len(roster.entries))
+    return {"date": params["date"], "store_id": params.get("store_id"), "count": len(roster.entries)}
+
+
+IMPORTERS: dict[str, Importer] = {
+    "servers": run_server_import,
+    "daily_roster": run_daily_roster_import,
+}
+
+
+class JobLost(Exception):
+    """The job was failed by another process (its lease expired) while this one still held it."""
+
+
+def process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ImportJobRunner:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.executor: ThreadPoolExecutor | None = None
+        self.progress: dict[int, int] = {}
+        self.last_heartbeat = 0.0
+        self.lock = Lock()
+
+    @property
+    def owner(self) -> str:
+        # Not cached: workers forked from a preloaded app each have their own pid.
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def submit(self, db: Session, kind: str, upload: BinaryIO, params: dict, user_id: int) -> ImportJob:
+        """Spool the upload, queue a job for it and return the job row. The job uses the same engine as db."""
+        spool = tempfile.NamedTemporaryFile(prefix=f"import-{kind}-", suffix=".csv", delete=False)
+        try:
+            with spool:
+                shutil.copyfileobj(upload, spool)
+            job = ImportJob(
+                kind=kind,
+                params_json=params,
+                created_by_user_id=user_id,
+                status=ImportJobStatus.QUEUED,
+                owner=self.owner,
+                heartbeat_at=datetime.utcnow(),
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            with self.lock:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="import-job")
+                self.executor.submit(self.run, db.get_bind(), job.id, spool.name)
+        except BaseException:
+            # Once queued the worker owns the spool; until then it is ours to remove.
+            os.remove(spool.name)
+            raise
+        return job
+
+    def run(self, bind: Engine, job_id: int, path: str) -> None:
+        try:
+            with Session(bind=bind, autoflush=False) as db:
+                started = db.execute(
+                    update(ImportJob)
+                    .where(ImportJob.id == job_id, ImportJob.status == ImportJobStatus.QUEUED)
+                    .values(status=ImportJobStatus.RUNNING, heartbeat_at=datetime.utcnow())
+                )
+                db.commit()
+                if started.rowcount == 0:
+                    logger.warning("Import job %s was failed before it started", job_id)
+                    return
+                job = db.get(ImportJob, job_id)
+                self.progress[job_id] = 0
+                try:
+                    with open(path, "rb") as stream:
+                        result = IMPORTERS[job.kind](db, stream, job.params_json or {}, self.report(bind, job_id))
+                    # Locks the job row on Postgres, so a concurrent sweep either waits for this commit or has won.
+                    db.refresh(job, with_for_update=True)
+                    if job.status != ImportJobStatus.RUNNING:
+                        raise JobLost()
+                    db.commit()
+                    job.status = ImportJobStatus.SUCCEEDED
+                    job.result_json = result
+                except JobLost:
+                    db.rollback()
+                    logger.warning("Import job %s was failed by another worker; its rows were rolled back", job_id)
+                except Exception as exc:
+                    db.rollback()
+                    if not isinstance(exc, ValueError):
+                        logger.exception("Import job %s failed", job_id)
+                    job.status = ImportJobStatus.FAILED
+                    job.error = str(exc)
+                finally:
+                    job.rows_processed = self.progress.pop(job_id, 0)
+                    job.finished_at = datetime.utcnow()
+                    db.commit()
+        except Exception:
+            # The executor would swallow this; a job left QUEUED or RUNNING is failed once its lease runs out.
+            logger.exception("Import job %s could not be recorded", job_id)
+        finally:
+            self.progress.pop(job_id, None)
+            os.remove(path)
+
+    def report(self, bind: Engine, job_id: int) -> Callable[[int], None]:
+        def on_progress(rows: int) -> None:
+            self.progress[job_id] = rows
+            self.heartbeat(bind, job_id)
+
+        return on_progress
+
+    def heartbeat(self, bind: Engine, job_id: int) -> None:
+        """Between batches, renew the lease on every live job this process owns; raise JobLost if job_id's is gone.
+
+        Throttled to a few beats per lease. Skipped on SQLite: the running import holds the write lock, and a
+        SQLite database is on one host, where fail_abandoned checks the owner's pid instead of the lease.
+        """
+        if bind.dialect.name == "sqlite":
+            return
+        now = time.monotonic()
+        with self.lock:
+            if now - self.last_heartbeat < settings.import_job_lease_seconds / 4:
+                return
+            self.last_heartbeat = now
+        with Session(bind=bind) as db:
+            renewed = db.execute(
+                update(ImportJob)
+                .where(ImportJob.owner == self.owner, ImportJob.status.in_(LIVE_STATUSES))
+                .values(heartbeat_at=datetime.utcnow())
+                .returning(ImportJob.id)
+            ).scalars().all()
+            db.commit()
+        if job_id not in renewed:
+            raise JobLost()
+
+    def abandoned(self, owner: str | None, lease_expired: bool) -> bool:
+        if owner is None:
+            return True
+        host, _, pid = owner.rpartition(":")
+        if host == socket.gethostname() and os.name == "posix":
+            # Our own identity counts as gone: nothing is queued yet, and restarted containers reuse pids.
+            return int(pid) == os.getpid() or not process_exists(int(pid))
+        return lease_expired
+
+    def fail_abandoned(self, bind: Engine) -> int:
+        """Mark QUEUED/RUNNING jobs whose owning process is gone as FAILED and return how many there were.
+
+        Run at startup, before this process queues anything. An owner on this host is gone when its pid no
+        longer exists; an owner elsewhere when its heartbeat is older than settings.import_job_lease_seconds.
+        Costs one indexed SELECT unless something was abandoned.
+        """
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=settings.import_job_lease_seconds)
+        lease_expired = or_(ImportJob.heartbeat_at.is_(None), ImportJob.heartbeat_at < cutoff)
+        with Session(bind=bind) as db:
+            live = db.execute(
+                select(ImportJob.id, ImportJob.owner, lease_expired).where(ImportJob.status.in_(LIVE_STATUSES))
+            ).all()
+            job_ids = [job_id for job_id, owner, expired in live if self.abandoned(owner, bool(expired))]
+            if not job_ids:
+                return 0
+            try:
+                failed = db.execute(
+                    update(ImportJob)
+                    .where(ImportJob.id.in_(job_ids), ImportJob.status.in_(LIVE_STATUSES))
+                    .values(
+                        status=ImportJobStatus.FAILED,
+                        error="Interrupted by a server restart; upload the file again.",
+                        finished_at=now,
+                    )
+                ).rowcount
+                db.commit()
+            except OperationalError:
+                # SQLite is locked by an import still running elsewhere; the next startup tries again.
+                db.rollback()
+                logger.warning("Could not fail abandoned import jobs %s", job_ids, exc_info=True)
+                return 0
+        logger.warning("Marked %s abandoned import jobs as failed", failed)
+        return failed
+
+    def rows_processed(self, job: ImportJob) -> int:
+        return self.progress.get(job.id, job.rows_processed)
+
+    def shutdown(self) -> None:
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True)
+                self.executor = None
+
+
+runner = ImportJobRunner(settings.import_workers)
@@ -0,0 +1,121 @@
+import json
+from bisect import bisect_right
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Callable, Iterable
+
+from app.models import PayoutRule, PayoutTier, PayoutType
+
+# A rule plugin receives the season ranking (employee_name, sales cents), best first, and its parsed
+# config, and returns the bonus cents it awards per employee.
+Ranking = list[tuple[str, int]]
+RuleHandler = Callable[[Ranking, dict], dict[str, int]]
+
+RULE_TYPES: dict[str, RuleHandler] = {}
+
+
+def register_rule(rule_type: str) -> Callable[[RuleHandler], RuleHandler]:
+    def decorator(handler: RuleHandler) -> RuleHandler:
+        RULE_TYPES[rule_type] = handler
+        return handler
+
+    return decorator
+
+
+def _to_cents(amount: Decimal) -> int:
+    return int((amount * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def _percent_of(total_cents: int, pct: Decimal) -> int:
+    return int((Decimal(total_cents) * pct / Decimal(100)).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def _pay_ranks(ranking: Ranking, percentages: Iterable) -> dict[str, int]:
+    payouts: dict[str, int] = {}
+    for (name, total), pct in zip(ranking, percentages):
+        payouts[name] = _percent_of(total, Decimal(str(pct)))
+    return payouts
+
+
+@register_rule("season_top_seller")
+def season_top_seller(ranking: Ranking, config: dict) -> dict[str, int]:
+    return _pay_ranks(ranking, [config.get("first_pct", 10), config.get("second_pct", 5)])
+
+
+@register_rule("top_n")
+def top_n(ranking: Ranking, config: dict) -> dict[str, int]:
+    """config: {"percentages": [10, 5, 2]} pays each rank that percent of their own sales."""
+    return _pay_ranks(ranking, config.get("percentages") or [])
+
+
+def rank_sales(sales_map: dict[str, int]) -> Ranking:
+    # Stable sort: ties keep first-appearance order.
+    return sorted(sales_map.items(), key=lambda item: item[1], reverse=True)
+
+
+class TierIndex:
+    """Tiers compiled into sorted breakpoints so a lookup is one bisect.
+
+    Matches the first-match semantics of scanning tiers ordered by min_amount_cents, including
+    overlapping tiers: each elementary interval between breakpoints stores the tier that scan would pick.
+    """
+
+    def __init__(self, tiers: list[PayoutTier]):
+        ordered = sorted(tiers, key=lambda tier: tier.min_amount_cents)
+        points = {tier.min_amount_cents for tier in ordered}
+        points.update(tier.max_amount_cents + 1 for tier in ordered if tier.max_amount_cents is not None)
+        self.breakpoints = sorted(points)
+        self.winners: list[PayoutTier | None] = [
+            next(
+                (
+                    tier
+                    for tier in ordered
+                    if tier.min_amount_cents <= point
+                    and (tier.max_amount_cents is None or point <= tier.max_amount_cents)
+                ),
+                None,
+            )
+            for point in self.breakpoints
+        ]
+
+    def lookup(self, sales_cents: int) -> PayoutTier | None:
+        position = bisect_right(self.breakpoints, sales_cents) - 1
+        return self.winners[position] if position >= 0 else None
+
+    def payout(self, sales_cents: int) -> int:
+        tier = self.lookup(sales_cents)
+        if tier is None:
+            return 0
+        if tier.payout_type == PayoutType.FIXED:
+            return tier.payout_value
+        return _to_cents(Decimal(sales_cents) * Decimal(tier.payout_value) / Decimal(10000))
+
+
+class PayoutEngine:
+    """Tiers and active rules for one season, parsed once and reused across every employee."""
+
+    def __init__(self, tiers: list[PayoutTier], rules: list[PayoutRule]):
+        self.tiers = TierIndex(tiers)
+        self.rules: list[tuple[RuleHandler, dict]] = []
+        for rule in rules:
+            handler = RULE_TYPES.get(rule.type)
+            if handler is None:
+                continue
+            config = rule.config
+            if isinstance(config, str):
+                config = json.loads(config) if config else {}
+            self.rules.append((handler, config or {}))
+
+    def tier_payout(self, sales_cents: int) -> int:
+        return self.tiers.payout(sales_cents)
+
+    def rule_payouts(self, sales_map: dict[str, int], ranking: Ranking | None = None) -> dict[str, int]:
+        payouts: dict[str, int] = defaultdict(int)
+        if not self.rules:
+            return payouts
+        if ranking is None:
+            ranking = rank_sales(sales_map)
+        for handler, config in self.rules:
+            for name, cents in handler(ranking, config).items():
+                payouts[name] += cents
+        return payouts
@@ -0,0 +1,442 @@
+from collections import defaultdict
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, selectinload
+
+from app import schemas
+from app.models import (
+    CobrandDeal,
+    Employee,
+    GiftTrackerEntry,
+    PayoutAdjustment,
+    PayoutRule,
+    PayoutSummaryEntry,
+    PayoutSummarySeason,
+    PayoutTier,
+    Prize,
+    PrizeAssignment,
+)
+from app.services.payout_rules import PayoutEngine, rank_sales
+
+SUMMARY_FIELDS = (
+    "sales_total_cents",
+    "tier_payout_cents",
+    "rule_payout_cents",
+    "misc_cents",
+    "prize_value_cents",
+    "total_payout_cents",
+)
+
+
+def gift_entry_cents(entry: GiftTrackerEntry) -> int:
+    total_dollars = (
+        (entry.tuesday or 0)
+        + (entry.wednesday or 0)
+        + (entry.thursday or 0)
+        + (entry.friday or 0)
+        + (entry.saturday or 0)
+        + (entry.sunday or 0)
+        + (entry.monday or 0)
+    )
+    return total_dollars * 100
+
+
+def load_tiers(db: Session, season_year: int | None) -> list[PayoutTier]:
+    query = db.query(PayoutTier).filter(PayoutTier.active.is_(True))
+    if season_year is not None:
+        query = query.filter(PayoutTier.season_year == season_year)
+    return query.order_by(PayoutTier.min_amount_cents.asc()).all()
+
+
+def load_rules(db: Session, season_year: int | None) -> list[PayoutRule]:
+    query = db.query(PayoutRule).filter(PayoutRule.active.is_(True))
+    if season_year is not None:
+        query = query.filter(PayoutRule.season_year == season_year)
+    return query.all()
+
+
+def load_engine(db: Session, season_year: int | None) -> PayoutEngine:
+    return PayoutEngine(load_tiers(db, season_year), load_rules(db, season_year))
+
+
+def load_prize_map(db: Session, season_year: int | None) -> dict[str, list[Prize]]:
+    query = db.query(PrizeAssignment).options(selectinload(PrizeAssignment.prize))
+    if season_year is not None:
+        query = query.filter(PrizeAssignment.season_year == season_year)
+    prize_map: dict[str, list[Prize]] = defaultdict(list)
+    for pa in query.all():
+        if pa.prize:
+            prize_map[pa.employee_name].append(pa.prize)
+    return prize_map
+
+
+def _season_filter(query, column, season_year: int | None):
+    return query.filter(column == season_year) if season_year is not None else query
+
+
+def gift_sales_by_employee(db: Session, season_year: int | None) -> list[tuple[str, int, int]]:
+    """(employee_name, sales cents, entry count) summed in SQL, in order of first appearance."""
+    day_total = (
+        func.coalesce(GiftTrackerEntry.tuesday, 0)
+        + func.coalesce(GiftTrackerEntry.wednesday, 0)
+        + func.coalesce(GiftTrackerEntry.thursday, 0)
+        + func.coalesce(GiftTrackerEntry.friday, 0)
+        + func.coalesce(GiftTrackerEntry.saturday, 0)
+        + func.coalesce(GiftTrackerEntry.sunday, 0)
+        + func.coalesce(GiftTrackerEntry.monday, 0)
+    )
+    query = db.query(
+        GiftTrackerEntry.employee_name,
+        func.coalesce(func.sum(day_total * 100), 0),
+        func.count(GiftTrackerEntry.id),
+    )
+    query = _season_filter(query, GiftTrackerEntry.season_year, season_year)
+    query = query.group_by(GiftTrackerEntry.employee_name).order_by(func.min(GiftTrackerEntry.id))
+    return [(name, int(cents), count) for name, cents, count in query.all()]
+
+
+def cobrand_sales_by_seller(db: Session, season_year: int | None) -> list[tuple[str, int, int]]:
+    """(seller name, amount cents, deal count) with sellers joined in the same query."""
+    query = db.query(
+        Employee.first_name,
+        Employee.last_name,
+        Employee.nickname,
+        func.coalesce(func.sum(CobrandDeal.amount_cents), 0),
+        func.count(CobrandDeal.id),
+    ).join(Employee, CobrandDeal.seller_id == Employee.id)
+    query = _season_filter(query, CobrandDeal.season_year, season_year)
+    query = query.group_by(Employee.id, Employee.first_name, Employee.last_name, Employee.nickname).order_by(
+        func.min(CobrandDeal.id)
+    )
+    results = []
+    for first_name, last_name, nickname, cents, count in query.all():
+        # Same rule as CobrandDeal.seller_name.
+        name = f"{first_name or ''} {last_name or ''}".strip() or nickname
+        if name:
+            results.append((name, int(cents), count))
+    return results
+
+
+def adjustments_by_employee(db: Session, season_year: int | None) -> list[tuple[str, int]]:
+    query = db.query(PayoutAdjustment.employee_name, func.coalesce(func.sum(PayoutAdjustment.amount_cents), 0))
+    query = _season_filter(query, PayoutAdjustment.season_year, season_year)
+    query = query.group_by(PayoutAdjustment.employee_name)
+    return [(name, int(cents)) for name, cents in query.all()]
+
+
+def aggregate_sources(db: Session, season_year: int | None) -> tuple[dict[str, int], dict[str, int], dict[str, int]]:
+    """Returns (sales cents, sales source counts, adjustment cents) by employee, aggregated in the database."""
+    sales_map: dict[str, int] = defaultdict(int)
+    sources: dict[str, int] = defaultdict(int)
+    for name, cents, count in gift_sales_by_employee(db, season_year) + cobrand_sales_by_seller(db, season_year):
+        sales_map[name] += cents
+        sources[name] += count
+    adj_map: dict[str, int] = defaultdict(int)
+    for name, cents in adjustments_by_employee(db, season_year):
+        adj_map[name] += cents
+    return sales_map, sources, adj_map
+
+
+def compute_summary(db: Session, season_year: int | None) -> schemas.PayoutSummaryResponse:
+    """Full recompute from the raw tables."""
+    sales_map, _, adj_map = aggregate_sources(db, season_year)
+    engine = load_engine(db, season_year)
+    prize_map = load_prize_map(db, season_year)
+    bonuses = engine.rule_payouts(sales_map)
+
+    rows: list[schemas.PayoutSummaryRow] = []
+    for name, sales_cents in sales_map.items():
+        tier_cents = engine.tier_payout(sales_cents)
+        prize_value = sum(p.cost_cents or 0 for p in prize_map.get(name, []))
+        misc = adj_map.get(name, 0)
+        rule_bonus = bonuses.get(name, 0)
+        rows.append(
+            schemas.PayoutSummaryRow(
+                employee_name=name,
+                sales_total_cents=sales_cents,
+                tier_payout_cents=tier_cents,
+                rule_payout_cents=rule_bonus,
+                misc_cents=misc,
+                prize_value_cents=prize_value,
+                total_payout_cents=tier_cents + rule_bonus + misc + prize_value,
+                prizes=[schemas.PrizeRead.model_validate(p) for p in prize_map.get(name, [])],
+            )
+        )
+    return schemas.PayoutSummaryResponse(rows=rows)
+
+
+def is_materialized(db: Session, season_year: int | None) -> bool:
+    if season_year is None:
+        return False
+    return (
+        db.query(PayoutSummarySeason.id).filter(PayoutSummarySeason.season_year == season_year).first()
+        is not None
+    )
+
+
+def _price_entries(entries: list[PayoutSummaryEntry], engine: PayoutEngine):
+    sales_map = {entry.employee_name: entry.sales_total_cents for entry in entries if entry.sales_sources > 0}
+    bonuses = engine.rule_payouts(sales_map)
+    for entry in entries:
+        if entry.sales_sources > 0:
+            entry.tier_payout_cents = engine.tier_payout(entry.sales_total_cents)
+            entry.rule_payout_cents = bonuses.get(entry.employee_name, 0)
+        else:
+            entry.tier_payout_cents = 0
+            entry.rule_payout_cents = 0
+        entry.total_payout_cents = (
+            entry.tier_payout_cents + entry.rule_payout_cents + entry.misc_cents + entry.prize_value_cents
+        )
+
+
+def _season_entries(db: Session, season_year: int) -> list[PayoutSummaryEntry]:
+    return (
+        db.query(PayoutSummaryEntry)
+        .filter(PayoutSummaryEntry.season_year == season_year)
+        .order_by(PayoutSummaryEntry.id)
+        .populate_existing()
+        .all()
+    )
+
+
+def claim_season(db: Session, season_year: int) -> bool:
+    """Lock the season's summary for this transaction, marking it built; True if this call marked it.
+
+    Writers to a season serialize on its PayoutSummarySeason row (on SQLite, on the database write lock), so
+    deltas read and written in Python are never lost. The marker is inserted with ON CONFLICT DO NOTHING:
+    when two first writes race, the loser waits for the winner's commit and then applies its own change to
+    the rows the winner built, instead of failing on the unique season_year.
+    """
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    marked = db.execute(
+        dialect_insert(PayoutSummarySeason)
+        .values(season_year=season_year)
+        .on_conflict_do_nothing(index_elements=[PayoutSummarySeason.season_year])
+    )
+    db.execute(
+        select(PayoutSummarySeason.id).where(PayoutSummarySeason.season_year == season_year).with_for_update()
+    )
+    return marked.rowcount == 1
+
+
+def apply_changes(
+    db: Session,
+    season_year: int | None,
+    *,
+    sales: dict[str, int] | None = None,
+    sources: dict[str, int] | None = None,
+    misc: dict[str, int] | None = None,
+    prizes: dict[str, int] | None = None,
+):
+    """Fold per-employee deltas into a materialized season and reprice it.
+
+    The first write to a season that isn't built yet materializes it instead: the change is already in the
+    session, so the build picks it up. Reads never materialize (see payout_summary).
+    """
+    if season_year is None:
+        return
+    db.flush()
+    if claim_season(db, season_year):
+        _build_entries(db, season_year)
+        return
+    entries = _season_entries(db, season_year)
+    by_name = {entry.employee_name: entry for entry in entries}
+    deltas = (
+        ("sales_total_cents", sales or {}),
+        ("sales_sources", sources or {}),
+        ("misc_cents", misc or {}),
+        ("prize_value_cents", prizes or {}),
+    )
+    for field, changes in deltas:
+        for name, delta in changes.items():
+            if not name:
+                continue
+            entry = by_name.get(name)
+            if entry is None:
+                entry = PayoutSummaryEntry(
+                    season_year=season_year,
+                    employee_name=name,
+                    sales_sources=0,
+                    sales_total_cents=0,
+                    tier_payout_cents=0,
+                    rule_payout_cents=0,
+                    misc_cents=0,
+                    prize_value_cents=0,
+                    total_payout_cents=0,
+                )
+                db.add(entry)
+                by_name[name] = entry
+                entries.append(entry)
+            setattr(entry, field, getattr(entry, field) + delta)
+    _price_entries(entries, load_engine(db, season_year))
+
+
+def reprice_season(db: Session, season_year: int | None):
+    """Recompute tier and rule payouts from the materialized sales after tier or rule edits."""
+    apply_changes(db, season_year)
+
+
+def rebuild_season(db: Session, season_year: int):
+    """Replace the season's materialized rows with a full recompute."""
+    db.flush()
+    claim_season(db, season_year)
+    _build_entries(db, season_year)
+
+
+def _build_entries(db: Session, season_year: int):
+    sales_map, sources, adj_map = aggregate_sources(db, season_year)
+    prize_map = load_prize_map(db, season_year)
+    db.query(PayoutSummaryEntry).filter(PayoutSummaryEntry.season_year == season_year).delete()
+    entries = []
+    for name in dict.fromkeys([*sales_map, *adj_map, *prize_map]):
+        entries.append(
+            PayoutSummaryEntry(
+                season_year=season_year,
+                employee_name=name,
+                sales_sources=sources.get(name, 0),
+                sales_total_cents=sales_map.get(name, 0),
+                tier_payout_cents=0,
+                rule_payout_cents=0,
+                misc_cents=adj_map.get(name, 0),
+                prize_value_cents=sum(p.cost_cents or 0 for p in prize_map.get(name, [])),
+                total_payout_cents=0,
+            )
+        )
+    db.add_all(entries)
+    _price_entries(entries, load_engine(db, season_year))
+
+
+def verify_season(db: Session, season_year: int) -> list[str]:
+    """Compare the materialized rows against a full recompute; returns human-readable differences."""
+    expected = {row.employee_name: row for row in compute_summary(db, season_year).rows}
+    materialized = read_summary(db, season_year)
+    actual = {row.employee_name: row for row in (materialized.rows if materialized else [])}
+    problems = []
+    for name in sorted(set(expected) | set(actual)):
+        if name not in actual:
+            problems.append(f"{season_year} {name}: missing from materialized summary")
+        elif name not in expected:
+            problems.append(f"{season_year} {name}: not present in full recompute")
+        else:
+            for field in SUMMARY_FIELDS:
+                want, got = getattr(expected[name], field), getattr(actual[name], field)
+                if want != got:
+                    problems.append(f"{season_year} {name}: {field} expected {want}, materialized {got}")
+    return problems
+
+
+def read_summary(db: Session, season_year: int) -> schemas.PayoutSummaryResponse | None:
+    """The materialized summary, or None if the season isn't built: one query for the marker, rows and prizes."""
+    result = db.execute(
+        select(PayoutSummarySeason.id, PayoutSummaryEntry, Prize)
+        .outerjoin(
+            PayoutSummaryEntry,
+            and_(
+                PayoutSummaryEntry.season_year == PayoutSummarySeason.season_year,
+                PayoutSummaryEntry.sales_sources > 0,
+            ),
+        )
+        .outerjoin(
+            PrizeAssignment,
+            and_(
+                PrizeAssignment.season_year == PayoutSummarySeason.season_year,
+                PrizeAssignment.employee_name == PayoutSummaryEntry.employee_name,
+            ),
+        )
+        .outerjoin(Prize, Prize.id == PrizeAssignment.prize_id)
+        .where(PayoutSummarySeason.season_year == season_year)
+        .order_by(PayoutSummaryEntry.id, PrizeAssignment.id)
+    ).all()
+    if not result:
+        return None
+    entries: dict[int, PayoutSummaryEntry] = {}
+    prize_map: dict[int, list[Prize]] = defaultdict(list)
+    for _, entry, prize in result:
+        if entry is None:
+            continue
+        entries[entry.id] = entry
+        if prize is not None:
+            prize_map[entry.id].append(prize)
+    return schemas.PayoutSummaryResponse(
+        rows=[
+            schemas.PayoutSummaryRow(
+                employee_name=entry.employee_name,
+                sales_total_cents=entry.sales_total_cents,
+                tier_payout_cents=entry.tier_payout_cents,
+                rule_payout_cents=entry.rule_payout_cents,
+                misc_cents=entry.misc_cents,
+                prize_value_cents=entry.prize_value_cents,
+                total_payout_cents=entry.total_payout_cents,
+                prizes=[schemas.PrizeRead.model_validate(p) for p in prize_map[entry_id]],
+            )
+            for entry_id, entry in entries.items()
+        ]
+    )
+
+
+def simulate(db: Session, payload: schemas.PayoutSimulationRequest) -> schemas.PayoutSimulationResponse:
+    """Evaluate candidate tier/rule sets against one load of the season's inputs; nothing is persisted."""
+    sales_map, _, adj_map = aggregate_sources(db, payload.season_year)
+    prize_map = load_prize_map(db, payload.season_year)
+    names = list(sales_map)
+    sales = [sales_map[name] for name in names]
+    misc = [adj_map.get(name, 0) for name in names]
+    prize_values = [sum(p.cost_cents or 0 for p in prize_map.get(name, [])) for name in names]
+    ranking = rank_sales(sales_map)
+
+    results = []
+    for scenario in payload.scenarios:
+        engine = PayoutEngine(
+            [PayoutTier(**tier.model_dump()) for tier in scenario.tiers if tier.active],
+            [PayoutRule(**rule.model_dump()) for rule in scenario.rules if rule.active],
+        )
+        tier_column = [engine.tier_payout(cents) for cents in sales]
+        bonuses = engine.rule_payouts(sales_map, ranking)
+        rule_column = [bonuses.get(name, 0) for name in names]
+        rows = [
+            schemas.PayoutSummaryRow(
+                employee_name=name,
+                sales_total_cents=sales[i],
+                tier_payout_cents=tier_column[i],
+                rule_payout_cents=rule_column[i],
+                misc_cents=misc[i],
+                prize_value_cents=prize_values[i],
+                total_payout_cents=tier_column[i] + rule_column[i] + misc[i] + prize_values[i],
+            )
+            for i, name in enumerate(names)
+        ]
+        results.append(
+            schemas.PayoutScenarioResult(
+                name=scenario.name,
+                sales_total_cents=sum(sales),
+                tier_payout_cents=sum(tier_column),
+                rule_payout_cents=sum(rule_column),
+                misc_cents=sum(misc),
+                prize_value_cents=sum(prize_values),
+                total_payout_cents=sum(row.total_payout_cents for row in rows),
+                rows=rows,
+            )
+        )
+    return schemas.PayoutSimulationResponse(season_year=payload.season_year, scenarios=results)
+
+
+def rebuild_seller_seasons(db: Session, employee_id: int):
+    """Rebuild the built seasons holding this seller's cobrand deals; rows are keyed by the seller's current name."""
+    seasons = (
+        db.query(CobrandDeal.season_year)
+        .filter(CobrandDeal.seller_id == employee_id, CobrandDeal.season_year.is_not(None))
+        .distinct()
+        .all()
+    )
+    for (season_year,) in seasons:
+        if is_materialized(db, season_year):
+            rebuild_season(db, season_year)
+
+
+def payout_summary(db: Session, season_year: int | None) -> schemas.PayoutSummaryResponse:
+    # Read-only: a season nobody has written to since it was added is computed on the fly rather than
+    # materialized here, so concurrent first reads can't race to insert the same rows.
+    summary = read_summary(db, season_year) if season_year is not None else None
+    return summary if summary is not None else compute_summary(db, season_year)
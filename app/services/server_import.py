@@ -0,0 +1,183 @@
+import csv
+import io
+from datetime import datetime, timedelta
+from typing import BinaryIO, Callable, Iterator
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import Employee, EmployeeRole
+
+# Rows per bulk statement: well under SQLite's 32766 and Postgres' 65535 bound parameter limits.
+BATCH_SIZE = 1000
+
+# CSV header aliases for each imported Employee column; headers are matched case-insensitively.
+COLUMN_ALIASES = {
+    "upsell_score": ("upsell_score", "upsell"),
+    "pitty_score": ("pitty",),
+    "employment_days": ("employment_days", "employment"),
+    "max_section_load": ("max_guests", "capacity", "max_section_load"),
+}
+UPDATABLE_COLUMNS = ("nickname", *COLUMN_ALIASES)
+
+
+class RowError(ValueError):
+    pass
+
+
+def parse_int(value: str | None, column: str) -> int | None:
+    if value is None or not value.strip():
+        return None
+    try:
+        return int(float(value.strip()))
+    except ValueError as exc:
+        raise RowError(f"{column} must be a number, got {value.strip()!r}") from exc
+
+
+def parse_row(row: dict[str, str | None]) -> tuple[str, str, dict]:
+    """Return (first_name, last_name, provided column values) for one CSV row."""
+    name = (row.get("name") or "").strip()
+    if not name:
+        raise RowError("name is required")
+    parts = name.split()
+    fields = {"nickname": (row.get("nickname") or "").strip() or None}
+    for column, aliases in COLUMN_ALIASES.items():
+        raw = next((row[alias] for alias in aliases if row.get(alias)), None)
+        fields[column] = parse_int(raw, aliases[0])
+    return parts[0], parts[1] if len(parts) > 1 else "", fields
+
+
+def read_rows(stream: BinaryIO, encoding: str) -> Iterator[tuple[int, dict[str, str | None]]]:
+    """Yield (line number, row with lower-cased headers) straight off the upload, without reading it all in."""
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    try:
+        reader = csv.DictReader(text)
+        if not reader.fieldnames or "name" not in {h.strip().lower() for h in reader.fieldnames}:
+            raise ValueError("CSV must include a 'name' column.")
+        for row in reader:
+            yield reader.line_num, {key.strip().lower(): value for key, value in row.items() if key}
+    finally:
+        # Leave the upload open for the caller (and for a retry with another encoding).
+        text.detach()
+
+
+def employee_values(first_name: str, last_name: str, fields: dict, now: datetime) -> dict:
+    today = now.date()
+    days = fields.get("employment_days")
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "role": EmployeeRole.SERVER,
+        "active": True,
+        "employment_start_date": today - timedelta(days=days) if days is not None else today,
+        **{column: fields.get(column) for column in UPDATABLE_COLUMNS},
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def upsert_statement(db: Session, rows: list[dict]):
+    """INSERT ... ON CONFLICT (id) DO UPDATE that only overwrites the columns a row actually provided."""
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = dialect_insert(Employee).values(rows)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[Employee.id],
+        set_={
+            **{column: func.coalesce(excluded[column], getattr(Employee, column)) for column in UPDATABLE_COLUMNS},
+            "employment_start_date": case(
+                (excluded.employment_days.is_(None), Employee.employment_start_date),
+                else_=excluded.employment_start_date,
+            ),
+            "updated_at": excluded.updated_at,
+        },
+    )
+
+
+class ServerImport:
+    """Accumulates parsed rows into batches of new and existing employees and writes each batch in bulk."""
+
+    def __init__(self, db: Session, on_progress: Callable[[int], None] | None = None):
+        self.db = db
+        self.on_progress = on_progress
+        self.rows_read = 0
+        self.created = 0
+        self.updated = 0
+        self.errors: list[dict] = []
+        # Duplicate names already in the table resolve to the oldest row, as the per-row lookup used to.
+        self.index: dict[tuple[str, str], int] = {}
+        for employee_id, first_name, last_name in db.execute(
+            select(Employee.id, Employee.first_name, Employee.last_name).order_by(Employee.id)
+        ):
+            self.index.setdefault((first_name, last_name), employee_id)
+        self.new: dict[tuple[str, str], dict] = {}
+        self.existing: dict[int, tuple[str, str, dict]] = {}
+
+    def add(self, line: int, row: dict[str, str | None]) -> None:
+        self.rows_read += 1
+        try:
+            first_name, last_name, fields = parse_row(row)
+        except RowError as exc:
+            self.errors.append({"row": line, "name": (row.get("name") or "").strip() or None, "error": str(exc)})
+            return
+        key = (first_name, last_name)
+        provided = {column: value for column, value in fields.items() if value is not None}
+        if key in self.index:
+            employee_id = self.index[key]
+            self.existing.setdefault(employee_id, (first_name, last_name, {}))[2].update(provided)
+            self.updated += 1
+        elif key in self.new:
+            self.new[key].update(provided)
+            self.updated += 1
+        else:
+            self.new[key] = provided
+            self.created += 1
+        if len(self.new) + len(self.existing) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        now = datetime.utcnow()
+        if self.new:
+            rows = [employee_values(first, last, fields, now) for (first, last), fields in self.new.items()]
+            inserted = self.db.execute(
+                insert(Employee).returning(Employee.id, Employee.first_name, Employee.last_name), rows
+            )
+            for employee_id, first_name, last_name in inserted:
+                self.index[(first_name, last_name)] = employee_id
+            self.new = {}
+        if self.existing:
+            rows = [
+                {"id": employee_id, **employee_values(first, last, fields, now)}
+                for employee_id, (first, last, fields) in self.existing.items()
+            ]
+            self.db.execute(upsert_statement(self.db, rows))
+            self.existing = {}
+        if self.on_progress is not None:
+            self.on_progress(self.rows_read)
+
+    def result(self) -> dict:
+        return {"created": self.created, "updated": self.updated, "errors": self.errors}
+
+
+def import_servers(db: Session, stream: BinaryIO, on_progress: Callable[[int], None] | None = None) -> dict:
+    """Create or update servers from a CSV upload; rows that fail validation are reported, not imported.
+
+    Decodes as UTF-8 and falls back to Latin-1 (re-reading from the start) if the file is not valid UTF-8.
+    The caller commits. on_progress, if given, receives the number of rows read after each batch is written.
+    """
+    try:
+        return _import(db, stream, "utf-8-sig", on_progress)
+    except UnicodeDecodeError:
+        db.rollback()
+        stream.seek(0)
+        return _import(db, stream, "latin-1", on_progress)
+
+
+def _import(db: Session, stream: BinaryIO, encoding: str, on_progress: Callable[[int], None] | None) -> dict:
+    job = ServerImport(db, on_progress)
+    for line, row in read_rows(stream, encoding):
+        job.add(line, row)
+    job.flush()
+    return job.result()
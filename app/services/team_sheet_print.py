@@ -0,0 +1,226 @@
+import hashlib
+from collections import OrderedDict
+from html import escape
+from string import Template
+from threading import Lock
+
+from sqlalchemy import String, cast, select
+from sqlalchemy.orm import Session
+
+from app.models import Employee, Section, Shift, ShiftPeriod, StorePreference, TeamSheet, TeamSheetAssignment
+from app.services.team_sheets import tasks_by_employee
+
+DOCUMENT_TEMPLATE = Template(
+    """
+    <html>
+    <head>
+      <title>$title</title>
+      <style>
+        body { font-family: "Segoe UI", Arial, sans-serif; margin: 24px; color: #111; }
+        h1 { margin: 0 0 6px; }
+        .meta { color: #444; margin-bottom: 16px; }
+        .sheet + .sheet { page-break-before: always; break-before: page; }
+        table { width: 100%; border-collapse: collapse; font-size: 14px; }
+        th, td { border: 1px solid #444; padding: 6px 8px; text-align: left; vertical-align: top; }
+        th { background: #efefef; text-transform: uppercase; font-size: 12px; letter-spacing: .04em; }
+      </style>
+    </head>
+    <body>
+    $sheets
+    </body></html>
+    """
+)
+
+SHEET_TEMPLATE = Template(
+    """
+      <section class="sheet">
+      <h1>$title</h1>
+      <div class="meta">Status: $status $shift_date $shift_label $store_label</div>
+      <div class="meta">Notes: $notes</div>
+      <table border="1" cellpadding="4" cellspacing="0">
+        <tr>
+          <th>In Time</th>
+          <th>Section</th>
+          <th>Employee</th>
+          <th>Sidework</th>
+          <th>Outwork</th>
+        </tr>
+        $rows
+      </table>
+      </section>
+    """
+)
+
+ROW_TEMPLATE = Template(
+    "<tr><td>$in_time</td><td>$section</td><td>$employee</td><td>$sidework</td><td>$outwork</td></tr>"
+)
+
+
+def format_time(value: str) -> str:
+    if not value:
+        return ""
+    parts = value.split(":")
+    if len(parts) < 2:
+        return value
+    try:
+        hour = int(parts[0])
+        minute = int(parts[1])
+    except ValueError:
+        return value
+    suffix = "AM" if hour < 12 else "PM"
+    hour = hour % 12 or 12
+    return f"{hour}:{minute:02d} {suffix}"
+
+
+def normalize_task_label(label: str) -> str:
+    if not label:
+        return ""
+    prefix = "] "
+    if label.startswith("[Section:") and prefix in label:
+        return label.split(prefix, 1)[1].strip()
+    return label.strip()
+
+
+def load_store_preference(db: Session, shift: Shift | None) -> StorePreference | None:
+    if not shift or not shift.store_id:
+        return None
+    return db.query(StorePreference).filter(StorePreference.store_number == str(shift.store_id)).first()
+
+
+def load_store_preferences(db: Session, shifts: list[Shift]) -> dict[str, StorePreference]:
+    store_numbers = {str(shift.store_id) for shift in shifts if shift.store_id}
+    if not store_numbers:
+        return {}
+    prefs = db.query(StorePreference).filter(StorePreference.store_number.in_(store_numbers)).all()
+    return {pref.store_number: pref for pref in prefs}
+
+
+def in_time_for(shift: Shift | None, store_pref: StorePreference | None) -> str:
+    if not shift or not store_pref or not store_pref.daily_schedule:
+        return ""
+    schedule = {(item.get("day") or "").lower(): item for item in store_pref.daily_schedule}
+    entry = schedule.get(shift.date.strftime("%A").lower())
+    if not entry:
+        return ""
+    if shift.time_period == ShiftPeriod.DINNER:
+        return entry.get("second_shift_in") or entry.get("open_time") or ""
+    return entry.get("first_shift_in") or entry.get("open_time") or ""
+
+
+def render_sheet(team_sheet: TeamSheet, store_pref: StorePreference | None) -> str:
+    """HTML fragment for one sheet; expects shift, assignments and task assignments to be loaded."""
+    shift = team_sheet.shift
+    in_time = escape(format_time(in_time_for(shift, store_pref)))
+    sidework = tasks_by_employee(team_sheet.sidework_tasks)
+    outwork = tasks_by_employee(team_sheet.outwork_tasks)
+
+    def task_cell(labels: dict[int, list[str]], employee_id: int) -> str:
+        return escape("; ".join(normalize_task_label(label) for label in labels.get(employee_id, [])))
+
+    rows = "".join(
+        ROW_TEMPLATE.substitute(
+            in_time=in_time,
+            section=escape(
+                (assignment.section.label if assignment.section else None)
+                or assignment.role_label
+                or (assignment.section.name if assignment.section else "")
+            ),
+            employee=escape(
+                f"{assignment.employee.first_name} {assignment.employee.last_name}" if assignment.employee else ""
+            ),
+            sidework=task_cell(sidework, assignment.employee_id),
+            outwork=task_cell(outwork, assignment.employee_id),
+        )
+        for assignment in team_sheet.assignments
+    )
+    return SHEET_TEMPLATE.substitute(
+        title=escape(team_sheet.title),
+        status=team_sheet.status.value,
+        shift_date=shift.date.strftime("%Y-%m-%d") if shift else "",
+        shift_label=shift.time_period.value if shift else "",
+        store_label=f"Store {shift.store_id}" if shift and shift.store_id else "",
+        notes=escape(team_sheet.notes or ""),
+        rows=rows,
+    )
+
+
+def render_day(db: Session, team_sheets: list[TeamSheet], title: str) -> str:
+    """One document with a page per sheet; store preferences are fetched once for the whole batch."""
+    prefs = load_store_preferences(db, [sheet.shift for sheet in team_sheets])
+    sheets = [
+        render_sheet(sheet, prefs.get(str(sheet.shift.store_id)) if sheet.shift.store_id else None)
+        for sheet in team_sheets
+    ]
+    return render_document(title, sheets)
+
+
+def render_document(title: str, sheets: list[str]) -> str:
+    return DOCUMENT_TEMPLATE.substitute(title=escape(title), sheets="".join(sheets))
+
+
+def etag_query(team_sheet_id: int):
+    """Everything the print page depends on, one row per assignment (or one row for an empty sheet).
+
+    Employees and store preferences carry updated_at; sections don't, so their rendered label and name
+    are read directly. Sheet-owned rows (assignments, tasks) bump the sheet's own updated_at.
+    """
+    return (
+        select(
+            TeamSheet.updated_at,
+            Shift.updated_at,
+            StorePreference.updated_at,
+            TeamSheetAssignment.id,
+            TeamSheetAssignment.role_label,
+            Section.label,
+            Section.name,
+            Employee.updated_at,
+        )
+        .select_from(TeamSheet)
+        .outerjoin(Shift, TeamSheet.shift_id == Shift.id)
+        .outerjoin(StorePreference, StorePreference.store_number == cast(Shift.store_id, String))
+        .outerjoin(TeamSheetAssignment, TeamSheetAssignment.team_sheet_id == TeamSheet.id)
+        .outerjoin(Section, TeamSheetAssignment.section_id == Section.id)
+        .outerjoin(Employee, TeamSheetAssignment.employee_id == Employee.id)
+        .filter(TeamSheet.id == team_sheet_id)
+        .order_by(TeamSheetAssignment.id)
+    )
+
+
+def etag_for(team_sheet_id: int, rows) -> str:
+    """ETag derived from database state only, so every worker agrees on it without any invalidation."""
+    digest = hashlib.sha1(repr([tuple(row) for row in rows]).encode()).hexdigest()[:20]
+    return f'"ts-{team_sheet_id}-{digest}"'
+
+
+class PrintCache:
+    """Rendered print pages keyed by team sheet id, valid only for the ETag they were rendered under."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[str, str]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, team_sheet_id: int, etag: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(team_sheet_id)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(team_sheet_id)
+            return entry[1]
+
+    def put(self, team_sheet_id: int, etag: str, html: str) -> None:
+        with self._lock:
+            self._entries[team_sheet_id] = (etag, html)
+            self._entries.move_to_end(team_sheet_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+print_cache = PrintCache()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
@@ -1,17 +1,30 @@
-from typing import Iterable, List
+import base64
+import csv
+import io
+import random
+from datetime import date, datetime, timezone
+from typing import Iterable, Iterator, List
 
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import Query, Session, contains_eager, selectinload
 
 from app import schemas
 from app.models import (
+    DailyRoster,
     Employee,
     OutworkAssignment,
     OutworkTask,
+    PyosRequest,
+    PyosShift,
+    PyosStatus,
     Section,
+    Shift,
+    ShiftPeriod,
     SideworkAssignment,
     SideworkTask,
     TeamSheet,
     TeamSheetAssignment,
+    TeamSheetStatus,
 )
 
 
@@ -43,37 +56,183 @@ def clone_team_sheet(source: TeamSheet, target: TeamSheet, db: Session):
     db.add(target)
 
 
-def replace_assignments(team_sheet: TeamSheet, payloads: List[schemas.TeamSheetAssignmentPayload]):
-    team_sheet.assignments = [
-        TeamSheetAssignment(
-            employee_id=item.employee_id,
-            section_id=item.section_id,
-            role_label=item.role_label,
-            order_index=item.order_index,
-        )
-        for item in payloads
-    ]
+def merge_assignments(team_sheet: TeamSheet, payloads: List[schemas.TeamSheetAssignmentPayload]):
+    """Reconcile assignments in place so the flush only writes rows that actually changed.
+
+    Rows are matched on (employee_id, section_id) first; a leftover row for the same employee is then
+    reused with its new section, so moving a server is one UPDATE and keeps the row id.
+    """
+    by_key: dict[tuple[int, int], list[TeamSheetAssignment]] = {}
+    for assignment in team_sheet.assignments:
+        by_key.setdefault((assignment.employee_id, assignment.section_id), []).append(assignment)
+
+    merged: list[TeamSheetAssignment | None] = []
+    unmatched: list[tuple[int, schemas.TeamSheetAssignmentPayload]] = []
+    for item in payloads:
+        rows = by_key.get((item.employee_id, item.section_id))
+        if rows:
+            merged.append(rows.pop(0))
+        else:
+            merged.append(None)
+            unmatched.append((len(merged) - 1, item))
+
+    leftovers: dict[int, list[TeamSheetAssignment]] = {}
+    for rows in by_key.values():
+        for assignment in rows:
+            leftovers.setdefault(assignment.employee_id, []).append(assignment)
+    for index, item in unmatched:
+        rows = leftovers.get(item.employee_id)
+        merged[index] = rows.pop(0) if rows else TeamSheetAssignment(employee_id=item.employee_id)
+
+    for assignment, item in zip(merged, payloads):
+        # Unchanged values produce no attribute history, so untouched rows emit no UPDATE.
+        assignment.section_id = item.section_id
+        assignment.role_label = item.role_label
+        assignment.order_index = item.order_index
+    team_sheet.assignments = merged
 
 
-def replace_tasks(task_cls, assignment_cls, team_sheet: TeamSheet, payloads: List[schemas.TeamSheetTaskPayload]):
+def merge_tasks(
+    task_cls, assignment_cls, existing: List[SideworkTask | OutworkTask], payloads: List[schemas.TeamSheetTaskPayload]
+):
+    """Match tasks on label and their assignees on employee_id; only new, changed or dropped rows are written."""
+    by_label: dict[str, list[SideworkTask | OutworkTask]] = {}
+    for task in existing:
+        by_label.setdefault(task.label, []).append(task)
+
     tasks = []
     for item in payloads:
-        task = task_cls(label=item.label, description=item.description)
-        task.assignments = [assignment_cls(employee_id=eid) for eid in item.employee_ids]
+        matches = by_label.get(item.label)
+        task = matches.pop(0) if matches else task_cls(label=item.label)
+        task.description = item.description
+        current: dict[int, list] = {}
+        for assignment in task.assignments:
+            current.setdefault(assignment.employee_id, []).append(assignment)
+        task.assignments = [
+            current[eid].pop(0) if current.get(eid) else assignment_cls(employee_id=eid) for eid in item.employee_ids
+        ]
         tasks.append(task)
     return tasks
 
 
+def touch(team_sheet: TeamSheet) -> None:
+    # Child rows changing does not fire the parent's onupdate; bump it so print caches and ETags see the edit.
+    team_sheet.updated_at = datetime.utcnow()
+
+
 def apply_team_sheet_payload(team_sheet: TeamSheet, payload: schemas.TeamSheetCreate | schemas.TeamSheetUpdate):
+    touch(team_sheet)
     if payload.assignments is not None:
-        replace_assignments(team_sheet, payload.assignments)
+        merge_assignments(team_sheet, payload.assignments)
     if payload.sidework is not None:
-        team_sheet.sidework_tasks = replace_tasks(SideworkTask, SideworkAssignment, team_sheet, payload.sidework)
+        team_sheet.sidework_tasks = merge_tasks(
+            SideworkTask, SideworkAssignment, team_sheet.sidework_tasks, payload.sidework
+        )
     if payload.outwork is not None:
-        team_sheet.outwork_tasks = replace_tasks(OutworkTask, OutworkAssignment, team_sheet, payload.outwork)
+        team_sheet.outwork_tasks = merge_tasks(
+            OutworkTask, OutworkAssignment, team_sheet.outwork_tasks, payload.outwork
+        )
+
+
+TASK_MODELS = {
+    "sidework": (SideworkTask, SideworkAssignment),
+    "outwork": (OutworkTask, OutworkAssignment),
+}
+
 
+def claim_revision(db: Session, team_sheet_id: int, expected: datetime) -> datetime | None:
+    """Compare-and-set updated_at in one UPDATE; None means the sheet is missing or someone saved first."""
+    if expected.tzinfo is not None:
+        expected = expected.astimezone(timezone.utc).replace(tzinfo=None)
+    stamp = datetime.utcnow()
+    result = db.execute(
+        update(TeamSheet)
+        .where(TeamSheet.id == team_sheet_id, TeamSheet.updated_at == expected)
+        .values(updated_at=stamp)
+        .execution_options(synchronize_session=False)
+    )
+    return stamp if result.rowcount == 1 else None
+
+
+def apply_patch_ops(db: Session, team_sheet_id: int, ops: List[schemas.TeamSheetPatchOp]) -> None:
+    """Apply each op as a targeted row change.
+
+    Raises ValueError when an op references rows that don't exist or aren't on the sheet, or when a move
+    without assignment_id could mean more than one of the employee's assignments.
+    """
+    sheet_assignments = db.query(TeamSheetAssignment).filter(TeamSheetAssignment.team_sheet_id == team_sheet_id)
+    for op in ops:
+        if op.op == "move":
+            if db.query(Section.id).filter(Section.id == op.section_id).first() is None:
+                raise ValueError(f"section {op.section_id} does not exist")
+            if op.assignment_id is not None:
+                assignment = sheet_assignments.filter(
+                    TeamSheetAssignment.id == op.assignment_id, TeamSheetAssignment.employee_id == op.employee_id
+                ).first()
+                if assignment is None:
+                    raise ValueError(
+                        f"assignment {op.assignment_id} of employee {op.employee_id} is not on this team sheet"
+                    )
+            else:
+                matches = sheet_assignments.filter(TeamSheetAssignment.employee_id == op.employee_id).limit(2).all()
+                if len(matches) > 1:
+                    raise ValueError(
+                        f"employee {op.employee_id} has several assignments on this team sheet; pass assignment_id"
+                    )
+                if matches:
+                    assignment = matches[0]
+                elif db.query(Employee.id).filter(Employee.id == op.employee_id).first() is None:
+                    raise ValueError(f"employee {op.employee_id} does not exist")
+                else:
+                    assignment = TeamSheetAssignment(team_sheet_id=team_sheet_id, employee_id=op.employee_id)
+                    db.add(assignment)
+            assignment.section_id = op.section_id
+            if op.role_label is not None:
+                assignment.role_label = op.role_label
+        elif op.op == "unassign":
+            sheet_assignments.filter(TeamSheetAssignment.employee_id == op.employee_id).delete(
+                synchronize_session=False
+            )
+        elif op.op in ("add_task_assignee", "remove_task_assignee"):
+            task_cls, assignment_cls = TASK_MODELS[op.task_type]
+            task = db.query(task_cls.id).filter(task_cls.id == op.task_id, task_cls.team_sheet_id == team_sheet_id)
+            if task.first() is None:
+                raise ValueError(f"{op.task_type} task {op.task_id} is not on this team sheet")
+            assignees = db.query(assignment_cls).filter(
+                assignment_cls.task_id == op.task_id, assignment_cls.employee_id == op.employee_id
+            )
+            if op.op == "remove_task_assignee":
+                assignees.delete(synchronize_session=False)
+            elif assignees.first() is None:
+                db.add(assignment_cls(task_id=op.task_id, employee_id=op.employee_id))
+        elif op.op == "reorder":
+            rows = sheet_assignments.filter(TeamSheetAssignment.id.in_(op.assignment_ids)).all()
+            if len(rows) != len(set(op.assignment_ids)):
+                raise ValueError("reorder references assignments that are not on this team sheet")
+            positions = {assignment_id: index for index, assignment_id in enumerate(op.assignment_ids)}
+            for row in rows:
+                row.order_index = positions[row.id]
+        # Later ops in the same request must see this one's rows.
+        db.flush()
+
+
+def serialize_team_sheet(
+    team_sheet: TeamSheet,
+    employee_names: dict[int, str] | None = None,
+    section_labels: dict[int, str | None] | None = None,
+) -> schemas.TeamSheetRead:
+    """Pass the label maps to resolve names without touching the employee/section relationships."""
+
+    def employee_name(a: TeamSheetAssignment) -> str | None:
+        if employee_names is not None:
+            return employee_names.get(a.employee_id)
+        return f"{a.employee.first_name} {a.employee.last_name}" if a.employee else None
+
+    def section_label(a: TeamSheetAssignment) -> str | None:
+        if section_labels is not None:
+            return section_labels.get(a.section_id)
+        return a.section.label if a.section else None
 
-def serialize_team_sheet(team_sheet: TeamSheet) -> schemas.TeamSheetRead:
     return schemas.TeamSheetRead(
         id=team_sheet.id,
         shift_id=team_sheet.shift_id,
@@ -90,8 +249,8 @@ def serialize_team_sheet(team_sheet: TeamSheet) -> schemas.TeamSheetRead:
                 section_id=a.section_id,
                 role_label=a.role_label,
                 order_index=a.order_index,
-                employee_name=f"{a.employee.first_name} {a.employee.last_name}" if a.employee else None,
-                section_label=a.section.label if a.section else None,
+                employee_name=employee_name(a),
+                section_label=section_label(a),
             )
             for a in team_sheet.assignments
         ],
@@ -116,15 +275,544 @@ def serialize_team_sheet(team_sheet: TeamSheet) -> schemas.TeamSheetRead:
     )
 
 
+class LabelCache:
+    """Employee names and section labels by id, filled lazily in batches.
+
+    Scoped to one session (see labels_for), so it never outlives the request that filled it and edits made
+    by any worker are seen by the next request.
+    """
+
+    def __init__(self):
+        self._employees: dict[int, str] = {}
+        self._sections: dict[int, str | None] = {}
+
+    def employee_names(self, db: Session, ids: Iterable[int]) -> dict[int, str]:
+        wanted = set(ids)
+        missing = wanted - self._employees.keys()
+        if missing:
+            rows = db.query(Employee.id, Employee.first_name, Employee.last_name).filter(Employee.id.in_(missing))
+            self._employees.update({employee_id: f"{first} {last}" for employee_id, first, last in rows})
+        return {employee_id: self._employees[employee_id] for employee_id in wanted & self._employees.keys()}
+
+    def section_labels(self, db: Session, ids: Iterable[int]) -> dict[int, str | None]:
+        wanted = set(ids)
+        missing = wanted - self._sections.keys()
+        if missing:
+            self._sections.update(db.query(Section.id, Section.label).filter(Section.id.in_(missing)).all())
+        return {section_id: self._sections[section_id] for section_id in wanted & self._sections.keys()}
+
+
+def labels_for(db: Session) -> LabelCache:
+    """The label cache of this session, created on first use and dropped with the session."""
+    return db.info.setdefault("label_cache", LabelCache())
+
+
+def serialize_written_team_sheet(db: Session, team_sheet: TeamSheet) -> schemas.TeamSheetRead:
+    """Serialize a sheet just written in this session from the identity map; call before commit expires it."""
+    db.flush()
+    labels = labels_for(db)
+    return serialize_team_sheet(
+        team_sheet,
+        employee_names=labels.employee_names(db, (a.employee_id for a in team_sheet.assignments)),
+        section_labels=labels.section_labels(db, (a.section_id for a in team_sheet.assignments)),
+    )
+
+
+def tasks_by_employee(tasks: Iterable[SideworkTask | OutworkTask]) -> dict[int, list[str]]:
+    labels: dict[int, list[str]] = {}
+    for task in tasks:
+        for assignment in task.assignments:
+            labels.setdefault(assignment.employee_id, []).append(task.label)
+    return labels
+
+
+def csv_rows(team_sheet: TeamSheet) -> Iterator[list[str]]:
+    """One row per assignment; task labels come from employee indexes built once per sheet."""
+    sidework = tasks_by_employee(team_sheet.sidework_tasks)
+    outwork = tasks_by_employee(team_sheet.outwork_tasks)
+    for assignment in team_sheet.assignments:
+        employee_name = (
+            f"{assignment.employee.first_name} {assignment.employee.last_name}" if assignment.employee else "Unassigned"
+        )
+        yield [
+            assignment.section.label if assignment.section else "Unassigned",
+            employee_name,
+            assignment.role_label or "",
+            "; ".join(sidework.get(assignment.employee_id, [])),
+            "; ".join(outwork.get(assignment.employee_id, [])),
+            team_sheet.notes or "",
+        ]
+
+
+def iter_csv(rows: Iterable[list]) -> Iterator[str]:
+    """Encode rows one line at a time so nothing larger than a row is buffered."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
+def iter_range_csv_rows(db: Session, start_date: date, end_date: date, batch_size: int = 50) -> Iterator[list]:
+    """Rows for every sheet in the range, loaded in keyset batches and released from the session after each."""
+    yield ["Date", "Shift", "Team Sheet", "Section", "Employee", "Role", "Sidework", "Outwork", "Notes"]
+    last: tuple[date, int] | None = None
+    while True:
+        query = (
+            db.query(TeamSheet.id, Shift.date)
+            .join(Shift, TeamSheet.shift_id == Shift.id)
+            .filter(Shift.date >= start_date, Shift.date <= end_date)
+        )
+        if last is not None:
+            query = query.filter(
+                (Shift.date > last[0]) | ((Shift.date == last[0]) & (TeamSheet.id > last[1]))
+            )
+        page = query.order_by(Shift.date.asc(), TeamSheet.id.asc()).limit(batch_size).all()
+        if not page:
+            return
+        sheets = {
+            sheet.id: sheet
+            for sheet in db.query(TeamSheet)
+            .filter(TeamSheet.id.in_([sheet_id for sheet_id, _ in page]))
+            .options(
+                selectinload(TeamSheet.shift),
+                *sheet_graph_options(),
+            )
+        }
+        for sheet_id, _ in page:
+            sheet = sheets[sheet_id]
+            prefix = [sheet.shift.date.isoformat(), sheet.shift.time_period.value, sheet.title]
+            for row in csv_rows(sheet):
+                yield prefix + row
+        db.expunge_all()
+        last = page[-1][1], page[-1][0]
+        if len(page) < batch_size:
+            return
+
+
+def sheet_graph_options() -> tuple:
+    return (
+        selectinload(TeamSheet.assignments).selectinload(TeamSheetAssignment.employee),
+        selectinload(TeamSheet.assignments).selectinload(TeamSheetAssignment.section),
+        selectinload(TeamSheet.sidework_tasks).selectinload(SideworkTask.assignments),
+        selectinload(TeamSheet.outwork_tasks).selectinload(OutworkTask.assignments),
+    )
+
+
 def fetch_team_sheet(db: Session, team_sheet_id: int) -> TeamSheet | None:
     return (
         db.query(TeamSheet)
         .filter(TeamSheet.id == team_sheet_id)
+        .options(*sheet_graph_options())
+        .first()
+    )
+
+
+def fetch_team_sheets_for_day(db: Session, shift_date: date, store_id: int | None = None) -> list[TeamSheet]:
+    """Every sheet on a shift day with shift, assignments and tasks loaded in one fixed set of queries."""
+    query = (
+        db.query(TeamSheet)
+        .join(Shift, TeamSheet.shift_id == Shift.id)
+        .filter(Shift.date == shift_date)
         .options(
-            selectinload(TeamSheet.assignments).selectinload(TeamSheetAssignment.employee),
-            selectinload(TeamSheet.assignments).selectinload(TeamSheetAssignment.section),
-            selectinload(TeamSheet.sidework_tasks).selectinload(SideworkTask.assignments),
-            selectinload(TeamSheet.outwork_tasks).selectinload(OutworkTask.assignments),
+            contains_eager(TeamSheet.shift),
+            *sheet_graph_options(),
+        )
+    )
+    if store_id is not None:
+        query = query.filter(Shift.store_id == store_id)
+    lunch_first = case((Shift.time_period == ShiftPeriod.LUNCH, 0), else_=1)
+    return query.order_by(Shift.store_id, lunch_first, TeamSheet.id).all()
+
+
+def clone_range(db: Session, payload: schemas.TeamSheetCloneRange, user_id: int) -> schemas.TeamSheetCloneRangeResult:
+    """Copy every sheet in the source range onto the same weekday/period offset into the target range.
+
+    Missing target shifts are created, and sheets, assignments, tasks and task assignees go in as one
+    multi-row INSERT per table. A target shift that already has a sheet is left alone and its sources are
+    reported as skipped.
+    """
+    offset = payload.target_start_date - payload.source_start_date
+    source_query = (
+        db.query(TeamSheet)
+        .join(Shift, TeamSheet.shift_id == Shift.id)
+        .filter(Shift.date >= payload.source_start_date, Shift.date <= payload.source_end_date)
+        .options(contains_eager(TeamSheet.shift), *sheet_graph_options())
+    )
+    if payload.store_id is not None:
+        source_query = source_query.filter(Shift.store_id == payload.store_id)
+    sources = source_query.order_by(Shift.date, TeamSheet.id).all()
+    if not sources:
+        return schemas.TeamSheetCloneRangeResult()
+
+    target_query = db.query(Shift).filter(
+        Shift.date >= payload.source_start_date + offset, Shift.date <= payload.source_end_date + offset
+    )
+    if payload.store_id is not None:
+        target_query = target_query.filter(Shift.store_id == payload.store_id)
+    existing_shifts = target_query.all()
+    shift_ids = {(shift.date, shift.time_period, shift.store_id): shift.id for shift in existing_shifts}
+    occupied = {
+        shift_id
+        for (shift_id,) in db.query(TeamSheet.shift_id).filter(
+            TeamSheet.shift_id.in_([shift.id for shift in existing_shifts])
         )
+    }
+
+    def target_key(source: TeamSheet) -> tuple:
+        return source.shift.date + offset, source.shift.time_period, source.shift.store_id
+
+    new_keys = list(dict.fromkeys(target_key(source) for source in sources if target_key(source) not in shift_ids))
+    if new_keys:
+        created_ids = db.scalars(
+            insert(Shift).returning(Shift.id, sort_by_parameter_order=True),
+            [
+                {"date": day, "time_period": period, "store_id": store_id, "created_by_user_id": user_id}
+                for day, period, store_id in new_keys
+            ],
+        ).all()
+        shift_ids.update(zip(new_keys, created_ids))
+
+    cloned = [source for source in sources if shift_ids[target_key(source)] not in occupied]
+    skipped = [source.id for source in sources if shift_ids[target_key(source)] in occupied]
+    if not cloned:
+        return schemas.TeamSheetCloneRangeResult(skipped_source_ids=skipped)
+
+    sheet_ids = db.scalars(
+        insert(TeamSheet).returning(TeamSheet.id, sort_by_parameter_order=True),
+        [
+            {
+                "shift_id": shift_ids[target_key(source)],
+                "title": source.title,
+                "status": TeamSheetStatus.DRAFT,
+                "notes": source.notes,
+                "created_by_user_id": user_id,
+            }
+            for source in cloned
+        ],
+    ).all()
+
+    assignment_rows = [
+        {
+            "team_sheet_id": sheet_id,
+            "employee_id": a.employee_id,
+            "section_id": a.section_id,
+            "role_label": a.role_label,
+            "order_index": a.order_index,
+        }
+        for source, sheet_id in zip(cloned, sheet_ids)
+        for a in source.assignments
+    ]
+    if assignment_rows:
+        db.execute(insert(TeamSheetAssignment), assignment_rows)
+
+    for task_type, (task_cls, assignment_cls) in TASK_MODELS.items():
+        source_tasks = [
+            (sheet_id, task)
+            for source, sheet_id in zip(cloned, sheet_ids)
+            for task in getattr(source, f"{task_type}_tasks")
+        ]
+        if not source_tasks:
+            continue
+        task_ids = db.scalars(
+            insert(task_cls).returning(task_cls.id, sort_by_parameter_order=True),
+            [
+                {"team_sheet_id": sheet_id, "label": task.label, "description": task.description}
+                for sheet_id, task in source_tasks
+            ],
+        ).all()
+        assignee_rows = [
+            {"task_id": task_id, "employee_id": assignment.employee_id}
+            for (_, task), task_id in zip(source_tasks, task_ids)
+            for assignment in task.assignments
+        ]
+        if assignee_rows:
+            db.execute(insert(assignment_cls), assignee_rows)
+
+    return schemas.TeamSheetCloneRangeResult(
+        created=[
+            schemas.ClonedTeamSheet(
+                source_team_sheet_id=source.id,
+                team_sheet_id=sheet_id,
+                shift_id=shift_ids[target_key(source)],
+                shift_date=target_key(source)[0],
+                time_period=source.shift.time_period,
+            )
+            for source, sheet_id in zip(cloned, sheet_ids)
+        ],
+        skipped_source_ids=skipped,
+    )
+
+
+def encode_cursor(shift_date: date, team_sheet_id: int) -> str:
+    raw = f"{shift_date.isoformat()}:{team_sheet_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        date_part, id_part = raw.split(":", 1)
+        return date.fromisoformat(date_part), int(id_part)
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _count_children(model):
+    return (
+        select(func.count(model.id))
+        .where(model.team_sheet_id == TeamSheet.id)
+        .correlate(TeamSheet)
+        .scalar_subquery()
+    )
+
+
+def summary_query(db: Session) -> Query:
+    """Scalar columns plus child counts; no relationships are loaded. Caller joins Shift."""
+    return db.query(
+        TeamSheet.id,
+        TeamSheet.shift_id,
+        TeamSheet.title,
+        TeamSheet.status,
+        TeamSheet.notes,
+        TeamSheet.created_by_user_id,
+        TeamSheet.created_at,
+        TeamSheet.updated_at,
+        Shift.date.label("shift_date"),
+        Shift.time_period,
+        Shift.store_id,
+        _count_children(TeamSheetAssignment).label("assignment_count"),
+        _count_children(SideworkTask).label("sidework_count"),
+        _count_children(OutworkTask).label("outwork_count"),
+    ).select_from(TeamSheet)
+
+
+def serialize_team_sheet_summary(row) -> schemas.TeamSheetSummaryRead:
+    return schemas.TeamSheetSummaryRead(
+        id=row.id,
+        shift_id=row.shift_id,
+        title=row.title,
+        status=row.status,
+        notes=row.notes,
+        created_by_user_id=row.created_by_user_id,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        shift_date=row.shift_date,
+        time_period=row.time_period,
+        store_id=row.store_id,
+        assignment_count=row.assignment_count or 0,
+        sidework_count=row.sidework_count or 0,
+        outwork_count=row.outwork_count or 0,
+    )
+
+
+# Cost used for pairs that violate a hard constraint; solved pairs at this cost are dropped.
+INFEASIBLE_COST = 1e9
+
+SHIFT_TO_PYOS = {ShiftPeriod.LUNCH: PyosShift.AM, ShiftPeriod.DINNER: PyosShift.PM}
+
+
+def _normalize_name(value: str) -> str:
+    return " ".join(value.strip().lower().split())
+
+
+def score_employee(employee: Employee, weights: schemas.AutoAssignWeights, rng: random.Random) -> float:
+    """Server score, matching calculateServerScore in team-sheet-studio.html."""
+    upsell_component = ((employee.upsell_score or 0) / 10) * weights.blast
+    employment_component = max(employee.employment_days or 1, 1) ** (1 / (3.5 * weights.employment))
+    pitty_component = (employee.pitty_score or 0) * weights.pitty
+    capacity_component = ((employee.max_section_load or 0) * weights.capacity) / 2
+    random_component = rng.randrange(max(int(10 * weights.random), 1)) + 1 if weights.random else 0
+    total = upsell_component + employment_component + pitty_component + capacity_component + random_component
+    return round(total, 2)
+
+
+def section_value(section: Section, max_cut_order: int, max_guests: int) -> float:
+    """Sections cut later and seating more guests are worth more to the server who gets them."""
+    cut_part = (section.cut_order or 0) / max_cut_order if max_cut_order else 0
+    guests_part = (section.max_guests or 0) / max_guests if max_guests else 0
+    return 1 + cut_part + guests_part
+
+
+def can_work_section(employee: Employee, section: Section, tag_qualifications: dict[str, set[int]]) -> bool:
+    if employee.max_section_load is not None and section.max_guests is not None:
+        if section.max_guests > employee.max_section_load:
+            return False
+    for tag in section.tags or []:
+        allowed = tag_qualifications.get(tag.lower())
+        if allowed is not None and employee.id not in allowed:
+            return False
+    return True
+
+
+def solve_assignment(cost: list[list[float]]) -> list[tuple[int, int]]:
+    """Minimum-cost rectangular assignment (Hungarian algorithm, O(n^2 m)).
+
+    Returns (row, col) pairs; every row is matched when rows <= cols, otherwise every col.
+    """
+    if not cost or not cost[0]:
+        return []
+    if len(cost) > len(cost[0]):
+        transposed = [list(col) for col in zip(*cost)]
+        return [(row, col) for col, row in solve_assignment(transposed)]
+
+    n, m = len(cost), len(cost[0])
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)  # match[j] = row (1-based) assigned to column j
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row = cost[i0 - 1]
+            u_i0 = u[i0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                current = row[j - 1] - u_i0 - v[j]
+                if current < minv[j]:
+                    minv[j] = current
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    return [(match[j] - 1, j - 1) for j in range(1, m + 1) if match[j]]
+
+
+def match_roster_employees(roster: DailyRoster | None, employees: list[Employee]) -> tuple[list[Employee], list[str]]:
+    by_name: dict[str, Employee] = {}
+    for employee in employees:
+        full_name = _normalize_name(f"{employee.first_name or ''} {employee.last_name or ''}")
+        if full_name:
+            by_name.setdefault(full_name, employee)
+    for employee in employees:
+        if employee.nickname:
+            by_name.setdefault(_normalize_name(employee.nickname), employee)
+
+    matched: list[Employee] = []
+    unmatched: list[str] = []
+    seen: set[int] = set()
+    for entry in (roster.entries if roster else None) or []:
+        name = (entry.get("name") or "").strip()
+        if not name:
+            continue
+        employee = by_name.get(_normalize_name(name))
+        if employee is None:
+            unmatched.append(name)
+        elif employee.id not in seen:
+            seen.add(employee.id)
+            matched.append(employee)
+    return matched, unmatched
+
+
+def auto_assign(
+    db: Session, team_sheet: TeamSheet, payload: schemas.AutoAssignRequest
+) -> tuple[int, list[schemas.AutoAssignScore], list[str]]:
+    """Replace the sheet's assignments from the day's roster; returns (seed, scores, unmatched roster names)."""
+    shift = db.query(Shift).filter(Shift.id == team_sheet.shift_id).first()
+    seed = payload.seed if payload.seed is not None else team_sheet.id
+    rng = random.Random(seed)
+
+    roster = (
+        db.query(DailyRoster)
+        .filter(DailyRoster.date == shift.date, DailyRoster.store_id == shift.store_id)
         .first()
     )
+    employees = db.query(Employee).filter(Employee.active.is_(True)).order_by(Employee.id).all()
+    servers, unmatched_names = match_roster_employees(roster, employees)
+    sections = db.query(Section).filter(Section.is_active.is_(True)).order_by(Section.name).all()
+
+    scores = {employee.id: score_employee(employee, payload.weights, rng) for employee in servers}
+    assigned: dict[int, int] = {}
+    pinned: set[int] = set()
+
+    pyos_shift = SHIFT_TO_PYOS.get(shift.time_period)
+    if pyos_shift is not None:
+        roster_ids = {employee.id for employee in servers}
+        section_ids = {section.id for section in sections}
+        approved = (
+            db.query(PyosRequest.employee_id, PyosRequest.section_id)
+            .filter(
+                PyosRequest.date == shift.date,
+                PyosRequest.shift == pyos_shift,
+                PyosRequest.status == PyosStatus.APPROVED,
+            )
+            .all()
+        )
+        for employee_id, section_id in approved:
+            if employee_id in roster_ids and section_id in section_ids and section_id not in assigned.values():
+                assigned[employee_id] = section_id
+                pinned.add(employee_id)
+
+    open_servers = [employee for employee in servers if employee.id not in assigned]
+    open_sections = [section for section in sections if section.id not in assigned.values()]
+    max_cut_order = max((section.cut_order or 0 for section in sections), default=0)
+    max_guests = max((section.max_guests or 0 for section in sections), default=0)
+    qualifications = {tag.lower(): set(ids) for tag, ids in payload.tag_qualifications.items()}
+
+    # Maximise sum(score * section value): the best scores land in the most valuable sections.
+    cost = [
+        [
+            -scores[employee.id] * section_value(section, max_cut_order, max_guests)
+            if can_work_section(employee, section, qualifications)
+            else INFEASIBLE_COST
+            for section in open_sections
+        ]
+        for employee in open_servers
+    ]
+    for row, col in solve_assignment(cost):
+        if cost[row][col] < INFEASIBLE_COST:
+            assigned[open_servers[row].id] = open_sections[col].id
+
+    section_order = {section.id: index for index, section in enumerate(sections)}
+    section_labels = {section.id: section.label or section.name for section in sections}
+    merge_assignments(
+        team_sheet,
+        [
+            schemas.TeamSheetAssignmentPayload(
+                employee_id=employee_id,
+                section_id=section_id,
+                role_label=section_labels[section_id],
+                order_index=section_order[section_id],
+            )
+            for employee_id, section_id in sorted(assigned.items(), key=lambda item: section_order[item[1]])
+        ],
+    )
+
+    ranked = sorted(servers, key=lambda employee: scores[employee.id], reverse=True)
+    scores_out = [
+        schemas.AutoAssignScore(
+            employee_id=employee.id,
+            employee_name=f"{employee.first_name} {employee.last_name}".strip(),
+            score=scores[employee.id],
+            section_id=assigned.get(employee.id),
+            pinned=employee.id in pinned,
+        )
+        for employee in ranked
+    ]
+    touch(team_sheet)
+    return seed, scores_out, unmatched_names
@@ -0,0 +1,625 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 03:42:06.542541
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the schema as of the switch to migrations.
+
+    Databases from before then were built by create_all at import time plus ad-hoc SQLite ALTERs, so this
+    creates only the tables that are missing and then backfills the columns those ALTERs used to add.
+    """
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'daily_rosters' not in existing:
+        op.create_table('daily_rosters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=True),
+        sa.Column('entries', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('daily_rosters', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_daily_rosters_date'), ['date'], unique=False)
+            batch_op.create_index(batch_op.f('ix_daily_rosters_store_id'), ['store_id'], unique=False)
+
+    if 'employees' not in existing:
+        op.create_table('employees',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('first_name', sa.String(length=100), nullable=False),
+        sa.Column('last_name', sa.String(length=100), nullable=False),
+        sa.Column('nickname', sa.String(length=100), nullable=True),
+        sa.Column('role', sa.Enum('SERVER', 'HOST', 'BARTENDER', 'BUSSER', 'OTHER', name='employeerole'), nullable=False),
+        sa.Column('employment_start_date', sa.Date(), nullable=False),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.Column('upsell_score', sa.Integer(), nullable=True),
+        sa.Column('pitty_score', sa.Integer(), nullable=True),
+        sa.Column('employment_days', sa.Integer(), nullable=True),
+        sa.Column('max_section_load', sa.Integer(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'gift_tracker_entries' not in existing:
+        op.create_table('gift_tracker_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_name', sa.String(length=255), nullable=False),
+        sa.Column('week_number', sa.Integer(), nullable=False),
+        sa.Column('season_year', sa.Integer(), nullable=True),
+        sa.Column('tuesday', sa.Integer(), nullable=False),
+        sa.Column('wednesday', sa.Integer(), nullable=False),
+        sa.Column('thursday', sa.Integer(), nullable=False),
+        sa.Column('friday', sa.Integer(), nullable=False),
+        sa.Column('saturday', sa.Integer(), nullable=False),
+        sa.Column('sunday', sa.Integer(), nullable=False),
+        sa.Column('monday', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True
+        )
+        with op.batch_alter_table('gift_tracker_entries', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_gift_tracker_entries_employee_name'), ['employee_name'], unique=False)
+            batch_op.create_index(batch_op.f('ix_gift_tracker_entries_season_year'), ['season_year'], unique=False)
+            batch_op.create_index(batch_op.f('ix_gift_tracker_entries_week_number'), ['week_number'], unique=False)
+
+    if 'ingredients' not in existing:
+        op.create_table('ingredients',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=150), nullable=False),
+        sa.Column('unit', sa.String(length=50), nullable=False),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+
+    if 'menu_categories' not in existing:
+        op.create_table('menu_categories',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+
+    if 'payout_adjustments' not in existing:
+        op.create_table('payout_adjustments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_name', sa.String(length=255), nullable=False),
+        sa.Column('season_year', sa.Integer(), nullable=True),
+        sa.Column('label', sa.String(length=255), nullable=False),
+        sa.Column('amount_cents', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('payout_adjustments', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_payout_adjustments_employee_name'), ['employee_name'], unique=False)
+            batch_op.create_index(batch_op.f('ix_payout_adjustments_season_year'), ['season_year'], unique=False)
+
+    if 'payout_rules' not in existing:
+        op.create_table('payout_rules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('type', sa.String(length=100), nullable=False),
+        sa.Column('season_year', sa.Integer(), nullable=True),
+        sa.Column('config', sa.Text(), nullable=True),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('payout_rules', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_payout_rules_season_year'), ['season_year'], unique=False)
+
+    if 'payout_summary_entries' not in existing:
+        op.create_table('payout_summary_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('season_year', sa.Integer(), nullable=False),
+        sa.Column('employee_name', sa.String(length=255), nullable=False),
+        sa.Column('sales_sources', sa.Integer(), nullable=False),
+        sa.Column('sales_total_cents', sa.Integer(), nullable=False),
+        sa.Column('tier_payout_cents', sa.Integer(), nullable=False),
+        sa.Column('rule_payout_cents', sa.Integer(), nullable=False),
+        sa.Column('misc_cents', sa.Integer(), nullable=False),
+        sa.Column('prize_value_cents', sa.Integer(), nullable=False),
+        sa.Column('total_payout_cents', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('season_year', 'employee_name', name='uq_payout_summary_season_employee')
+        )
+        with op.batch_alter_table('payout_summary_entries', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_payout_summary_entries_season_year'), ['season_year'], unique=False)
+
+    if 'payout_summary_seasons' not in existing:
+        op.create_table('payout_summary_seasons',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('season_year', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('payout_summary_seasons', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_payout_summary_seasons_season_year'), ['season_year'], unique=True)
+
+    if 'payout_tiers' not in existing:
+        op.create_table('payout_tiers',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('label', sa.String(length=255), nullable=False),
+        sa.Column('season_year', sa.Integer(), nullable=True),
+        sa.Column('min_amount_cents', sa.Integer(), nullable=False),
+        sa.Column('max_amount_cents', sa.Integer(), nullable=True),
+        sa.Column('payout_type', sa.Enum('FIXED', 'PERCENT', name='payouttype'), nullable=False),
+        sa.Column('payout_value', sa.Integer(), nullable=False),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('payout_tiers', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_payout_tiers_season_year'), ['season_year'], unique=False)
+
+    if 'prizes' not in existing:
+        op.create_table('prizes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('season_year', sa.Integer(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('cost_cents', sa.Integer(), nullable=True),
+        sa.Column('image_url', sa.String(length=500), nullable=True),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('prizes', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_prizes_season_year'), ['season_year'], unique=False)
+
+    if 'seasons' not in existing:
+        op.create_table('seasons',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('seasons', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_seasons_year'), ['year'], unique=True)
+
+    if 'sections' not in existing:
+        op.create_table('sections',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('label', sa.String(length=100), nullable=False),
+        sa.Column('type', sa.Enum('BAR', 'FLOOR', 'PATIO', 'LOBBY', 'OTHER', name='sectiontype'), nullable=False),
+        sa.Column('tables', sa.JSON(), nullable=True),
+        sa.Column('tags', sa.JSON(), nullable=True),
+        sa.Column('cut_order', sa.Integer(), nullable=True),
+        sa.Column('sidework', sa.Text(), nullable=True),
+        sa.Column('outwork', sa.Text(), nullable=True),
+        sa.Column('max_capacity', sa.Integer(), nullable=True),
+        sa.Column('expected_out_time', sa.String(length=50), nullable=True),
+        sa.Column('max_guests', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'store_preferences' not in existing:
+        op.create_table('store_preferences',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('store_number', sa.String(length=50), nullable=False),
+        sa.Column('daily_schedule', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('store_preferences', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_store_preferences_store_number'), ['store_number'], unique=True)
+
+    if 'teamsheet_presets' not in existing:
+        op.create_table('teamsheet_presets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=150), nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=True),
+        sa.Column('data_json', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('teamsheet_presets', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_teamsheet_presets_store_id'), ['store_id'], unique=False)
+
+    if 'cobrand_deals' not in existing:
+        op.create_table('cobrand_deals',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_name', sa.String(length=255), nullable=False),
+        sa.Column('amount_cents', sa.Integer(), nullable=False),
+        sa.Column('date_of_commission', sa.Date(), nullable=True),
+        sa.Column('date_of_payment', sa.Date(), nullable=True),
+        sa.Column('date_of_pickup', sa.Date(), nullable=True),
+        sa.Column('seller_id', sa.Integer(), nullable=True),
+        sa.Column('logo_base64', sa.Text(), nullable=True),
+        sa.Column('season_year', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['seller_id'], ['employees.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('cobrand_deals', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_cobrand_deals_season_year'), ['season_year'], unique=False)
+
+    if 'menu_items' not in existing:
+        op.create_table('menu_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('name', sa.String(length=150), nullable=False),
+        sa.Column('price_cents', sa.Integer(), nullable=False),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['menu_categories.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'prize_assignments' not in existing:
+        op.create_table('prize_assignments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_name', sa.String(length=255), nullable=False),
+        sa.Column('season_year', sa.Integer(), nullable=True),
+        sa.Column('prize_id', sa.Integer(), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['prize_id'], ['prizes.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('prize_assignments', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_prize_assignments_employee_name'), ['employee_name'], unique=False)
+            batch_op.create_index(batch_op.f('ix_prize_assignments_season_year'), ['season_year'], unique=False)
+
+    if 'pyos_credits' not in existing:
+        op.create_table('pyos_credits',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('balance', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('employee_id')
+        )
+
+    if 'users' not in existing:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.String(length=255), nullable=False),
+        sa.Column('role', sa.Enum('ADMIN', 'MANAGER', 'SERVER', name='userrole'), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('users', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+            batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+
+    if 'pyos_audit' not in existing:
+        op.create_table('pyos_audit',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('actor_user_id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=True),
+        sa.Column('action', sa.String(length=50), nullable=False),
+        sa.Column('delta', sa.Integer(), nullable=True),
+        sa.Column('details_json', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['actor_user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'pyos_requests' not in existing:
+        op.create_table('pyos_requests',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('section_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('shift', sa.Enum('AM', 'PM', name='pyosshift'), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'APPROVED', 'DENIED', 'REVOKED', name='pyosstatus'), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=False),
+        sa.Column('approved_by_user_id', sa.Integer(), nullable=True),
+        sa.Column('denied_by_user_id', sa.Integer(), nullable=True),
+        sa.Column('revoked_by_user_id', sa.Integer(), nullable=True),
+        sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('denied_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['approved_by_user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['denied_by_user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+        sa.ForeignKeyConstraint(['revoked_by_user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['section_id'], ['sections.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('section_id', 'date', 'shift', name='uq_pyos_section_date_shift')
+        )
+
+    if 'recipe_items' not in existing:
+        op.create_table('recipe_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('ingredient_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'], ),
+        sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'shifts' not in existing:
+        op.create_table('shifts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('time_period', sa.Enum('LUNCH', 'DINNER', 'DOUBLE', 'OTHER', name='shiftperiod'), nullable=False),
+        sa.Column('store_id', sa.Integer(), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'pos_orders' not in existing:
+        op.create_table('pos_orders',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('OPEN', 'CLOSED', 'VOIDED', name='posorderstatus'), nullable=False),
+        sa.Column('shift_id', sa.Integer(), nullable=True),
+        sa.Column('server_id', sa.Integer(), nullable=True),
+        sa.Column('table_label', sa.String(length=50), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['server_id'], ['employees.id'], ),
+        sa.ForeignKeyConstraint(['shift_id'], ['shifts.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'team_sheets' not in existing:
+        op.create_table('team_sheets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('shift_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.Enum('DRAFT', 'PUBLISHED', 'ARCHIVED', name='teamsheetstatus'), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['shift_id'], ['shifts.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'outwork_tasks' not in existing:
+        op.create_table('outwork_tasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('team_sheet_id', sa.Integer(), nullable=False),
+        sa.Column('label', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['team_sheet_id'], ['team_sheets.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'pos_order_items' not in existing:
+        op.create_table('pos_order_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('price_cents', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ),
+        sa.ForeignKeyConstraint(['order_id'], ['pos_orders.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'pos_payments' not in existing:
+        op.create_table('pos_payments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('amount_cents', sa.Integer(), nullable=False),
+        sa.Column('method', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['pos_orders.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'sidework_tasks' not in existing:
+        op.create_table('sidework_tasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('team_sheet_id', sa.Integer(), nullable=False),
+        sa.Column('label', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['team_sheet_id'], ['team_sheets.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'team_sheet_assignments' not in existing:
+        op.create_table('team_sheet_assignments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('team_sheet_id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('section_id', sa.Integer(), nullable=False),
+        sa.Column('role_label', sa.String(length=100), nullable=True),
+        sa.Column('order_index', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+        sa.ForeignKeyConstraint(['section_id'], ['sections.id'], ),
+        sa.ForeignKeyConstraint(['team_sheet_id'], ['team_sheets.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'outwork_assignments' not in existing:
+        op.create_table('outwork_assignments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+        sa.ForeignKeyConstraint(['task_id'], ['outwork_tasks.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'sidework_assignments' not in existing:
+        op.create_table('sidework_assignments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+        sa.ForeignKeyConstraint(['task_id'], ['sidework_tasks.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'stock_movements' not in existing:
+        op.create_table('stock_movements',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ingredient_id', sa.Integer(), nullable=False),
+        sa.Column('quantity_change', sa.Float(), nullable=False),
+        sa.Column('reason', sa.String(length=100), nullable=False),
+        sa.Column('order_item_id', sa.Integer(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'], ),
+        sa.ForeignKeyConstraint(['order_item_id'], ['pos_order_items.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    add_missing_columns(
+        "sections",
+        [
+            sa.Column("tables", sa.JSON(), nullable=True),
+            sa.Column("tags", sa.JSON(), nullable=True),
+            sa.Column("cut_order", sa.Integer(), nullable=True),
+            sa.Column("sidework", sa.Text(), nullable=True),
+            sa.Column("outwork", sa.Text(), nullable=True),
+            sa.Column("max_capacity", sa.Integer(), nullable=True),
+            sa.Column("expected_out_time", sa.String(length=50), nullable=True),
+        ],
+    )
+    add_missing_columns("users", [sa.Column("employee_id", sa.Integer(), nullable=True)])
+
+
+def add_missing_columns(table: str, columns: list[sa.Column]) -> None:
+    present = {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+    for column in columns:
+        if column.name not in present:
+            op.add_column(table, column)
+
+
+def downgrade() -> None:
+    op.drop_table('stock_movements')
+    op.drop_table('sidework_assignments')
+    op.drop_table('outwork_assignments')
+    op.drop_table('team_sheet_assignments')
+    op.drop_table('sidework_tasks')
+    op.drop_table('pos_payments')
+    op.drop_table('pos_order_items')
+    op.drop_table('outwork_tasks')
+    op.drop_table('team_sheets')
+    op.drop_table('pos_orders')
+    op.drop_table('shifts')
+    op.drop_table('recipe_items')
+    op.drop_table('pyos_requests')
+    op.drop_table('pyos_audit')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    op.drop_table('pyos_credits')
+    with op.batch_alter_table('prize_assignments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_prize_assignments_season_year'))
+        batch_op.drop_index(batch_op.f('ix_prize_assignments_employee_name'))
+
+    op.drop_table('prize_assignments')
+    op.drop_table('menu_items')
+    with op.batch_alter_table('cobrand_deals', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_cobrand_deals_season_year'))
+
+    op.drop_table('cobrand_deals')
+    with op.batch_alter_table('teamsheet_presets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_teamsheet_presets_store_id'))
+
+    op.drop_table('teamsheet_presets')
+    with op.batch_alter_table('store_preferences', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_store_preferences_store_number'))
+
+    op.drop_table('store_preferences')
+    op.drop_table('sections')
+    with op.batch_alter_table('seasons', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_seasons_year'))
+
+    op.drop_table('seasons')
+    with op.batch_alter_table('prizes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_prizes_season_year'))
+
+    op.drop_table('prizes')
+    with op.batch_alter_table('payout_tiers', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payout_tiers_season_year'))
+
+    op.drop_table('payout_tiers')
+    with op.batch_alter_table('payout_summary_seasons', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payout_summary_seasons_season_year'))
+
+    op.drop_table('payout_summary_seasons')
+    with op.batch_alter_table('payout_summary_entries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payout_summary_entries_season_year'))
+
+    op.drop_table('payout_summary_entries')
+    with op.batch_alter_table('payout_rules', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payout_rules_season_year'))
+
+    op.drop_table('payout_rules')
+    with op.batch_alter_table('payout_adjustments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payout_adjustments_season_year'))
+        batch_op.drop_index(batch_op.f('ix_payout_adjustments_employee_name'))
+
+    op.drop_table('payout_adjustments')
+    op.drop_table('menu_categories')
+    op.drop_table('ingredients')
+    with op.batch_alter_table('gift_tracker_entries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_gift_tracker_entries_week_number'))
+        batch_op.drop_index(batch_op.f('ix_gift_tracker_entries_season_year'))
+        batch_op.drop_index(batch_op.f('ix_gift_tracker_entries_employee_name'))
+
+    op.drop_table('gift_tracker_entries')
+    op.drop_table('employees')
+    with op.batch_alter_table('daily_rosters', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_daily_rosters_store_id'))
+        batch_op.drop_index(batch_op.f('ix_daily_rosters_date'))
+
+    op.drop_table('daily_rosters')
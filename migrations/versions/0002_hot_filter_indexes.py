@@ -0,0 +1,43 @@
+"""hot filter indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 03:44:47.006839
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('shifts', 'ix_shifts_date_time_period', ['date', 'time_period']),
+    ('team_sheets', 'ix_team_sheets_shift_id', ['shift_id']),
+    ('team_sheet_assignments', 'ix_team_sheet_assignments_team_sheet_id', ['team_sheet_id']),
+    ('sidework_tasks', 'ix_sidework_tasks_team_sheet_id', ['team_sheet_id']),
+    ('sidework_assignments', 'ix_sidework_assignments_task_id', ['task_id']),
+    ('outwork_tasks', 'ix_outwork_tasks_team_sheet_id', ['team_sheet_id']),
+    ('outwork_assignments', 'ix_outwork_assignments_task_id', ['task_id']),
+    ('pyos_requests', 'ix_pyos_requests_date_shift_status', ['date', 'shift', 'status']),
+    ('pyos_audit', 'ix_pyos_audit_employee_id_created_at', ['employee_id', 'created_at']),
+    ('stock_movements', 'ix_stock_movements_ingredient_id', ['ingredient_id']),
+]
+
+
+def upgrade() -> None:
+    """Index the hot lookup filters and the FKs the team sheet graph is loaded by."""
+    # if_not_exists: databases adopted by the baseline may have been built by create_all from newer models.
+    for table, name, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for table, name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,46 @@
+"""import jobs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 11:27:54.903116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """State for background CSV imports, polled via GET /imports/jobs/{id}."""
+    if 'import_jobs' in set(sa.inspect(op.get_bind()).get_table_names()):
+        return
+    op.create_table(
+        'import_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column(
+            'status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='importjobstatus'), nullable=False
+        ),
+        sa.Column('params_json', sa.JSON(), nullable=True),
+        sa.Column('rows_processed', sa.Integer(), nullable=False),
+        sa.Column('result_json', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('import_jobs')
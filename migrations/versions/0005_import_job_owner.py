@@ -0,0 +1,34 @@
+"""import job owner and heartbeat
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 16:02:11.418204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Which process runs each import job and when it last checked in, so startup only fails abandoned jobs."""
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('import_jobs')}
+    if 'owner' not in columns:
+        op.add_column('import_jobs', sa.Column('owner', sa.String(length=100), nullable=True))
+    if 'heartbeat_at' not in columns:
+        op.add_column('import_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_import_jobs_status', 'import_jobs', ['status'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_import_jobs_status', table_name='import_jobs')
+    op.drop_column('import_jobs', 'heartbeat_at')
+    op.drop_column('import_jobs', 'owner')
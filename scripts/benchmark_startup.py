@@ -0,0 +1,83 @@
+"""Measure cold start: importing app.main plus the startup schema check, each in a fresh interpreter.
+
+Also times the old boot path (create_all plus the PRAGMA table_info checks) against the same database for
+comparison. Use --max-ms to fail (exit 1) when the median startup exceeds a budget, e.g. in CI.
+
+    python scripts/benchmark_startup.py --runs 10 --max-ms 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+PROBE = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import app.main as main
+imported = time.perf_counter()
+from sqlalchemy import event, text
+statements = []
+event.listen(main.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+if sys.argv[1] == "legacy":
+    from app.database import Base
+    Base.metadata.create_all(bind=main.engine)
+    with main.engine.connect() as conn:
+        conn.execute(text("PRAGMA table_info(sections)")).all()
+        conn.execute(text("PRAGMA table_info(users)")).all()
+else:
+    async def boot():
+        async with main.app.router.lifespan_context(main.app):
+            pass
+    asyncio.run(boot())
+finished = time.perf_counter()
+print(json.dumps({"import_ms": (imported - started) * 1000, "startup_ms": (finished - imported) * 1000,
+                  "statements": len(statements)}))
+"""
+
+
+def probe(mode: str, database_url: str) -> dict:
+    env = {**os.environ, "DATABASE_URL": database_url}
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, mode], cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, help="Fail if median import + startup exceeds this")
+    args = parser.parse_args()
+
+    from app.database import upgrade_schema
+
+    database_url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'startup.db'}"
+    upgrade_schema(database_url)
+
+    medians = {}
+    for mode in ("legacy", "migrated"):
+        runs = [probe(mode, database_url) for _ in range(args.runs)]
+        import_ms = statistics.median(run["import_ms"] for run in runs)
+        startup_ms = statistics.median(run["startup_ms"] for run in runs)
+        medians[mode] = import_ms + startup_ms
+        print(
+            f"{mode:<9} import {import_ms:>7.1f} ms  schema step {startup_ms:>7.1f} ms  "
+            f"statements {runs[0]['statements']}"
+        )
+
+    if args.max_ms is not None and medians["migrated"] > args.max_ms:
+        print(f"startup {medians['migrated']:.1f} ms exceeds budget of {args.max_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
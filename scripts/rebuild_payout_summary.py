@@ -0,0 +1,54 @@
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.database import SessionLocal, upgrade_schema
+from app.models import CobrandDeal, GiftTrackerEntry, PayoutAdjustment, PayoutSummarySeason, PrizeAssignment
+from app.services import payouts as payout_service
+
+
+def season_years(session) -> list[int]:
+    years: set[int] = set()
+    for model in (GiftTrackerEntry, CobrandDeal, PayoutAdjustment, PrizeAssignment, PayoutSummarySeason):
+        years.update(
+            year for (year,) in session.query(model.season_year).filter(model.season_year.is_not(None)).distinct()
+        )
+    return sorted(years)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verify and rebuild the materialized payout summary.")
+    parser.add_argument("--season", type=int, action="append", help="Season year (repeatable); default: all seasons")
+    parser.add_argument("--check", action="store_true", help="Only report drift; exit 1 if any is found")
+    args = parser.parse_args()
+
+    upgrade_schema()
+    session = SessionLocal()
+    drift = 0
+    try:
+        for season_year in args.season or season_years(session):
+            if payout_service.is_materialized(session, season_year):
+                problems = payout_service.verify_season(session, season_year)
+                for problem in problems:
+                    print(problem)
+                drift += len(problems)
+                status = f"{len(problems)} difference(s)"
+            else:
+                status = "not built"
+            if not args.check:
+                payout_service.rebuild_season(session, season_year)
+                session.commit()
+                status += ", rebuilt"
+            print(f"Season {season_year}: {status}")
+    finally:
+        session.close()
+    if args.check and drift:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from app.database import Base, SessionLocal, engine, ensure_sqlite_sections_columns
+from app.database import SessionLocal, upgrade_schema
 from app.models import Section, SectionType
 
 
@@ -36,8 +36,7 @@ SECTIONS = [
 
 
 def main() -> None:
-    Base.metadata.create_all(bind=engine)
-    ensure_sqlite_sections_columns()
+    upgrade_schema()
     session = SessionLocal()
     try:
         for section_data in SECTIONS:
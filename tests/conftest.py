@@ -1,14 +1,18 @@
 import asyncio
+import re
+
 import pytest
-from httpx import AsyncClient
-from sqlalchemy import create_engine
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 
-from app.database import Base, get_db
+from app.config import settings
+from app.core.passwords import shutdown_pool
+from app.services.import_jobs import runner as import_job_runner
+from app.database import Base, build_async_engine, build_engine, get_async_db, get_db
 from app.main import create_app
-
-
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite+pysqlite:///:memory:"
+from app.models import UserRole
 
 
 @pytest.fixture(scope="session")
@@ -18,18 +22,43 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def strict_query_budget():
+    # Requests over their query budget raise instead of logging, so N+1 regressions fail the suite.
+    settings.query_budget_strict = True
+    yield
+    settings.query_budget_strict = False
+
+
 @pytest.fixture(scope="session")
 def app():
     app = create_app()
-    return app
+    yield app
+    # The test client does not run the lifespan, so stop the password hashing and import workers here.
+    shutdown_pool()
+    import_job_runner.shutdown()
+
+
+@pytest.fixture(scope="session")
+def test_database_path(tmp_path_factory):
+    # A file rather than :memory: so the sync and async engines see the same database.
+    return tmp_path_factory.mktemp("db") / "test.db"
 
 
 @pytest.fixture(scope="session")
-def test_engine():
-    engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL, future=True)
+def test_engine(test_database_path):
+    engine = build_engine(f"sqlite+pysqlite:///{test_database_path}")
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def test_async_engine(test_engine, test_database_path, event_loop):
+    engine = build_async_engine(f"sqlite:///{test_database_path}")
+    yield engine
+    event_loop.run_until_complete(engine.dispose())
 
 
 @pytest.fixture(scope="session")
@@ -51,7 +80,49 @@ def override_get_db(app, TestingSessionLocal):
     app.dependency_overrides.pop(get_db, None)
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def override_get_async_db(app, test_async_engine):
+    AsyncTestingSessionLocal = async_sessionmaker(bind=test_async_engine, autoflush=False, expire_on_commit=False)
+
+    async def _get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = _get_async_db
+    yield
+    app.dependency_overrides.pop(get_async_db, None)
+
+
+@pytest_asyncio.fixture
 async def client(app):
-    async with AsyncClient(app=app, base_url="http://testserver") as ac:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as ac:
         yield ac
+
+
+@pytest.fixture
+def register_and_login(client):
+    """Register a user and log in as them; returns the token response (access_token, refresh_token).
+
+    Use a distinct email per test: users persist for the whole session, and registering an existing email
+    just logs in as the user created first.
+    """
+
+    async def register_and_login(email: str, role: UserRole = UserRole.MANAGER, full_name: str = "Test Manager"):
+        await client.post(
+            "/auth/register",
+            json={"email": email, "password": "secret123", "full_name": full_name, "role": role.value},
+        )
+        resp = await client.post("/auth/login", json={"email": email, "password": "secret123"})
+        return resp.json()
+
+    return register_and_login
+
+
+@pytest.fixture
+def query_count():
+    """Returns a function reading the SQL statement count a response reports in its Server-Timing header."""
+
+    def query_count(resp) -> int:
+        return int(re.search(r'desc="(\d+) queries"', resp.headers["server-timing"]).group(1))
+
+    return query_count
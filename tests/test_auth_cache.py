@@ -0,0 +1,89 @@
+from dataclasses import FrozenInstanceError
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import security
+from app.core.auth_cache import CurrentUser, MemoryBackend, user_cache
+from app.models import UserRole
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_skips_token_decode_and_user_query(client, monkeypatch, register_and_login, query_count):
+    token = (await register_and_login("auth-cache-hot@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    first = await client.get("/auth/me", headers=headers)
+    assert first.status_code == 200
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("token was decoded again")
+
+    monkeypatch.setattr(security.jwt, "decode", fail_decode)
+    resp = await client.get("/auth/me", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json() == first.json()
+    assert query_count(resp) == 0
+
+
+@pytest.mark.asyncio
+async def test_link_employee_invalidates_cached_user(client, register_and_login):
+    manager_token = (await register_and_login("auth-cache-manager@example.com"))["access_token"]
+    server_token = (await register_and_login("auth-cache-server@example.com", UserRole.SERVER))["access_token"]
+    manager_headers = {"Authorization": f"Bearer {manager_token}"}
+    server_headers = {"Authorization": f"Bearer {server_token}"}
+
+    me = await client.get("/auth/me", headers=server_headers)
+    server_id = me.json()["id"]
+    assert me.json()["employee_id"] is None
+    assert user_cache.get(server_id) is not None
+
+    employee = await client.post(
+        "/employees",
+        json={
+            "first_name": "Cache",
+            "last_name": "Server",
+            "role": "SERVER",
+            "employment_start_date": "2024-01-01",
+            "active": True,
+        },
+        headers=manager_headers,
+    )
+    linked = await client.post(
+        f"/auth/link-employee/{server_id}", json={"employee_id": employee.json()["id"]}, headers=manager_headers
+    )
+    assert linked.status_code == 200
+    assert user_cache.get(server_id) is None
+
+    me = await client.get("/auth/me", headers=server_headers)
+    assert me.json()["employee_id"] == employee.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_a_read_only_copy_not_bound_to_the_session(client, test_async_engine, register_and_login):
+    token = (await register_and_login("auth-cache-copy@example.com"))["access_token"]
+    user_id = (await client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})).json()["id"]
+    user_cache.invalidate(user_id)
+    async with AsyncSession(test_async_engine) as db:
+        loaded = await security.load_user(db, user_id)
+        cached = await security.load_user(db, user_id)
+    # Miss and hit hand out the same plain value; there is nothing a sync handler could lazy-load.
+    assert loaded == cached
+    for user in (loaded, cached):
+        assert isinstance(user, CurrentUser)
+        assert not hasattr(user, "password_hash")
+        with pytest.raises(FrozenInstanceError):
+            user.role = UserRole.ADMIN
+
+
+def test_memory_backend_is_bounded_and_expires():
+    now = [0.0]
+    backend = MemoryBackend(max_entries=2, clock=lambda: now[0])
+    backend.set("a", "1", ttl=10)
+    backend.set("b", "2", ttl=10)
+    assert backend.get("a") == "1"
+    backend.set("c", "3", ttl=10)
+    # "b" was the least recently used entry.
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    now[0] = 11
+    assert backend.get("a") is None
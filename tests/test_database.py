@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.config import settings
+from app.database import Base, build_async_engine, build_engine
+from app.models import GiftTrackerEntry
+
+
+def test_sqlite_connections_use_wal_and_tuned_pragmas(test_engine):
+    with test_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.sqlite_busy_timeout_ms
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -settings.sqlite_cache_size_kib
+    assert test_engine.pool.size() == settings.db_pool_size
+    assert test_engine.pool._pre_ping is settings.db_pool_pre_ping
+
+
+def test_sqlite_readers_and_writers_do_not_lock(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'locks.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE counters (id INTEGER PRIMARY KEY, value INTEGER)"))
+        conn.execute(text("INSERT INTO counters VALUES (1, 0)"))
+
+    writer = engine.connect()
+    writer.execute(text("UPDATE counters SET value = 1 WHERE id = 1"))
+    # With the writer's transaction open, a reader sees the last committed value instead of an error.
+    with engine.connect() as reader:
+        assert reader.execute(text("SELECT value FROM counters")).scalar() == 0
+
+    # A second writer waits on busy_timeout rather than failing with "database is locked".
+    errors: list[Exception] = []
+
+    def second_writer():
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("UPDATE counters SET value = value + 10 WHERE id = 1"))
+        except Exception as exc:  # pragma: no cover - failure path
+            errors.append(exc)
+
+    thread = threading.Thread(target=second_writer)
+    thread.start()
+    writer.commit()
+    writer.close()
+    thread.join()
+    assert not errors
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT value FROM counters")).scalar() == 11
+    engine.dispose()
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    sync_engine = build_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        db.add(GiftTrackerEntry(employee_name="Replica Only", week_number=1, season_year=2040, tuesday=5))
+        db.commit()
+    async_engine = build_async_engine(url)
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=sync_engine))
+    monkeypatch.setattr(
+        database, "AsyncReadSessionLocal", async_sessionmaker(bind=async_engine, expire_on_commit=False)
+    )
+    yield async_engine
+    database.replica_health.reset()
+    sync_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_read_from_replica_and_fall_back(
+    client, replica, tmp_path, monkeypatch, register_and_login
+):
+    token = (await register_and_login("replica@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    resp = await client.post(
+        "/gift-tracker",
+        json={"week_number": 1, "season_year": 2040, "entries": [{"employee_name": "Primary Row", "tuesday": 7}]},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+
+    resp = await client.get("/gift-tracker", params={"season_year": 2040}, headers=headers)
+    assert [row["employee_name"] for row in resp.json()] == ["Replica Only"]
+    # The summary never writes, so it is served by the replica like any other read.
+    resp = await client.get("/payouts/summary", params={"season_year": 2040}, headers=headers)
+    assert resp.status_code == 200
+    assert "Replica Only" in resp.text
+
+    broken = build_async_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", async_sessionmaker(bind=broken))
+    resp = await client.get("/gift-tracker", params={"season_year": 2040}, headers=headers)
+    assert [row["employee_name"] for row in resp.json()] == ["Primary Row"]
+    assert not database.replica_health.available()
+
+    # During the cooldown the replica is not retried even once it is reachable again.
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", async_sessionmaker(bind=replica))
+    resp = await client.get("/gift-tracker", params={"season_year": 2040}, headers=headers)
+    assert [row["employee_name"] for row in resp.json()] == ["Primary Row"]
+    await broken.dispose()
+    await replica.dispose()
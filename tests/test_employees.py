@@ -1,21 +1,10 @@
 import pytest
 
-from app.models import UserRole
-
-
-async def register_and_login(client, role=UserRole.MANAGER, email="manager@example.com"):
-    await client.post(
-        "/auth/register",
-        json={"email": email, "password": "secret123", "full_name": "Manager One", "role": role},
-    )
-    resp = await client.post("/auth/login", json={"email": email, "password": "secret123"})
-    data = resp.json()
-    return data["access_token"]
 
 
 @pytest.mark.asyncio
-async def test_employee_crud_flow(client):
-    token = await register_and_login(client)
+async def test_employee_crud_flow(client, register_and_login):
+    token = (await register_and_login("manager@example.com"))["access_token"]
     headers = {"Authorization": f"Bearer {token}"}
 
     create_resp = await client.post(
@@ -0,0 +1,245 @@
+import asyncio
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app.models import Employee, EmployeeRole, ImportJob, ImportJobStatus, User
+from app.services import import_jobs
+from app.services.import_jobs import runner
+
+
+async def upload(client, headers, content: bytes):
+    return await client.post("/imports/servers", files={"file": ("servers.csv", content, "text/csv")}, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_import_servers_upserts_in_bulk_and_reports_bad_rows(
+    client, TestingSessionLocal, register_and_login, query_count
+):
+    token = (await register_and_login("import-servers@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    with TestingSessionLocal() as db:
+        db.add(
+            Employee(
+                first_name="Existing",
+                last_name="Importer",
+                role=EmployeeRole.SERVER,
+                employment_start_date=date(2020, 1, 1),
+            )
+        )
+        db.commit()
+
+    rows = "\n".join(f"Bulk Server{i},{i % 10},,{i}," for i in range(1500))
+    csv_content = (
+        "Name,Upsell,Pitty,Employment_Days,Max_Guests,Nickname\n"
+        f"{rows}\n"
+        "Existing Importer,9,2,,12,Exy\n"
+        ",5,,,,\n"
+        "Broken Row,lots,,,,\n"
+        "Bulk Server3,,7,,,Three\n"
+    )
+    resp = await upload(client, headers, csv_content.encode())
+    assert resp.status_code == 201
+    body = resp.json()
+    assert body["created"] == 1500
+    assert body["updated"] == 2
+    assert body["errors"] == [
+        {"row": 1503, "name": None, "error": "name is required"},
+        {"row": 1504, "name": "Broken Row", "error": "upsell_score must be a number, got 'lots'"},
+    ]
+    # Auth + prefetch + a bulk insert and a bulk upsert per batch, however many rows.
+    assert query_count(resp) <= 8
+
+    with TestingSessionLocal() as db:
+        existing = db.query(Employee).filter_by(first_name="Existing", last_name="Importer").one()
+        assert (existing.upsell_score, existing.pitty_score, existing.max_section_load) == (9, 2, 12)
+        assert existing.nickname == "Exy"
+        assert existing.employment_start_date == date(2020, 1, 1)
+        three = db.query(Employee).filter_by(first_name="Bulk", last_name="Server3").all()
+        assert len(three) == 1
+        assert (three[0].upsell_score, three[0].pitty_score, three[0].nickname) == (3, 7, "Three")
+        assert three[0].employment_days == 3
+
+    resp = await upload(client, headers, b"Name,Upsell\nBulk Server3,8\n")
+    assert resp.json() == {"created": 0, "updated": 1, "errors": []}
+    with TestingSessionLocal() as db:
+        three = db.query(Employee).filter_by(first_name="Bulk", last_name="Server3").one()
+        assert (three.upsell_score, three.pitty_score) == (8, 7)
+
+
+@pytest.mark.asyncio
+async def test_import_servers_latin1_and_missing_name_column(client, TestingSessionLocal, register_and_login):
+    token = (await register_and_login("import-latin1@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = await upload(client, headers, "name,upsell\nJosé Latin,4\n".encode("latin-1"))
+    assert resp.json() == {"created": 1, "updated": 0, "errors": []}
+    with TestingSessionLocal() as db:
+        assert db.query(Employee).filter_by(first_name="José", last_name="Latin").one().upsell_score == 4
+
+    resp = await upload(client, headers, b"first,last\nNo,Name\n")
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "CSV must include a 'name' column."
+
+
+async def wait_for_job(client, headers, job_id):
+    for _ in range(200):
+        resp = await client.get(f"/imports/jobs/{job_id}", headers=headers)
+        if resp.json()["status"] in {"SUCCEEDED", "FAILED"}:
+            return resp.json()
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"import job {job_id} did not finish")
+
+
+@pytest.mark.asyncio
+async def test_background_import_jobs(client, TestingSessionLocal, register_and_login):
+    token = (await register_and_login("import-jobs@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    rows = "\n".join(f"Job Server{i},{i % 10}" for i in range(1200))
+    resp = await client.post(
+        "/imports/jobs/servers",
+        files={"file": ("servers.csv", f"name,upsell\n{rows}\nBad Row,x\n".encode(), "text/csv")},
+        headers=headers,
+    )
+    assert resp.status_code == 202
+    assert resp.json()["status"] in {"QUEUED", "RUNNING", "SUCCEEDED"}
+    job = await wait_for_job(client, headers, resp.json()["id"])
+    assert job["status"] == "SUCCEEDED"
+    assert job["rows_processed"] == 1201
+    assert job["result"]["created"] == 1200
+    assert job["result"]["errors"] == [
+        {"row": 1202, "name": "Bad Row", "error": "upsell_score must be a number, got 'x'"}
+    ]
+    with TestingSessionLocal() as db:
+        assert db.query(Employee).filter(Employee.first_name == "Job").count() == 1200
+
+    resp = await client.post(
+        "/imports/jobs/daily-roster?date=2026-03-01&store_id=4",
+        files={"file": ("roster.csv", b"name,in_time\nJob Server1,16:00\nJob Server2,\n", "text/csv")},
+        headers=headers,
+    )
+    job = await wait_for_job(client, headers, resp.json()["id"])
+    assert job["result"] == {"date": "2026-03-01", "store_id": 4, "count": 2}
+
+    resp = await client.post(
+        "/imports/jobs/servers", files={"file": ("bad.csv", b"first,last\nA,B\n", "text/csv")}, headers=headers
+    )
+    job = await wait_for_job(client, headers, resp.json()["id"])
+    assert job["status"] == "FAILED"
+    assert job["error"] == "CSV must include a 'name' column."
+
+    assert (await client.get("/imports/jobs/999999", headers=headers)).status_code == 404
+
+
+def test_import_jobs_clean_up_spools(TestingSessionLocal, test_engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    with TestingSessionLocal() as db:
+        # The job row cannot be written (no creator), so the spooled upload is removed before the error surfaces.
+        with pytest.raises(IntegrityError):
+            runner.submit(db, "servers", io.BytesIO(b"name\nSpool Leak\n"), {}, None)
+        db.rollback()
+        assert list(tmp_path.iterdir()) == []
+
+    # A job that cannot even be loaded still has its spool removed.
+    orphan = tmp_path / "orphan.csv"
+    orphan.write_bytes(b"name\nNo Job\n")
+    runner.run(test_engine, 999999, str(orphan))
+    assert not orphan.exists()
+
+
+def test_startup_fails_only_abandoned_import_jobs(TestingSessionLocal, test_engine):
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    host = socket.gethostname()
+    now = datetime.utcnow()
+    owners = {
+        "dead pid on this host": (f"{host}:{finished.pid}", now),
+        "previous run of this process": (runner.owner, now),
+        "live sibling worker": (f"{host}:{os.getppid()}", now),
+        "other host, fresh heartbeat": ("other-host:1", now),
+        "other host, lease expired": ("other-host:2", now - timedelta(hours=1)),
+    }
+    with TestingSessionLocal() as db:
+        user = User(email="import-recovery@example.com", password_hash="x", full_name="Import Recovery")
+        db.add(user)
+        db.commit()
+        jobs = {
+            name: ImportJob(
+                kind="servers",
+                status=ImportJobStatus.RUNNING,
+                owner=owner,
+                heartbeat_at=heartbeat_at,
+                created_by_user_id=user.id,
+            )
+            for name, (owner, heartbeat_at) in owners.items()
+        }
+        jobs["done"] = ImportJob(kind="servers", status=ImportJobStatus.SUCCEEDED, created_by_user_id=user.id)
+        db.add_all(jobs.values())
+        db.commit()
+
+        assert runner.fail_abandoned(test_engine) == 3
+        statuses = {name: db.get(ImportJob, job.id, populate_existing=True).status for name, job in jobs.items()}
+        assert statuses == {
+            "dead pid on this host": ImportJobStatus.FAILED,
+            "previous run of this process": ImportJobStatus.FAILED,
+            "live sibling worker": ImportJobStatus.RUNNING,
+            "other host, fresh heartbeat": ImportJobStatus.RUNNING,
+            "other host, lease expired": ImportJobStatus.FAILED,
+            "done": ImportJobStatus.SUCCEEDED,
+        }
+        assert jobs["dead pid on this host"].error.startswith("Interrupted by a server restart")
+
+        # With nothing abandoned, startup costs one SELECT and no write.
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(test_engine, "before_cursor_execute", listener)
+        try:
+            assert runner.fail_abandoned(test_engine) == 0
+        finally:
+            event.remove(test_engine, "before_cursor_execute", listener)
+        assert len(statements) == 1 and statements[0].lstrip().startswith("SELECT")
+
+        for job in jobs.values():
+            db.delete(job)
+        db.commit()
+
+
+def test_import_job_failed_elsewhere_keeps_its_rows_out(TestingSessionLocal, test_engine, tmp_path, monkeypatch):
+    with TestingSessionLocal() as db:
+        user = User(email="import-fenced@example.com", password_hash="x", full_name="Import Fenced")
+        db.add(user)
+        db.commit()
+        job = ImportJob(kind="servers", status=ImportJobStatus.QUEUED, owner=runner.owner, created_by_user_id=user.id)
+        db.add(job)
+        db.commit()
+        job_id = job.id
+
+    def failed_by_sibling(db, stream, params, on_progress):
+        # Another worker decides the lease ran out while this import is still reading its file.
+        with TestingSessionLocal() as other:
+            other.get(ImportJob, job_id).status = ImportJobStatus.FAILED
+            other.commit()
+        db.add(
+            Employee(first_name="Fenced", last_name="Out", role=EmployeeRole.SERVER, employment_start_date=date.today())
+        )
+        db.flush()
+        return {"created": 1}
+
+    monkeypatch.setitem(import_jobs.IMPORTERS, "servers", failed_by_sibling)
+    spool = tmp_path / "fenced.csv"
+    spool.write_bytes(b"name\nFenced Out\n")
+    runner.run(test_engine, job_id, str(spool))
+
+    with TestingSessionLocal() as db:
+        assert db.get(ImportJob, job_id).status == ImportJobStatus.FAILED
+        assert db.query(Employee).filter_by(first_name="Fenced").count() == 0
+    assert not spool.exists()
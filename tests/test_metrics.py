@@ -0,0 +1,56 @@
+import re
+
+import pytest
+
+from app.config import settings
+from app.core.query_stats import QueryBudgetExceeded
+
+
+def sample(body: str, name: str, **labels) -> float:
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    pattern = "^" + re.escape(f"{name}{{{label_text}}}" if labels else name) + r" (\S+)$"
+    match = re.search(pattern, body, re.MULTILINE)
+    assert match, f"{name} {labels} missing"
+    return float(match.group(1))
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_route_latency_errors_and_pools(client, monkeypatch):
+    before = (await client.get("/metrics")).text
+    before_slow = sample(before, "db_slow_queries_total")
+
+    await client.get("/health")
+    await client.get("/health")
+    assert (await client.get("/team-sheets/123")).status_code == 401
+    await client.get("/no-such-route")
+    monkeypatch.setattr(settings, "slow_query_ms", 0)
+    monkeypatch.setattr(settings, "query_budget", 0)
+    with pytest.raises(QueryBudgetExceeded):
+        await client.post("/auth/login", json={"email": "nobody@example.com", "password": "wrong-password"})
+    monkeypatch.setattr(settings, "query_budget", 25)
+
+    resp = await client.get("/metrics")
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+
+    health = sample(body, "http_requests_total", method="GET", route="/health", status=200)
+    assert health >= 2
+    # Labelled by route template, not the requested path.
+    assert sample(body, "http_requests_total", method="GET", route="/team-sheets/{team_sheet_id}", status=401) >= 1
+    assert 'route="/team-sheets/123"' not in body
+    assert sample(body, "http_requests_total", method="GET", route="unmatched", status=404) >= 1
+
+    buckets = [
+        float(value)
+        for value in re.findall(
+            r'^http_request_duration_seconds_bucket\{method="GET",route="/health",le="[^"]+"\} (\S+)$',
+            body,
+            re.MULTILINE,
+        )
+    ]
+    assert buckets == sorted(buckets)
+    assert buckets[-1] == sample(body, "http_request_duration_seconds_count", method="GET", route="/health")
+
+    assert sample(body, "db_slow_queries_total") > before_slow
+    assert sample(body, "db_pool_checked_out", pool="primary") >= 0
+    assert sample(body, "http_request_errors_total", method="POST", route="/auth/login") >= 1
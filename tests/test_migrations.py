@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import event, inspect, text
+
+from app.config import settings
+from app.database import (
+    ALEMBIC_INI,
+    SCHEMA_REVISION,
+    Base,
+    build_engine,
+    check_schema_version,
+    schema_revision,
+    upgrade_schema,
+)
+
+
+def test_schema_revision_matches_migration_head():
+    assert ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_current_head() == SCHEMA_REVISION
+
+
+def test_migrations_build_the_model_schema(tmp_path):
+    url = f"sqlite:///{tmp_path / 'fresh.db'}"
+    upgrade_schema(url)
+    engine = build_engine(url)
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    check_schema_version(engine)
+    assert statements == ["SELECT version_num FROM alembic_version"]
+    engine.dispose()
+
+
+def test_baseline_adopts_pre_migration_database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = build_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE sections DROP COLUMN tags"))
+        conn.execute(text("ALTER TABLE sections DROP COLUMN expected_out_time"))
+        conn.execute(text("DROP TABLE payout_summary_seasons"))
+        conn.execute(text("INSERT INTO sections (name, label, type, is_active) VALUES ('Legacy', 'L', 'FLOOR', 1)"))
+
+    upgrade_schema(url)
+    assert schema_revision(engine) == SCHEMA_REVISION
+    inspector = inspect(engine)
+    assert {"tags", "expected_out_time"} <= {column["name"] for column in inspector.get_columns("sections")}
+    assert "payout_summary_seasons" in inspector.get_table_names()
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT name FROM sections")).scalars().all() == ["Legacy"]
+    engine.dispose()
+
+
+def test_startup_refuses_unmigrated_database(tmp_path, monkeypatch):
+    engine = build_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        check_schema_version(engine)
+
+    monkeypatch.setattr(settings, "migrate_on_startup", True)
+    check_schema_version(engine)
+    assert schema_revision(engine) == SCHEMA_REVISION
+    engine.dispose()
+
+
+def test_importing_the_app_does_not_touch_the_database(tmp_path):
+    # A URL that cannot be opened: any connection attempt during import would raise.
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'missing' / 'app.db'}"}
+    result = subprocess.run([sys.executable, "-c", "import app.main"], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
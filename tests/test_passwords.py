@@ -0,0 +1,38 @@
+import pytest
+from passlib.hash import pbkdf2_sha256
+
+from app.config import settings
+from app.core import passwords
+from app.models import User
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password_hash(client, TestingSessionLocal):
+    email = "rehash@example.com"
+    await client.post("/auth/register", json={"email": email, "password": "secret123", "full_name": "Rehash User"})
+    with TestingSessionLocal() as db:
+        user = db.query(User).filter(User.email == email).one()
+        assert user.password_hash.startswith(f"$pbkdf2-sha256${settings.password_hash_rounds}$")
+        user.password_hash = pbkdf2_sha256.using(rounds=1000).hash("secret123")
+        db.commit()
+
+    resp = await client.post("/auth/login", json={"email": email, "password": "secret123"})
+    assert resp.status_code == 200
+    with TestingSessionLocal() as db:
+        rehashed = db.query(User).filter(User.email == email).one().password_hash
+    assert rehashed.startswith(f"$pbkdf2-sha256${settings.password_hash_rounds}$")
+    assert passwords.verify_and_update("secret123", rehashed) == (True, None)
+
+    resp = await client.post("/auth/login", json={"email": email, "password": "wrong-password"})
+    assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_hashing_runs_in_process_pool_or_thread_executor(monkeypatch):
+    hashed = await passwords.hash_password_async("secret123")
+    assert isinstance(passwords.get_pool(), passwords.ProcessPoolExecutor)
+    assert await passwords.verify_and_update_async("secret123", hashed) == (True, None)
+
+    monkeypatch.setattr(settings, "password_hash_workers", 0)
+    assert passwords.get_pool() is None
+    assert (await passwords.verify_and_update_async("wrong", hashed))[0] is False
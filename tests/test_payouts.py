@@ -0,0 +1,220 @@
+import pytest
+from sqlalchemy import event
+
+from app.models import GiftTrackerEntry, PayoutRule, PayoutTier, PayoutType
+from app.services import payouts as payout_service
+from app.services.payout_rules import PayoutEngine
+
+
+def gift_row(name, tuesday=0, saturday=0):
+    return {"employee_name": name, "tuesday": tuesday, "saturday": saturday}
+
+
+@pytest.mark.asyncio
+async def test_materialized_summary_tracks_writes(client, TestingSessionLocal, register_and_login):
+    token = (await register_and_login("payouts@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    season = 2031
+
+    await client.post(
+        "/payouts/tiers",
+        json={"label": "Base", "season_year": season, "min_amount_cents": 0, "max_amount_cents": 9999, "payout_value": 500},
+        headers=headers,
+    )
+    await client.post(
+        "/payouts/rules",
+        json={"name": "Top", "type": "season_top_seller", "season_year": season, "config": {"first_pct": 10}},
+        headers=headers,
+    )
+    await client.post(
+        "/gift-tracker",
+        json={"week_number": 1, "season_year": season, "entries": [gift_row("Amy Gift", 20), gift_row("Bo Gift", 50)]},
+        headers=headers,
+    )
+
+    # The first write built the season; every later write is folded in incrementally.
+    first = await client.get("/payouts/summary", params={"season_year": season}, headers=headers)
+    assert first.status_code == 200, first.text
+    assert {row["employee_name"]: row["sales_total_cents"] for row in first.json()["rows"]} == {
+        "Amy Gift": 2000,
+        "Bo Gift": 5000,
+    }
+
+    seller = await client.post(
+        "/employees",
+        json={"first_name": "Cy", "last_name": "Seller", "role": "SERVER", "employment_start_date": "2023-01-01"},
+        headers=headers,
+    )
+    await client.post(
+        "/cobrands",
+        json={"company_name": "Acme", "amount_usd": "75.50", "season_year": season, "seller_id": seller.json()["id"]},
+        headers=headers,
+    )
+    await client.post(
+        "/gift-tracker",
+        json={"week_number": 1, "season_year": season, "entries": [gift_row("Amy Gift", 20, 90)]},
+        headers=headers,
+    )
+    await client.post(
+        "/payouts/tiers",
+        json={"label": "High", "season_year": season, "min_amount_cents": 10000, "payout_value": 1500},
+        headers=headers,
+    )
+    await client.post(
+        "/payouts/adjustments",
+        json={"employee_name": "Amy Gift", "label": "Bonus", "season_year": season, "amount_cents": 250},
+        headers=headers,
+    )
+    prize = await client.post(
+        "/payouts/prizes", json={"name": "Gift card", "season_year": season, "cost_cents": 1000}, headers=headers
+    )
+    await client.post(
+        "/payouts/prizes/assign",
+        json={"employee_name": "Cy Seller", "prize_id": prize.json()["id"], "season_year": season},
+        headers=headers,
+    )
+
+    resp = await client.get("/payouts/summary", params={"season_year": season}, headers=headers)
+    rows = {row["employee_name"]: row for row in resp.json()["rows"]}
+    assert set(rows) == {"Amy Gift", "Cy Seller"}
+    assert rows["Amy Gift"]["sales_total_cents"] == 11000
+    assert rows["Amy Gift"]["tier_payout_cents"] == 1500
+    assert rows["Amy Gift"]["rule_payout_cents"] == 1100
+    assert rows["Amy Gift"]["total_payout_cents"] == 1500 + 1100 + 250
+    assert rows["Cy Seller"]["prize_value_cents"] == 1000
+    assert rows["Cy Seller"]["prizes"][0]["name"] == "Gift card"
+
+    db = TestingSessionLocal()
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    try:
+        assert payout_service.verify_season(db, season) == []
+        # A built season is served by one query: the season marker, its rows and their prizes together.
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        assert payout_service.payout_summary(db, season).model_dump(mode="json") == resp.json()
+        assert len(statements) == 1
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+        db.close()
+
+    # Renaming a seller moves their cobrand sales to the new name.
+    await client.put(f"/employees/{seller.json()['id']}", json={"last_name": "Renamed"}, headers=headers)
+    db = TestingSessionLocal()
+    try:
+        stored = {row.employee_name: row for row in payout_service.read_summary(db, season).rows}
+        payout_service.rebuild_season(db, season)
+        db.flush()
+        assert {row.employee_name: row for row in payout_service.read_summary(db, season).rows} == stored
+        assert "Cy Renamed" in stored
+        assert payout_service.verify_season(db, season) == []
+        db.rollback()
+    finally:
+        db.close()
+
+
+@pytest.mark.asyncio
+async def test_summary_read_does_not_materialize(client, TestingSessionLocal, register_and_login):
+    token = (await register_and_login("payouts-read-only@example.com"))["access_token"]
+    season = 2033
+    db = TestingSessionLocal()
+    try:
+        db.add(GiftTrackerEntry(employee_name="Di Direct", week_number=1, season_year=season, tuesday=30))
+        db.commit()
+    finally:
+        db.close()
+
+    resp = await client.get(
+        "/payouts/summary", params={"season_year": season}, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert [(row["employee_name"], row["sales_total_cents"]) for row in resp.json()["rows"]] == [("Di Direct", 3000)]
+    db = TestingSessionLocal()
+    try:
+        assert not payout_service.is_materialized(db, season)
+    finally:
+        db.close()
+
+
+def test_concurrent_first_builds_of_a_season(TestingSessionLocal, test_engine):
+    season = 2034
+    with TestingSessionLocal() as db:
+        db.add(GiftTrackerEntry(employee_name="Ed Early", week_number=1, season_year=season, tuesday=10))
+        db.commit()
+
+    raced = []
+
+    def other_worker_builds_first(conn, cursor, statement, *args):
+        # Another worker builds the season between this one starting its build and marking it built.
+        if not raced and statement.startswith("INSERT INTO payout_summary_seasons"):
+            raced.append(statement)
+            with TestingSessionLocal() as other:
+                payout_service.rebuild_season(other, season)
+                other.commit()
+
+    event.listen(test_engine, "before_cursor_execute", other_worker_builds_first)
+    try:
+        with TestingSessionLocal() as db:
+            payout_service.rebuild_season(db, season)
+            db.commit()
+    finally:
+        event.remove(test_engine, "before_cursor_execute", other_worker_builds_first)
+    assert raced
+
+    with TestingSessionLocal() as db:
+        assert payout_service.verify_season(db, season) == []
+        assert [row.employee_name for row in payout_service.read_summary(db, season).rows] == ["Ed Early"]
+
+
+def test_payout_engine_tiers_and_rule_plugins():
+    tiers = [
+        PayoutTier(min_amount_cents=0, max_amount_cents=999, payout_type=PayoutType.FIXED, payout_value=100),
+        PayoutTier(min_amount_cents=500, max_amount_cents=None, payout_type=PayoutType.PERCENT, payout_value=250),
+    ]
+    rules = [
+        PayoutRule(type="season_top_seller", config='{"first_pct": 10, "second_pct": 5}'),
+        PayoutRule(type="top_n", config='{"percentages": [1, 1, 1]}'),
+        PayoutRule(type="unknown", config=None),
+    ]
+    engine = PayoutEngine(tiers, rules)
+
+    # Overlapping tiers resolve to the first match by min_amount_cents, as the linear scan did.
+    assert engine.tier_payout(-1) == 0
+    assert engine.tier_payout(700) == 100
+    assert engine.tier_payout(2000) == 5000
+
+    bonuses = engine.rule_payouts({"A": 1000, "B": 3000, "C": 2000})
+    assert bonuses == {"B": 300 + 30, "C": 100 + 20, "A": 10}
+
+
+@pytest.mark.asyncio
+async def test_simulate_scenarios_side_by_side(client, register_and_login):
+    token = (await register_and_login("simulate@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    season = 2032
+
+    await client.post(
+        "/gift-tracker",
+        json={"week_number": 2, "season_year": season, "entries": [gift_row("Sim One", 100), gift_row("Sim Two", 40)]},
+        headers=headers,
+    )
+    payload = {
+        "season_year": season,
+        "scenarios": [
+            {"name": "flat", "tiers": [{"label": "All", "min_amount_cents": 0, "payout_value": 1000}]},
+            {
+                "name": "top heavy",
+                "tiers": [{"label": "Big", "min_amount_cents": 5000, "payout_value": 2500}],
+                "rules": [{"name": "Top", "type": "season_top_seller", "config": {"first_pct": 10, "second_pct": 0}}],
+            },
+        ],
+    }
+    resp = await client.post("/payouts/simulate", json=payload, headers=headers)
+    assert resp.status_code == 200, resp.text
+    flat, top_heavy = resp.json()["scenarios"]
+    assert flat["name"] == "flat"
+    assert flat["total_payout_cents"] == 2000
+    assert top_heavy["tier_payout_cents"] == 2500
+    assert top_heavy["rule_payout_cents"] == 1000
+    assert top_heavy["total_payout_cents"] == 3500
+
+    tiers = await client.get("/payouts/tiers", params={"season_year": season}, headers=headers)
+    assert tiers.json() == []
@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.models import UserRole
+
+
+@pytest.mark.asyncio
+async def test_pyos_request_lifecycle(client, register_and_login):
+    manager_token = (await register_and_login("pyos-manager@example.com"))["access_token"]
+    manager = {"Authorization": f"Bearer {manager_token}"}
+    emp_resp = await client.post(
+        "/employees",
+        json={"first_name": "Sam", "last_name": "Pyos", "role": "SERVER", "employment_start_date": "2023-01-01"},
+        headers=manager,
+    )
+    employee_id = emp_resp.json()["id"]
+    server_login = await register_and_login("sam.pyos@example.com", role=UserRole.SERVER, full_name="Sam Pyos")
+    server_token = server_login["access_token"]
+    server = {"Authorization": f"Bearer {server_token}"}
+    section_ids = []
+    for label in ("Y1", "Y2"):
+        section_resp = await client.post(
+            "/sections",
+            json={"name": f"Pyos {label}", "label": label, "type": "FLOOR", "max_guests": 10, "is_active": True},
+            headers=manager,
+        )
+        section_ids.append(section_resp.json()["id"])
+
+    no_credit = await client.get("/pyos/credits/me", headers=server)
+    assert no_credit.status_code == 200
+    assert no_credit.json()["balance"] == 0
+
+    granted = await client.post("/pyos/credits/grant", json={"employee_id": employee_id, "delta": 2}, headers=manager)
+    assert granted.json()["balance"] == 2
+
+    day = (date.today() + timedelta(days=7)).isoformat()
+    first = await client.post(
+        "/pyos/requests", json={"section_id": section_ids[0], "date": day, "shift": "AM"}, headers=server
+    )
+    assert first.status_code == 201, first.text
+    assert first.json()["employee_name"] == "Sam Pyos"
+    assert first.json()["section_label"] == "Y1"
+    taken = await client.post(
+        "/pyos/requests", json={"section_id": section_ids[0], "date": day, "shift": "AM"}, headers=server
+    )
+    assert taken.status_code == 400
+    second = await client.post(
+        "/pyos/requests", json={"section_id": section_ids[1], "date": day, "shift": "AM"}, headers=server
+    )
+
+    approved = await client.post(f"/pyos/requests/{first.json()['id']}/approve", json={}, headers=manager)
+    assert approved.json()["status"] == "APPROVED"
+    denied = await client.post(
+        f"/pyos/requests/{second.json()['id']}/deny", json={"notes": "Short staffed"}, headers=manager
+    )
+    assert denied.json()["status"] == "DENIED"
+    occupied = await client.get("/pyos/occupied", params={"date": day, "shift": "AM"}, headers=manager)
+    assert occupied.json() == [section_ids[0]]
+
+    mine = await client.get("/pyos/requests", headers=server)
+    assert {(row["section_label"], row["status"]) for row in mine.json()} == {("Y1", "APPROVED"), ("Y2", "DENIED")}
+    credit = await client.get("/pyos/credits/me", headers=server)
+    assert credit.json()["balance"] == 1
+
+    revoked = await client.post(f"/pyos/requests/{first.json()['id']}/revoke", json={}, headers=manager)
+    assert revoked.json()["status"] == "REVOKED"
+    audit = await client.get("/pyos/audit", params={"employee_id": employee_id}, headers=manager)
+    assert {row["action"] for row in audit.json()} == {"grant", "use", "approve", "deny", "revoke"}
+
+
+@pytest.mark.asyncio
+async def test_pos_order_close_records_stock(client, register_and_login):
+    manager_token = (await register_and_login("pos-manager@example.com"))["access_token"]
+    manager = {"Authorization": f"Bearer {manager_token}"}
+    category = await client.post("/pos/menu-categories", json={"name": "Async Mains"}, headers=manager)
+    item = await client.post(
+        "/pos/menu-items",
+        json={"name": "Async Burger", "category_id": category.json()["id"], "price_cents": 1500},
+        headers=manager,
+    )
+    menu_item_id = item.json()["id"]
+    ingredient = await client.post("/inventory/ingredients", json={"name": "Async Bun"}, headers=manager)
+    await client.post(
+        "/inventory/recipes",
+        json={"menu_item_id": menu_item_id, "ingredient_id": ingredient.json()["id"], "quantity": 1},
+        headers=manager,
+    )
+
+    order = await client.post("/pos/orders", json={"table_label": "A1"}, headers=manager)
+    assert order.status_code == 201, order.text
+    assert order.json()["items"] == []
+    order_id = order.json()["id"]
+    line = await client.post(
+        f"/pos/orders/{order_id}/items",
+        json={"menu_item_id": menu_item_id, "quantity": 2, "price_cents": 0},
+        headers=manager,
+    )
+    assert line.json()["price_cents"] == 1500
+
+    closed = await client.post(
+        f"/pos/orders/{order_id}/close", json={"payment": {"amount_cents": 3000}}, headers=manager
+    )
+    assert closed.status_code == 200, closed.text
+    assert closed.json()["status"] == "CLOSED"
+    assert len(closed.json()["items"]) == 1
+    again = await client.post(f"/pos/orders/{order_id}/close", json={"payment": {"amount_cents": 0}}, headers=manager)
+    assert again.status_code == 400
+
+    levels = await client.get("/inventory/stock-levels", headers=manager)
+    assert {row["ingredient_id"]: row["quantity_on_hand"] for row in levels.json()}[ingredient.json()["id"]] == -2
+    orders = await client.get("/pos/orders", params={"status_filter": "CLOSED"}, headers=manager)
+    assert order_id in [row["id"] for row in orders.json()]
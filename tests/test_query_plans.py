@@ -0,0 +1,151 @@
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, select
+
+from app.database import build_engine, upgrade_schema
+from app.models import (
+    OutworkAssignment,
+    OutworkTask,
+    PyosAudit,
+    PyosRequest,
+    PyosShift,
+    PyosStatus,
+    Shift,
+    ShiftPeriod,
+    SideworkAssignment,
+    SideworkTask,
+    StockMovement,
+    TeamSheet,
+    TeamSheetAssignment,
+    TeamSheetStatus,
+)
+
+# Rows per hot table. The default keeps the suite fast; QUERY_PLAN_ROWS=1000000 runs the full-size check.
+ROWS = int(os.environ.get("QUERY_PLAN_ROWS", "20000"))
+SECTIONS = 100
+START = date(2020, 1, 1)
+NOW = datetime(2024, 1, 1)
+
+
+def batched(rows, size=10_000):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@pytest.fixture(scope="module")
+def seeded_engine(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    upgrade_schema(url)
+    engine = build_engine(url)
+    stamps = {"created_at": NOW, "updated_at": NOW}
+    days = max(ROWS // (SECTIONS * 2), 1)
+    tables = {
+        PyosRequest: (
+            {
+                "employee_id": n % 500 + 1,
+                "section_id": n % SECTIONS + 1,
+                "date": START + timedelta(days=n // (SECTIONS * 2) % days),
+                "shift": PyosShift.AM if n // SECTIONS % 2 else PyosShift.PM,
+                "status": list(PyosStatus)[n % 4],
+                "created_by_user_id": 1,
+                **stamps,
+            }
+            for n in range(ROWS)
+        ),
+        Shift: (
+            {
+                "date": START + timedelta(days=n // 2),
+                "time_period": ShiftPeriod.LUNCH if n % 2 else ShiftPeriod.DINNER,
+                "created_by_user_id": 1,
+                **stamps,
+            }
+            for n in range(ROWS)
+        ),
+        TeamSheet: (
+            {"shift_id": n + 1, "title": "Sheet", "status": TeamSheetStatus.DRAFT, "created_by_user_id": 1, **stamps}
+            for n in range(ROWS)
+        ),
+        TeamSheetAssignment: (
+            {"team_sheet_id": n // 4 + 1, "employee_id": n % 500 + 1, "section_id": n % SECTIONS + 1}
+            for n in range(ROWS)
+        ),
+        SideworkTask: ({"team_sheet_id": n + 1, "label": "Ice"} for n in range(ROWS // 4)),
+        SideworkAssignment: ({"task_id": n + 1, "employee_id": n % 500 + 1} for n in range(ROWS // 4)),
+        OutworkTask: ({"team_sheet_id": n + 1, "label": "Sweep"} for n in range(ROWS // 4)),
+        OutworkAssignment: ({"task_id": n + 1, "employee_id": n % 500 + 1} for n in range(ROWS // 4)),
+        PyosAudit: (
+            {"actor_user_id": 1, "employee_id": n % 500 + 1, "action": "GRANT", "delta": 1, **stamps}
+            for n in range(ROWS)
+        ),
+        StockMovement: (
+            {"ingredient_id": n % 200 + 1, "quantity_change": -1, "reason": "SALE", **stamps} for n in range(ROWS)
+        ),
+    }
+    with engine.begin() as conn:
+        for model, rows in tables.items():
+            for batch in batched(rows):
+                conn.execute(insert(model), batch)
+        # Give the planner real statistics, as a long-running production database would have.
+        conn.exec_driver_sql("ANALYZE")
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, statement) -> str:
+    """EXPLAIN the SQL SQLAlchemy actually emits for statement, with IN lists expanded and values bound."""
+    emitted = []
+
+    def capture(conn, cursor, sql, params, context, executemany):
+        emitted.append((sql, params))
+
+    with engine.connect() as conn:
+        event.listen(conn, "before_cursor_execute", capture)
+        conn.execute(statement).all()
+        event.remove(conn, "before_cursor_execute", capture)
+        sql, params = emitted[0]
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+HOT_QUERIES = {
+    # pyos list_occupied_sections
+    "ix_pyos_requests_date_shift_status": select(PyosRequest.section_id).where(
+        PyosRequest.date == START,
+        PyosRequest.shift == PyosShift.PM,
+        PyosRequest.status.in_([PyosStatus.PENDING, PyosStatus.APPROVED]),
+    ),
+    "ix_shifts_date_time_period": select(Shift.id).where(
+        Shift.date == START, Shift.time_period == ShiftPeriod.DINNER
+    ),
+    # The selectinload queries issued by team_sheet_service.sheet_graph_options()
+    "ix_team_sheets_shift_id": select(TeamSheet).where(TeamSheet.shift_id.in_([1, 2, 3])),
+    "ix_team_sheet_assignments_team_sheet_id": select(TeamSheetAssignment).where(
+        TeamSheetAssignment.team_sheet_id.in_([1, 2, 3])
+    ),
+    "ix_sidework_tasks_team_sheet_id": select(SideworkTask).where(SideworkTask.team_sheet_id.in_([1, 2, 3])),
+    "ix_sidework_assignments_task_id": select(SideworkAssignment).where(SideworkAssignment.task_id.in_([1, 2, 3])),
+    "ix_outwork_tasks_team_sheet_id": select(OutworkTask).where(OutworkTask.team_sheet_id.in_([1, 2, 3])),
+    "ix_outwork_assignments_task_id": select(OutworkAssignment).where(OutworkAssignment.task_id.in_([1, 2, 3])),
+    # inventory stock levels, per ingredient
+    "ix_stock_movements_ingredient_id": select(StockMovement).where(StockMovement.ingredient_id == 7),
+    # pyos audit feed for one employee
+    "ix_pyos_audit_employee_id_created_at": select(PyosAudit)
+    .where(PyosAudit.employee_id == 7)
+    .order_by(PyosAudit.created_at.desc())
+    .limit(200),
+}
+
+
+@pytest.mark.parametrize("index_name", HOT_QUERIES)
+def test_hot_queries_use_their_index(seeded_engine, index_name):
+    plan = query_plan(seeded_engine, HOT_QUERIES[index_name])
+    assert f"INDEX {index_name}" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,67 @@
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.core.query_stats import QueryBudgetExceeded, QueryStatsMiddleware, query_budget
+
+
+@pytest.mark.asyncio
+async def test_server_timing_reports_queries_and_stock_levels_is_not_n_plus_one(
+    client, register_and_login, query_count
+):
+    resp = await client.get("/health")
+    assert resp.headers["server-timing"].startswith("db;dur=")
+    assert query_count(resp) == 0
+
+    token = (await register_and_login("query-stats@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for name in ("Flour", "Sugar", "Salt"):
+        ingredient = await client.post("/inventory/ingredients", json={"name": name, "unit": "kg"}, headers=headers)
+        await client.post(
+            "/inventory/receive",
+            json={"ingredient_id": ingredient.json()["id"], "quantity_change": 4, "reason": "DELIVERY"},
+            headers=headers,
+        )
+
+    resp = await client.get("/inventory/stock-levels", headers=headers)
+    assert resp.status_code == 200
+    assert {row["name"]: row["quantity_on_hand"] for row in resp.json()}["Sugar"] == 4
+    # One aggregate, however many ingredients there are (the user comes from the auth cache).
+    assert query_count(resp) == 1
+
+
+@pytest.mark.asyncio
+async def test_strict_budget_fails_request(client, monkeypatch, register_and_login):
+    token = (await register_and_login("query-budget@example.com"))["access_token"]
+    monkeypatch.setattr(settings, "query_budget", 1)
+    with pytest.raises(QueryBudgetExceeded, match=r"GET /inventory/stock-levels ran 2 queries \(budget 1\)"):
+        await client.get("/inventory/stock-levels", headers={"Authorization": f"Bearer {token}"})
+
+
+@pytest.mark.asyncio
+async def test_route_budget_override(monkeypatch, query_count):
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    def run_queries(n: int):
+        with engine.connect() as conn:
+            for _ in range(n):
+                conn.execute(text("SELECT 1"))
+
+    @app.get("/default")
+    def default_budget():
+        run_queries(3)
+
+    @app.get("/raised", dependencies=[Depends(query_budget(5))])
+    def raised_budget():
+        run_queries(3)
+
+    monkeypatch.setattr(settings, "query_budget", 2)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        assert query_count(await client.get("/raised")) == 3
+        with pytest.raises(QueryBudgetExceeded):
+            await client.get("/default")
+    engine.dispose()
@@ -1,20 +1,15 @@
-import pytest
+from datetime import date
 
-from app.models import UserRole
+import pytest
+from sqlalchemy import event
 
-
-async def register_and_login(client, email="manager2@example.com"):
-    await client.post(
-        "/auth/register",
-        json={"email": email, "password": "secret123", "full_name": "Manager Two", "role": UserRole.MANAGER.value},
-    )
-    resp = await client.post("/auth/login", json={"email": email, "password": "secret123"})
-    return resp.json()["access_token"]
+from app.models import Section
+from app.services import team_sheets as team_sheet_service
 
 
 @pytest.mark.asyncio
-async def test_team_sheet_create_and_export(client):
-    token = await register_and_login(client)
+async def test_team_sheet_create_and_export(client, register_and_login):
+    token = (await register_and_login("manager2@example.com"))["access_token"]
     headers = {"Authorization": f"Bearer {token}"}
 
     # Create supporting data
@@ -72,3 +67,641 @@ async def test_team_sheet_create_and_export(client):
     export_resp = await client.get(f"/team-sheets/{team_sheet_id}/export/csv", headers=headers)
     assert export_resp.status_code == 200
     assert "text/csv" in export_resp.headers["content-type"]
+    lines = export_resp.text.splitlines()
+    assert lines[0] == "Section,Employee,Role,Sidework,Outwork,Notes"
+    assert lines[1] == "F1,Bob Builder,Floor,Salads,Close patio,Busy night"
+
+
+@pytest.mark.asyncio
+async def test_team_sheet_range_export_csv(client, TestingSessionLocal, register_and_login):
+    token = (await register_and_login("exporter@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    emp_resp = await client.post(
+        "/employees",
+        json={"first_name": "Rae", "last_name": "Range", "role": "SERVER", "employment_start_date": "2023-01-01"},
+        headers=headers,
+    )
+    employee_id = emp_resp.json()["id"]
+    section_resp = await client.post(
+        "/sections",
+        json={"name": "Range Bar", "label": "RB", "type": "BAR", "max_guests": 8, "is_active": True},
+        headers=headers,
+    )
+    section_id = section_resp.json()["id"]
+    for day, period in (("2024-07-02", "DINNER"), ("2024-07-01", "LUNCH"), ("2024-07-09", "LUNCH")):
+        shift_resp = await client.post("/shifts", json={"date": day, "time_period": period}, headers=headers)
+        await client.post(
+            "/team-sheets",
+            json={
+                "shift_id": shift_resp.json()["id"],
+                "title": f"{period} {day}",
+                "assignments": [{"employee_id": employee_id, "section_id": section_id, "role_label": "Floor"}],
+                "sidework": [{"label": "Polish", "employee_ids": [employee_id]}],
+            },
+            headers=headers,
+        )
+
+    resp = await client.get(
+        "/team-sheets/export/csv", params={"start_date": "2024-07-01", "end_date": "2024-07-05"}, headers=headers
+    )
+    assert resp.status_code == 200, resp.text
+    lines = resp.text.splitlines()
+    assert lines[0].startswith("Date,Shift,Team Sheet,Section")
+    assert lines[1:] == [
+        "2024-07-01,LUNCH,LUNCH 2024-07-01,RB,Rae Range,Floor,Polish,,",
+        "2024-07-02,DINNER,DINNER 2024-07-02,RB,Rae Range,Floor,Polish,,",
+    ]
+
+    # Small batches walk the same rows via the keyset cursor.
+    db = TestingSessionLocal()
+    try:
+        rows = list(team_sheet_service.iter_range_csv_rows(db, date(2024, 7, 1), date(2024, 7, 31), batch_size=1))
+    finally:
+        db.close()
+    assert [row[0] for row in rows[1:]] == ["2024-07-01", "2024-07-02", "2024-07-09"]
+
+    bad_range = await client.get(
+        "/team-sheets/export/csv", params={"start_date": "2024-07-05", "end_date": "2024-07-01"}, headers=headers
+    )
+    assert bad_range.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_team_sheet_list_summary_pagination(client, register_and_login):
+    token = (await register_and_login("pager@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    created_ids = []
+    for day in ("2024-06-01", "2024-06-02", "2024-06-02"):
+        shift_resp = await client.post("/shifts", json={"date": day, "time_period": "LUNCH"}, headers=headers)
+        team_resp = await client.post(
+            "/team-sheets",
+            json={"shift_id": shift_resp.json()["id"], "title": f"Lunch {day}"},
+            headers=headers,
+        )
+        created_ids.append(team_resp.json()["id"])
+
+    params = {"start_date": "2024-06-01", "end_date": "2024-06-02", "fields": "summary", "limit": 2}
+    first_page = await client.get("/team-sheets", params=params, headers=headers)
+    assert first_page.status_code == 200, first_page.text
+    rows = first_page.json()
+    assert [row["id"] for row in rows] == [created_ids[2], created_ids[1]]
+    assert rows[0]["shift_date"] == "2024-06-02"
+    assert rows[0]["assignment_count"] == 0
+    assert "assignments" not in rows[0]
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = await client.get("/team-sheets", params={**params, "cursor": cursor}, headers=headers)
+    assert [row["id"] for row in second_page.json()] == [created_ids[0]]
+    assert "X-Next-Cursor" not in second_page.headers
+
+    bad_cursor = await client.get("/team-sheets", params={**params, "cursor": "###"}, headers=headers)
+    assert bad_cursor.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_team_sheet_auto_assign(client, register_and_login):
+    token = (await register_and_login("auto@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    employees = {}
+    for first, upsell, load in (("Ava", 9, 20), ("Ben", 5, 20), ("Cal", 1, 10), ("Dee", 3, 20)):
+        resp = await client.post(
+            "/employees",
+            json={
+                "first_name": first,
+                "last_name": "Auto",
+                "role": "SERVER",
+                "employment_start_date": "2022-01-01",
+                "upsell_score": upsell,
+                "max_section_load": load,
+            },
+            headers=headers,
+        )
+        employees[first] = resp.json()["id"]
+
+    sections = {}
+    for name, guests, cut_order, tags in (
+        ("AA Big", 20, 30, []),
+        ("AB Bar", 12, 20, ["bar"]),
+        ("AC Small", 8, 10, []),
+    ):
+        resp = await client.post(
+            "/sections",
+            json={
+                "name": name,
+                "label": name,
+                "type": "FLOOR",
+                "max_guests": guests,
+                "cut_order": cut_order,
+                "tags": tags,
+            },
+            headers=headers,
+        )
+        sections[name] = resp.json()["id"]
+
+    await client.post(
+        "/daily-rosters",
+        json={
+            "date": "2030-03-05",
+            "store_id": 77,
+            "entries": [{"name": "Ava Auto"}, {"name": "Ben Auto"}, {"name": "Cal Auto"}, {"name": "Nobody Here"}],
+        },
+        headers=headers,
+    )
+    await client.post(
+        "/pyos/requests/manual",
+        json={"employee_id": employees["Cal"], "section_id": sections["AC Small"], "date": "2030-03-05", "shift": "PM"},
+        headers=headers,
+    )
+    shift_resp = await client.post(
+        "/shifts", json={"date": "2030-03-05", "time_period": "DINNER", "store_id": 77}, headers=headers
+    )
+    sheet_resp = await client.post(
+        "/team-sheets", json={"shift_id": shift_resp.json()["id"], "title": "Auto"}, headers=headers
+    )
+    sheet_id = sheet_resp.json()["id"]
+
+    payload = {
+        "seed": 42,
+        "weights": {"random": 0},
+        "tag_qualifications": {"bar": [employees["Ben"]]},
+    }
+    resp = await client.post(f"/team-sheets/{sheet_id}/auto-assign", json=payload, headers=headers)
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["seed"] == 42
+    assert body["unmatched_names"] == ["Nobody Here"]
+    placed = {a["employee_id"]: a["section_id"] for a in body["team_sheet"]["assignments"]}
+    assert placed == {
+        employees["Ava"]: sections["AA Big"],
+        employees["Ben"]: sections["AB Bar"],
+        employees["Cal"]: sections["AC Small"],
+    }
+    assert next(s for s in body["scores"] if s["employee_id"] == employees["Cal"])["pinned"] is True
+
+    randomized = {"seed": 7, "tag_qualifications": payload["tag_qualifications"]}
+    first = await client.post(f"/team-sheets/{sheet_id}/auto-assign", json=randomized, headers=headers)
+    second = await client.post(f"/team-sheets/{sheet_id}/auto-assign", json=randomized, headers=headers)
+    assert first.json()["scores"] == second.json()["scores"]
+
+
+@pytest.mark.asyncio
+async def test_team_sheet_print_cache_and_etag(client, TestingSessionLocal, register_and_login):
+    token = (await register_and_login("printer@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    shift_resp = await client.post(
+        "/shifts", json={"date": "2024-08-06", "time_period": "DINNER", "store_id": 77}, headers=headers
+    )
+    await client.post(
+        "/store-preferences",
+        json={"store_number": "77", "daily_schedule": [{"day": "Tuesday", "second_shift_in": "16:30"}]},
+        headers=headers,
+    )
+    emp_resp = await client.post(
+        "/employees",
+        json={"first_name": "Pat", "last_name": "Print", "role": "SERVER", "employment_start_date": "2023-01-01"},
+        headers=headers,
+    )
+    section_resp = await client.post(
+        "/sections",
+        json={"name": "Print Patio", "label": "PP", "type": "FLOOR", "max_guests": 12, "is_active": True},
+        headers=headers,
+    )
+    team_resp = await client.post(
+        "/team-sheets",
+        json={
+            "shift_id": shift_resp.json()["id"],
+            "title": "Print <Night>",
+            "notes": "Rush",
+            "assignments": [{"employee_id": emp_resp.json()["id"], "section_id": section_resp.json()["id"]}],
+        },
+        headers=headers,
+    )
+    team_sheet_id = team_resp.json()["id"]
+
+    first = await client.get(f"/team-sheets/{team_sheet_id}/print", headers=headers)
+    assert first.status_code == 200
+    assert "Print &lt;Night&gt;" in first.text
+    assert "Store 77" in first.text
+    assert "<td>4:30 PM</td><td>PP</td><td>Pat Print</td>" in first.text
+    etag = first.headers["ETag"]
+
+    again = await client.get(f"/team-sheets/{team_sheet_id}/print", headers=headers)
+    assert again.text == first.text
+    not_modified = await client.get(
+        f"/team-sheets/{team_sheet_id}/print", headers={**headers, "If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+
+    await client.put(f"/team-sheets/{team_sheet_id}", json={"notes": "Slow"}, headers=headers)
+    edited = await client.get(f"/team-sheets/{team_sheet_id}/print", headers={**headers, "If-None-Match": etag})
+    assert edited.status_code == 200
+    assert "Notes: Slow" in edited.text
+    assert edited.headers["ETag"] != etag
+
+    # Store preference writes invalidate rendered pages that show the in-time.
+    await client.post(
+        "/store-preferences",
+        json={"store_number": "77", "daily_schedule": [{"day": "Tuesday", "second_shift_in": "17:00"}]},
+        headers=headers,
+    )
+    rescheduled = await client.get(
+        f"/team-sheets/{team_sheet_id}/print", headers={**headers, "If-None-Match": edited.headers["ETag"]}
+    )
+    assert rescheduled.status_code == 200
+    assert "<td>5:00 PM</td>" in rescheduled.text
+
+    # The ETag comes from database state, so an edit made elsewhere (another worker, a script) is seen too.
+    with TestingSessionLocal() as db:
+        db.get(Section, section_resp.json()["id"]).label = "PX"
+        db.commit()
+    relabeled = await client.get(
+        f"/team-sheets/{team_sheet_id}/print", headers={**headers, "If-None-Match": rescheduled.headers["ETag"]}
+    )
+    assert relabeled.status_code == 200
+    assert "<td>PX</td>" in relabeled.text
+
+    missing = await client.get("/team-sheets/999999/print", headers=headers)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_team_sheet_day_print(client, test_async_engine, register_and_login):
+    token = (await register_and_login("dayprint@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def add_sheet(title, period, store_id):
+        shift_resp = await client.post(
+            "/shifts", json={"date": "2024-09-14", "time_period": period, "store_id": store_id}, headers=headers
+        )
+        await client.post("/team-sheets", json={"shift_id": shift_resp.json()["id"], "title": title}, headers=headers)
+
+    engine = test_async_engine.sync_engine
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    async def print_day(**params):
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            return await client.get("/team-sheets/print", params={"date": "2024-09-14", **params}, headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+    await add_sheet("Day Dinner 5", "DINNER", 5)
+    await add_sheet("Day Lunch 5", "LUNCH", 5)
+    resp = await print_day()
+    baseline = len(statements)
+    assert baseline > 0
+    assert resp.status_code == 200
+
+    await add_sheet("Day Lunch 6", "LUNCH", 6)
+    resp = await print_day()
+    assert len(statements) == baseline
+    html = resp.text
+    assert html.count('<section class="sheet">') == 3
+    assert html.index("Day Lunch 5") < html.index("Day Dinner 5") < html.index("Day Lunch 6")
+
+    store_only = await print_day(store_id=6)
+    assert store_only.text.count('<section class="sheet">') == 1
+
+    empty = await client.get("/team-sheets/print", params={"date": "2024-09-15"}, headers=headers)
+    assert empty.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_team_sheet_write_returns_without_reload(
+    client, test_async_engine, TestingSessionLocal, register_and_login
+):
+    token = (await register_and_login("autosave@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    emp_resp = await client.post(
+        "/employees",
+        json={"first_name": "Ava", "last_name": "Save", "role": "SERVER", "employment_start_date": "2023-01-01"},
+        headers=headers,
+    )
+    employee_id = emp_resp.json()["id"]
+    section_resp = await client.post(
+        "/sections",
+        json={"name": "Autosave Booths", "label": "AB", "type": "FLOOR", "max_guests": 16, "is_active": True},
+        headers=headers,
+    )
+    section_id = section_resp.json()["id"]
+    shift_resp = await client.post("/shifts", json={"date": "2024-10-01", "time_period": "LUNCH"}, headers=headers)
+    assignments = [{"employee_id": employee_id, "section_id": section_id, "role_label": "Floor"}]
+    created = await client.post(
+        "/team-sheets",
+        json={"shift_id": shift_resp.json()["id"], "title": "Autosave", "assignments": assignments},
+        headers=headers,
+    )
+    assert created.status_code == 201, created.text
+    body = created.json()
+    assert body["assignments"][0]["employee_name"] == "Ava Save"
+    assert body["assignments"][0]["section_label"] == "AB"
+    team_sheet_id = body["id"]
+
+    engine = test_async_engine.sync_engine
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        updated = await client.put(
+            f"/team-sheets/{team_sheet_id}",
+            json={
+                "notes": "Saved",
+                "assignments": assignments,
+                "sidework": [{"label": "Roll", "employee_ids": [employee_id]}],
+            },
+            headers=headers,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert updated.status_code == 200, updated.text
+    assert updated.json()["notes"] == "Saved"
+    assert updated.json()["sidework"][0]["employee_ids"] == [employee_id]
+    # Only the initial load reads the sheet's children; labels are one batched lookup per table, not a reload.
+    selects = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+    for table in ("team_sheet_assignments", "sidework_tasks"):
+        assert sum(f"FROM {table}" in sql for sql in selects) == 1, table
+    for table in ("employees", "sections"):
+        assert sum(f"FROM {table}" in sql for sql in selects) == 2, table
+
+    await client.put(f"/employees/{employee_id}", json={"first_name": "Avery"}, headers=headers)
+    renamed = await client.put(f"/team-sheets/{team_sheet_id}", json={"assignments": assignments}, headers=headers)
+    assert renamed.json()["assignments"][0]["employee_name"] == "Avery Save"
+
+    # An edit made outside this process (no API call to invalidate anything) shows up on the next write.
+    with TestingSessionLocal() as db:
+        db.get(Section, section_id).label = "AX"
+        db.commit()
+    relabeled = await client.put(f"/team-sheets/{team_sheet_id}", json={"assignments": assignments}, headers=headers)
+    assert relabeled.json()["assignments"][0]["section_label"] == "AX"
+
+
+@pytest.mark.asyncio
+async def test_team_sheet_update_merges_rows(client, test_async_engine, register_and_login):
+    token = (await register_and_login("merger@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    employee_ids = []
+    for first in ("Mo", "Mia"):
+        emp_resp = await client.post(
+            "/employees",
+            json={"first_name": first, "last_name": "Merge", "role": "SERVER", "employment_start_date": "2023-01-01"},
+            headers=headers,
+        )
+        employee_ids.append(emp_resp.json()["id"])
+    section_ids = []
+    for label in ("M1", "M2"):
+        section_resp = await client.post(
+            "/sections",
+            json={"name": f"Merge {label}", "label": label, "type": "FLOOR", "max_guests": 10, "is_active": True},
+            headers=headers,
+        )
+        section_ids.append(section_resp.json()["id"])
+    shift_resp = await client.post("/shifts", json={"date": "2024-10-02", "time_period": "DINNER"}, headers=headers)
+
+    mo, mia = employee_ids
+    payload = {
+        "assignments": [
+            {"employee_id": mo, "section_id": section_ids[0], "order_index": 0},
+            {"employee_id": mia, "section_id": section_ids[1], "order_index": 1},
+        ],
+        "sidework": [{"label": "Ice", "employee_ids": [mo]}, {"label": "Silver", "employee_ids": [mia]}],
+    }
+    created = await client.post(
+        "/team-sheets", json={"shift_id": shift_resp.json()["id"], "title": "Merge", **payload}, headers=headers
+    )
+    before = created.json()
+
+    # Drag Mo onto Mia's section and add Mia to Ice.
+    payload["assignments"][0]["section_id"] = section_ids[1]
+    payload["sidework"][0]["employee_ids"] = [mo, mia]
+
+    engine = test_async_engine.sync_engine
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        updated = await client.put(f"/team-sheets/{before['id']}", json=payload, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    after = updated.json()
+
+    assert [a["id"] for a in after["assignments"]] == [a["id"] for a in before["assignments"]]
+    assert after["assignments"][0]["section_id"] == section_ids[1]
+    assert [t["id"] for t in after["sidework"]] == [t["id"] for t in before["sidework"]]
+    assert after["sidework"][0]["employee_ids"] == [mo, mia]
+    writes = sorted(" ".join(sql.split()[:3]) for sql in statements if not sql.lstrip().upper().startswith("SELECT"))
+    assert writes == [
+        "INSERT INTO sidework_assignments",
+        "UPDATE team_sheet_assignments SET",
+        "UPDATE team_sheets SET",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_team_sheet_patch_ops_and_conflicts(client, register_and_login):
+    token = (await register_and_login("patcher@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    employee_ids = []
+    for first in ("Pia", "Pax"):
+        emp_resp = await client.post(
+            "/employees",
+            json={"first_name": first, "last_name": "Patch", "role": "SERVER", "employment_start_date": "2023-01-01"},
+            headers=headers,
+        )
+        employee_ids.append(emp_resp.json()["id"])
+    section_ids = []
+    for label in ("P1", "P2"):
+        section_resp = await client.post(
+            "/sections",
+            json={"name": f"Patch {label}", "label": label, "type": "FLOOR", "max_guests": 10, "is_active": True},
+            headers=headers,
+        )
+        section_ids.append(section_resp.json()["id"])
+    shift_resp = await client.post("/shifts", json={"date": "2024-10-03", "time_period": "LUNCH"}, headers=headers)
+    pia, pax = employee_ids
+    created = await client.post(
+        "/team-sheets",
+        json={
+            "shift_id": shift_resp.json()["id"],
+            "title": "Patch",
+            "assignments": [{"employee_id": pia, "section_id": section_ids[0], "order_index": 0}],
+            "outwork": [{"label": "Patio", "employee_ids": [pia]}],
+        },
+        headers=headers,
+    )
+    sheet = created.json()
+    task_id = sheet["outwork"][0]["id"]
+
+    ops = [
+        {"op": "move", "employee_id": pia, "section_id": section_ids[1]},
+        {"op": "move", "employee_id": pax, "section_id": section_ids[0], "role_label": "Host"},
+        {"op": "add_task_assignee", "task_type": "outwork", "task_id": task_id, "employee_id": pax},
+        {"op": "remove_task_assignee", "task_type": "outwork", "task_id": task_id, "employee_id": pia},
+    ]
+    resp = await client.patch(
+        f"/team-sheets/{sheet['id']}", json={"updated_at": sheet["updated_at"], "ops": ops}, headers=headers
+    )
+    assert resp.status_code == 200, resp.text
+    patched = resp.json()
+    by_employee = {a["employee_id"]: a for a in patched["assignments"]}
+    assert by_employee[pia]["id"] == sheet["assignments"][0]["id"]
+    assert by_employee[pia]["section_id"] == section_ids[1]
+    assert by_employee[pax]["role_label"] == "Host"
+    assert patched["outwork"][0]["employee_ids"] == [pax]
+    assert patched["updated_at"] != sheet["updated_at"]
+
+    # A second editor still holding the old revision is rejected, and nothing is applied.
+    stale = await client.patch(
+        f"/team-sheets/{sheet['id']}",
+        json={"updated_at": sheet["updated_at"], "ops": [{"op": "unassign", "employee_id": pia}]},
+        headers=headers,
+    )
+    assert stale.status_code == 409
+
+    reorder = [by_employee[pax]["id"], by_employee[pia]["id"]]
+    resp = await client.patch(
+        f"/team-sheets/{sheet['id']}",
+        json={
+            "updated_at": patched["updated_at"],
+            "ops": [{"op": "reorder", "assignment_ids": reorder}, {"op": "unassign", "employee_id": pia}],
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    assert [(a["employee_id"], a["order_index"]) for a in resp.json()["assignments"]] == [(pax, 0)]
+
+    bad_task = await client.patch(
+        f"/team-sheets/{sheet['id']}",
+        json={
+            "updated_at": resp.json()["updated_at"],
+            "ops": [{"op": "add_task_assignee", "task_type": "sidework", "task_id": task_id, "employee_id": pax}],
+        },
+        headers=headers,
+    )
+    assert bad_task.status_code == 400
+    missing = await client.patch(
+        "/team-sheets/999999", json={"updated_at": sheet["updated_at"], "ops": ops}, headers=headers
+    )
+    assert missing.status_code == 404
+
+    # Moves must name a real section, and pick one assignment when the employee holds several.
+    revision = resp.json()["updated_at"]
+    no_section = await client.patch(
+        f"/team-sheets/{sheet['id']}",
+        json={"updated_at": revision, "ops": [{"op": "move", "employee_id": pax, "section_id": 999999}]},
+        headers=headers,
+    )
+    assert no_section.status_code == 400
+    assert no_section.json()["detail"] == "section 999999 does not exist"
+    doubled = await client.put(
+        f"/team-sheets/{sheet['id']}",
+        json={
+            "assignments": [
+                {"employee_id": pax, "section_id": section_ids[0], "order_index": 0},
+                {"employee_id": pax, "section_id": section_ids[1], "order_index": 1},
+            ]
+        },
+        headers=headers,
+    )
+    second = doubled.json()["assignments"][1]
+    move = {"op": "move", "employee_id": pax, "section_id": section_ids[0], "role_label": "Closer"}
+    ambiguous = await client.patch(
+        f"/team-sheets/{sheet['id']}", json={"updated_at": doubled.json()["updated_at"], "ops": [move]}, headers=headers
+    )
+    assert ambiguous.status_code == 400
+    targeted = await client.patch(
+        f"/team-sheets/{sheet['id']}",
+        json={"updated_at": doubled.json()["updated_at"], "ops": [{**move, "assignment_id": second["id"]}]},
+        headers=headers,
+    )
+    assert targeted.status_code == 200, targeted.text
+    moved = {a["id"]: a for a in targeted.json()["assignments"]}
+    assert (moved[second["id"]]["section_id"], moved[second["id"]]["role_label"]) == (section_ids[0], "Closer")
+    assert [a["role_label"] for a in targeted.json()["assignments"]].count("Closer") == 1
+
+
+@pytest.mark.asyncio
+async def test_team_sheet_clone_range(client, register_and_login):
+    token = (await register_and_login("cloner@example.com"))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    emp_resp = await client.post(
+        "/employees",
+        json={"first_name": "Cal", "last_name": "Clone", "role": "SERVER", "employment_start_date": "2023-01-01"},
+        headers=headers,
+    )
+    employee_id = emp_resp.json()["id"]
+    section_resp = await client.post(
+        "/sections",
+        json={"name": "Clone Deck", "label": "CD", "type": "FLOOR", "max_guests": 10, "is_active": True},
+        headers=headers,
+    )
+    section_id = section_resp.json()["id"]
+    source_ids = []
+    for day, period in (("2024-11-04", "LUNCH"), ("2024-11-04", "DINNER"), ("2024-11-06", "DINNER")):
+        shift_resp = await client.post(
+            "/shifts", json={"date": day, "time_period": period, "store_id": 41}, headers=headers
+        )
+        team_resp = await client.post(
+            "/team-sheets",
+            json={
+                "shift_id": shift_resp.json()["id"],
+                "title": f"{period} {day}",
+                "status": "PUBLISHED",
+                "assignments": [{"employee_id": employee_id, "section_id": section_id, "role_label": "Floor"}],
+                "sidework": [{"label": "Lemons", "employee_ids": [employee_id]}],
+                "outwork": [{"label": "Trash", "employee_ids": [employee_id]}],
+            },
+            headers=headers,
+        )
+        source_ids.append(team_resp.json()["id"])
+
+    # The target Wednesday dinner already has a sheet, so that source is skipped.
+    taken = await client.post(
+        "/shifts", json={"date": "2024-11-13", "time_period": "DINNER", "store_id": 41}, headers=headers
+    )
+    await client.post("/team-sheets", json={"shift_id": taken.json()["id"], "title": "Existing"}, headers=headers)
+
+    payload = {
+        "source_start_date": "2024-11-04",
+        "source_end_date": "2024-11-10",
+        "target_start_date": "2024-11-11",
+        "store_id": 41,
+    }
+    resp = await client.post("/team-sheets/clone-range", json=payload, headers=headers)
+    assert resp.status_code == 201, resp.text
+    result = resp.json()
+    assert result["skipped_source_ids"] == [source_ids[2]]
+    assert [(c["source_team_sheet_id"], c["shift_date"], c["time_period"]) for c in result["created"]] == [
+        (source_ids[0], "2024-11-11", "LUNCH"),
+        (source_ids[1], "2024-11-11", "DINNER"),
+    ]
+
+    clone = (await client.get(f"/team-sheets/{result['created'][1]['team_sheet_id']}", headers=headers)).json()
+    assert clone["title"] == "DINNER 2024-11-04"
+    assert clone["status"] == "DRAFT"
+    assert clone["assignments"][0]["section_label"] == "CD"
+    assert clone["sidework"][0]["label"] == "Lemons"
+    assert clone["sidework"][0]["employee_ids"] == [employee_id]
+    assert clone["outwork"][0]["employee_ids"] == [employee_id]
+
+    overlapping = await client.post(
+        "/team-sheets/clone-range", json={**payload, "target_start_date": "2024-11-07"}, headers=headers
+    )
+    assert overlapping.status_code == 400
@@ -0,0 +1,66 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.token_revocation import RevocationStore
+from app.models import RevokedToken
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_and_rejects_reuse(client, register_and_login, query_count):
+    tokens = await register_and_login("refresh-rotate@example.com")
+    await client.get("/auth/me", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+    resp = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 200
+    # One INSERT into the revocation index; no password verify, and the user comes from the auth cache.
+    assert query_count(resp) == 1
+    rotated = resp.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    me = await client.get("/auth/me", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert me.status_code == 200
+
+    reused = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reused.status_code == 401
+
+    # Browser clients refresh from the cookie set by the previous rotation.
+    resp = await client.post("/auth/refresh")
+    assert resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_an_access_token(client, register_and_login):
+    tokens = await register_and_login("refresh-not-access@example.com")
+    resp = await client.get("/auth/me", headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert resp.status_code == 401
+    resp = await client.post("/auth/refresh", json={"refresh_token": tokens["access_token"]})
+    assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_refresh_token(client, register_and_login):
+    tokens = await register_and_login("refresh-logout@example.com")
+    assert (await client.post("/auth/logout")).status_code == 204
+    resp = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_store_prunes_expired_entries(test_async_engine):
+    store = RevocationStore()
+    SessionLocal = async_sessionmaker(bind=test_async_engine, expire_on_commit=False)
+    now = time.time()
+    async with SessionLocal() as db:
+        db.add(RevokedToken(jti="expired-jti", user_id=1, expires_at=datetime.utcnow() - timedelta(days=1)))
+        await db.commit()
+        store.remember("expired-jti", now - 86400)
+        store.last_pruned = 0
+        assert await store.revoke(db, "live-jti", 1, now + 3600)
+        assert not await store.revoke(db, "live-jti", 1, now + 3600)
+        jtis = set((await db.scalars(select(RevokedToken.jti))).all())
+    assert "expired-jti" not in jtis
+    assert "live-jti" in jtis
+    assert set(store.revoked) == {"live-jti"}